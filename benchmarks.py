@@ -0,0 +1,688 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from vehicle import Car, Bike, Track, Bus
+from slotAllocator import SpaceAllocator, ParkingSlot
+from compactSlotStore import CompactSlotStore
+from placementPolicy import PLACEMENT_POLICIES
+from chargeScheme import ChargeController
+from parkingSystem import GarageManager
+from gateService import GateService
+from outputSink import NullSink
+from siteCoordinator import SiteCoordinator
+from garageClock import SystemClock, CoarseClock, VirtualClock
+from ticketHistory import TicketHistoryStore
+from receiptToken import ParkingPass
+from trafficSimulator import TrafficSimulator, printSimulationReport, percentile
+from eventBus import EventBus, EventSubscriber, CollectingSubscriber
+from garageMetrics import MetricsRegistry
+
+
+def buildFragmentedAllocator(capacity):
+    allocator = SpaceAllocator(capacity)
+    for i in range(capacity - 3):
+        allocator.allocateSpace(Car(f"FRAG-{i}"))
+    for slotID in range(1, capacity - 3, 2):
+        allocator.freeAllocatedSlots([slotID])
+    return allocator
+
+
+def timeSearches(searchFunction, slotsNeeded, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        searchFunction(slotsNeeded)
+    return (time.perf_counter() - started) / repeats
+
+
+def benchmarkFreeSpaceSearch(capacities=(300, 10000, 100000), repeats=50):
+    print("\n====== FREE-RUN SEARCH (Bus, 3 slots) ======")
+    print(f"{'Slots':>8} {'Linear scan':>14} {'Run index':>14} {'Speedup':>9}")
+    for capacity in capacities:
+        allocator = buildFragmentedAllocator(capacity)
+        
+        if allocator.scanFreeSpace(3) != allocator.searchFreeSpace(3):
+            raise AssertionError("Run index disagrees with linear scan")
+        
+        linearTime = timeSearches(allocator.scanFreeSpace, 3, repeats)
+        indexedTime = timeSearches(allocator.searchFreeSpace, 3, repeats)
+        print(f"{capacity:>8} {linearTime * 1e6:>11.1f} us {indexedTime * 1e6:>11.1f} us "
+              f"{linearTime / indexedTime:>8.0f}x")
+    
+    print("\n====== CHECK-IN / CHECK-OUT CYCLE (Bus) ======")
+    for capacity in capacities:
+        allocator = buildFragmentedAllocator(capacity)
+        started = time.perf_counter()
+        for i in range(repeats):
+            reservedSlots = allocator.allocateSpace(Bus(f"BUS-{i}"))
+            allocator.freeAllocatedSlots(reservedSlots)
+        elapsed = (time.perf_counter() - started) / repeats
+        print(f"{capacity:>8} slots: {elapsed * 1e6:.1f} us per cycle")
+
+
+def buildTrafficDay(arrivals=2600, capacity=300, seed=13):
+    generator = random.Random(seed)
+    vehicleMix = [(Car, 0.65), (Bike, 0.15), (Track, 0.12), (Bus, 0.08)]
+    events = []
+    for vehicleNumber in range(arrivals):
+        arrivalMinute = generator.uniform(0, 24 * 60)
+        stayMinutes = generator.expovariate(1 / 150) + 10
+        vehicleClass = generator.choices([entry[0] for entry in vehicleMix], [entry[1] for entry in vehicleMix])[0]
+        events.append((arrivalMinute, 1, vehicleNumber, vehicleClass))
+        events.append((arrivalMinute + stayMinutes, 0, vehicleNumber, vehicleClass))
+    events.sort(key=lambda event: (event[0], event[1]))
+    return events
+
+
+def replayTrafficDay(events, capacity, placementPolicy):
+    allocator = SpaceAllocator(capacity, placementPolicy=placementPolicy)
+    parkedSlots = {}
+    rejected = {"small": 0, "large": 0, "largeWithRoom": 0}
+    fragmentationSamples = []
+    for _, isArrival, vehicleNumber, vehicleClass in events:
+        if not isArrival:
+            if vehicleNumber in parkedSlots:
+                allocator.freeAllocatedSlots(parkedSlots.pop(vehicleNumber))
+            continue
+        vehicle = vehicleClass(f"DAY-{vehicleNumber}")
+        reservedSlots = allocator.allocateSpace(vehicle)
+        if reservedSlots is not None:
+            parkedSlots[vehicleNumber] = reservedSlots
+        elif vehicle.SpaceRequired() == 1:
+            rejected["small"] += 1
+        else:
+            rejected["large"] += 1
+            if allocator.availableSpaces() >= vehicle.SpaceRequired():
+                rejected["largeWithRoom"] += 1
+        fragmentationSamples.append(allocator.fragmentationMetrics()["fragmentation"])
+    return rejected, sum(fragmentationSamples) / len(fragmentationSamples)
+
+
+def benchmarkPlacementPolicies(arrivals=2600, capacity=300):
+    events = buildTrafficDay(arrivals, capacity)
+    print("\n====== PLACEMENT POLICY REPLAY (synthetic day) ======")
+    print(f"Arrivals: {arrivals} | Capacity: {capacity}")
+    print(f"{'Policy':>16} {'Small rej.':>11} {'Large rej.':>11} {'w/ free room':>13} {'Avg frag.':>10} {'Time':>9}")
+    for policyName in PLACEMENT_POLICIES:
+        started = time.perf_counter()
+        rejected, averageFragmentation = replayTrafficDay(events, capacity, policyName)
+        elapsed = time.perf_counter() - started
+        print(f"{policyName:>16} {rejected['small']:>11} {rejected['large']:>11} {rejected['largeWithRoom']:>13} "
+              f"{averageFragmentation:>10.2f} {elapsed * 1000:>6.0f} ms")
+
+
+def buildSlotDictionary(capacity):
+    spaceCollection = {}
+    for i in range(1, capacity + 1):
+        spaceCollection[i] = ParkingSlot(i)
+    return spaceCollection
+
+
+def measureConstruction(builder, capacity):
+    tracemalloc.start()
+    started = time.perf_counter()
+    built = builder(capacity)
+    elapsed = time.perf_counter() - started
+    memoryUsed = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    return memoryUsed, elapsed
+
+
+def benchmarkSlotStorage(capacities=(300, 10000, 250000)):
+    print("\n====== SLOT STORE FOOTPRINT ======")
+    print(f"{'Slots':>8} {'Store':>22} {'Memory':>11} {'Build time':>12}")
+    builders = [
+        ("dict of ParkingSlot", buildSlotDictionary),
+        ("CompactSlotStore", CompactSlotStore),
+        ("allocator (dict)", lambda capacity: SpaceAllocator(capacity)),
+        ("allocator (compact)", lambda capacity: SpaceAllocator(capacity, compactStorage=True)),
+    ]
+    for capacity in capacities:
+        for label, builder in builders:
+            memoryUsed, elapsed = measureConstruction(builder, capacity)
+            print(f"{capacity:>8} {label:>22} {memoryUsed / 1048576:>8.2f} MB {elapsed * 1000:>9.1f} ms")
+
+
+def benchmarkBatchPricing(ticketCount=100000, seed=7):
+    generator = random.Random(seed)
+    controller = ChargeController()
+    vehicleTypes = [generator.choice(["Car", "Motorcycle", "Truck", "Bus"]) for _ in range(ticketCount)]
+    hoursParked = [generator.random() * 30 for _ in range(ticketCount)]
+    weekStart = datetime(2026, 1, 5)
+    checkOutTimes = [weekStart + timedelta(minutes=generator.randrange(7 * 24 * 60)) for _ in range(ticketCount)]
+    
+    started = time.perf_counter()
+    loopResults = []
+    for vehicleType, hours, checkOut in zip(vehicleTypes, hoursParked, checkOutTimes):
+        strategy = controller.determineActiveRate(checkOut)
+        loopResults.append((strategy.calculateFee(vehicleType, hours), strategy.planTitle()))
+    loopTime = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    fees, planNames = controller.determineBatchParkingCost(vehicleTypes, hoursParked, checkOutTimes)
+    batchTime = time.perf_counter() - started
+    
+    if loopResults != list(zip(fees, planNames)):
+        raise AssertionError("Batch pricing disagrees with per-ticket pricing")
+    
+    print("\n====== BATCH RE-PRICING ======")
+    print(f"Tickets: {ticketCount}")
+    print(f"Per-ticket loop: {loopTime * 1000:.1f} ms")
+    print(f"Batch pricing:   {batchTime * 1000:.1f} ms ({loopTime / batchTime:.1f}x)")
+
+
+def benchmarkSegmentedBilling(stayCount=100000, seed=9):
+    generator = random.Random(seed)
+    checkoutController = ChargeController()
+    segmentedController = ChargeController(billingMode="segmented")
+    vehicleTypes = [generator.choice(["Car", "Motorcycle", "Truck", "Bus"]) for _ in range(stayCount)]
+    checkInTimes = [datetime(2026, 1, 5) + timedelta(minutes=generator.randrange(7 * 24 * 60)) for _ in range(stayCount)]
+    hoursParked = [generator.random() * generator.choice([3, 24, 24 * 14]) for _ in range(stayCount)]
+    checkOutTimes = [checkIn + timedelta(hours=hours) for checkIn, hours in zip(checkInTimes, hoursParked)]
+    
+    print("\n====== SEGMENTED BILLING (stays up to 14 days) ======")
+    for label, controller in (("checkout plan", checkoutController), ("segmented", segmentedController)):
+        started = time.perf_counter()
+        totalFees = 0.0
+        for vehicleType, hours, checkIn, checkOut in zip(vehicleTypes, hoursParked, checkInTimes, checkOutTimes):
+            totalFees += controller.determineParkingCost(vehicleType, hours, checkOut, checkIn)[0]
+        elapsed = time.perf_counter() - started
+        print(f"{label:>14}: {elapsed / stayCount * 1e6:.2f} us per stay | revenue ${totalFees:,.2f}")
+
+
+async def runGateClient(port, gateNumber, cycles, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    
+    async def send(request):
+        started = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - started)
+        return response
+    
+    for cycle in range(cycles):
+        plate = f"G{gateNumber}-{cycle}"
+        await send({"op": "capacity"})
+        await send({"op": "checkin", "type": "Car", "plate": plate})
+        await send({"op": "track", "plate": plate})
+        await send({"op": "checkout", "plate": plate})
+        await send({"op": "payment", "plate": plate})
+    
+    writer.close()
+    await writer.wait_closed()
+
+
+async def runGateLoad(gates, cycles):
+    service = GateService(GarageManager(outputSink=NullSink()), port=0)
+    await service.start()
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(runGateClient(service.port, gate, cycles, latencies) for gate in range(gates)))
+    elapsed = time.perf_counter() - started
+    await service.stop()
+    return latencies, elapsed
+
+
+def benchmarkGateService(gates=200, cycles=20):
+    latencies, elapsed = asyncio.run(runGateLoad(gates, cycles))
+    latencies.sort()
+    print("\n====== GATE SERVICE LOAD ======")
+    print(f"Gates: {gates} | Requests: {len(latencies)}")
+    print(f"Throughput: {len(latencies) / elapsed:.0f} requests/s")
+    print(f"p50: {percentile(latencies, 0.50) * 1000:.2f} ms | p99: {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+
+def stressConcurrentGarage(threadCount=16, operationsPerThread=300, seed=11):
+    garage = GarageManager(threadSafe=True, outputSink=NullSink())
+    issuedTokens = []
+    tokensLock = threading.Lock()
+    startSignal = threading.Event()
+    
+    def worker(workerNumber):
+        generator = random.Random(seed + workerNumber)
+        parked = []
+        startSignal.wait()
+        for operation in range(operationsPerThread):
+            if parked and generator.random() < 0.4:
+                plate = parked.pop(generator.randrange(len(parked)))
+                garage.handleCheckOut(plate)
+                garage.paymentProcess(plate)
+            else:
+                plate = f"T{workerNumber}-{operation}"
+                vehicleType = generator.choice(["Car", "Motorcycle", "Truck", "Bus"])
+                ticket = garage.handleCheckIn(vehicleType, plate)
+                if ticket is not None:
+                    parked.append(plate)
+                    with tokensLock:
+                        issuedTokens.append(ticket.tokenNumber)
+    
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(threadCount)]
+    for thread in threads:
+        thread.start()
+    started = time.perf_counter()
+    startSignal.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    allocator = garage.slotCoordinator
+    slotOwners = {}
+    for ticket in garage.currentReceipts.values():
+        for slotID in ticket.assignedSlots:
+            if slotID in slotOwners:
+                raise AssertionError(f"Slot {slotID} allocated to {slotOwners[slotID]} and {ticket.registrationNumber}")
+            slotOwners[slotID] = ticket.registrationNumber
+            if allocator.spaceCollection[slotID].vehicle is not ticket.vehicle:
+                raise AssertionError(f"Slot {slotID} does not hold {ticket.registrationNumber}")
+    if len(set(issuedTokens)) != len(issuedTokens):
+        raise AssertionError("Duplicate token numbers issued")
+    if allocator.OccupiedSpaces() != len(slotOwners):
+        raise AssertionError("Occupancy counters drifted from slot ownership")
+    
+    print("\n====== CONCURRENT STRESS ======")
+    print(f"Threads: {threadCount} | Tickets issued: {len(issuedTokens)} | Parked now: {len(garage.currentReceipts)}")
+    print(f"Elapsed: {elapsed * 1000:.0f} ms | No double allocation, tokens unique")
+
+
+def benchmarkSiteCoordinator(siteCounts=(1, 2, 4), clientsPerSite=4, cycles=250):
+    print("\n====== MULTI-SITE COORDINATOR ======")
+    for siteCount in siteCounts:
+        siteDefinitions = [(f"Site-{number}", (number * 5, 0), 2000) for number in range(siteCount)]
+        with SiteCoordinator(siteDefinitions) as coordinator:
+            def client(clientNumber):
+                origin = ((clientNumber % siteCount) * 5, 0)
+                for cycle in range(cycles):
+                    plate = f"S{clientNumber}-{cycle}"
+                    coordinator.checkIn("Car", plate, origin)
+                    coordinator.checkOut(plate)
+                    coordinator.payment(plate)
+            
+            clients = [threading.Thread(target=client, args=(number,)) for number in range(siteCount * clientsPerSite)]
+            started = time.perf_counter()
+            for thread in clients:
+                thread.start()
+            for thread in clients:
+                thread.join()
+            elapsed = time.perf_counter() - started
+            
+            fanOutStarted = time.perf_counter()
+            for _ in range(100):
+                coordinator.fleetOccupancy()
+            fanOutTime = (time.perf_counter() - fanOutStarted) / 100
+            
+            if coordinator.fleetOccupancy()["occupied"] != 0:
+                raise AssertionError("Sites still report occupied slots after every vehicle left")
+        
+        operations = siteCount * clientsPerSite * cycles * 3
+        print(f"{siteCount:>3} sites: {operations / elapsed:>8.0f} ops/s | fleet occupancy query {fanOutTime * 1000:.2f} ms")
+
+
+def benchmarkOutputModes(cycles=5000):
+    print("\n====== OUTPUT MODES (check-in/out/pay cycle) ======")
+    sinks = [("console (to StringIO)", None), ("null sink", NullSink())]
+    for label, sink in sinks:
+        capturedOutput = io.StringIO()
+        with contextlib.redirect_stdout(capturedOutput):
+            garage = GarageManager(outputSink=sink)
+            started = time.perf_counter()
+            for cycle in range(cycles):
+                plate = f"OUT-{cycle}"
+                garage.handleCheckIn("Car", plate)
+                garage.handleCheckOut(plate)
+                garage.paymentProcess(plate)
+            elapsed = time.perf_counter() - started
+        print(f"{label:>22}: {elapsed / cycles * 1e6:.1f} us per cycle")
+
+
+def benchmarkClockModes(cycles=20000):
+    print("\n====== CLOCK MODES (check-in/out/pay cycle) ======")
+    clocks = [("system", SystemClock()), ("coarse (10 ms)", CoarseClock()), ("virtual", VirtualClock())]
+    for label, clock in clocks:
+        garage = GarageManager(outputSink=NullSink(), clock=clock)
+        started = time.perf_counter()
+        for cycle in range(cycles):
+            plate = f"CLK-{cycle}"
+            garage.handleCheckIn("Car", plate)
+            garage.handleCheckOut(plate)
+            garage.paymentProcess(plate)
+        elapsed = time.perf_counter() - started
+        print(f"{label:>16}: {elapsed / cycles * 1e6:.1f} us per cycle")
+
+
+def benchmarkPermitImport(permitCount=50000, seed=5):
+    generator = random.Random(seed)
+    rows = [
+        (f"FLEET-{i}", generator.choice(["Car", "Motorcycle", "Truck", "Bus"]), generator.choice(["monthly", "daypass"]))
+        for i in range(permitCount)
+    ]
+    garage = GarageManager(outputSink=NullSink())
+    
+    started = time.perf_counter()
+    garage.importPermits(rows)
+    importTime = time.perf_counter() - started
+    
+    exportBuffer = io.StringIO()
+    started = time.perf_counter()
+    exportedCount = garage.exportPermits(exportBuffer)
+    exportTime = time.perf_counter() - started
+    
+    if exportedCount != permitCount:
+        raise AssertionError("Export did not return every imported permit")
+    
+    print("\n====== FLEET PERMIT IMPORT/EXPORT ======")
+    print(f"Permits: {permitCount}")
+    print(f"Import: {importTime * 1000:.1f} ms | Export: {exportTime * 1000:.1f} ms")
+
+
+def buildClosedTickets(ticketCount, seed=17):
+    generator = random.Random(seed)
+    vehicleClasses = [Car, Bike, Track, Bus]
+    checkOutTime = datetime(2026, 1, 1)
+    for number in range(ticketCount):
+        checkOutTime += timedelta(seconds=generator.randrange(1, 60))
+        vehicle = generator.choice(vehicleClasses)(f"HIST-{number % 50000}")
+        ticket = ParkingPass(vehicle, [1], checkInTime=checkOutTime - timedelta(minutes=generator.randrange(10, 600)))
+        ticket.logExitTime(checkOutTime - timedelta(seconds=generator.randrange(0, 300)))
+        ticket.assignParkingFee(generator.choice([3.5, 5.0, 7.5, 15.0, 22.5]), "Standard Pricing")
+        ticket.confirmPayment()
+        yield ticket
+
+
+def benchmarkTicketHistory(ticketCount=200000):
+    print("\n====== CLOSED TICKET HISTORY ======")
+    tracemalloc.start()
+    passRecords = list(buildClosedTickets(ticketCount))
+    listMemory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    started = time.perf_counter()
+    revenueByHour = {}
+    for ticket in passRecords:
+        hour = ticket.checkOutTime.replace(minute=0, second=0, microsecond=0)
+        revenueByHour[hour] = revenueByHour.get(hour, 0.0) + ticket.parkingCharge
+    listQueryTime = time.perf_counter() - started
+    rangeStart = passRecords[ticketCount // 2].checkOutTime
+    del passRecords
+    
+    tracemalloc.start()
+    history = TicketHistoryStore()
+    for ticket in buildClosedTickets(ticketCount):
+        history.appendTicket(ticket)
+    historyMemory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    started = time.perf_counter()
+    if history.revenueByHour().keys() != revenueByHour.keys():
+        raise AssertionError("History store disagrees with the ticket list")
+    historyQueryTime = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    history.aggregate(rangeStart, rangeStart + timedelta(days=1), "type")
+    rangeQueryTime = time.perf_counter() - started
+    
+    print(f"Tickets: {ticketCount}")
+    print(f"List of ParkingPass: {listMemory / 1048576:.1f} MB | revenue by hour {listQueryTime * 1000:.1f} ms")
+    print(f"Columnar history:    {historyMemory / 1048576:.1f} MB | revenue by hour {historyQueryTime * 1000:.1f} ms")
+    print(f"One-day revenue by type: {rangeQueryTime * 1000:.2f} ms")
+
+
+def benchmarkTicketFootprint(ticketCount=100000):
+    print("\n====== TICKET FOOTPRINT ======")
+    garage = GarageManager(outputSink=NullSink(), maximumSlots=3 * ticketCount)
+    vehicleTypes = ["Car", "Motorcycle", "Truck", "Bus"]
+    
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for number in range(ticketCount):
+        garage.handleCheckIn(vehicleTypes[number % 4], f"FP-{number}")
+    openBytes = tracemalloc.get_traced_memory()[0] - before
+    
+    before = tracemalloc.get_traced_memory()[0]
+    for number in range(ticketCount):
+        plate = f"FP-{number}"
+        garage.handleCheckOut(plate)
+        garage.paymentProcess(plate)
+    closedBytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    
+    print(f"Open tickets:   {openBytes / ticketCount:.0f} bytes each (vehicle, ticket, slot and plate index)")
+    print(f"Closed tickets: {(openBytes + closedBytes) / ticketCount:.0f} bytes each (history row and plate table)")
+
+
+def benchmarkReservations(bookingCounts=(1000, 10000, 40000), cycles=20000, seed=9):
+    print("\n====== RESERVATIONS ======")
+    vehicleTypes = ["Car", "Car", "Car", "Motorcycle", "Truck", "Bus"]
+    startTime = datetime(2026, 1, 5)
+    for bookingCount in bookingCounts:
+        generator = random.Random(seed)
+        garage = GarageManager(outputSink=NullSink(), clock=VirtualClock(startTime), reservations=True)
+        horizonMinutes = max(bookingCount, 24 * 60)
+        accepted = 0
+        started = time.perf_counter()
+        for number in range(bookingCount):
+            windowStart = startTime + timedelta(hours=2, minutes=generator.randrange(horizonMinutes))
+            windowEnd = windowStart + timedelta(minutes=generator.choice([60, 90, 120, 240]))
+            if garage.reserveSpace(f"RSV-{number}", generator.choice(vehicleTypes), windowStart, windowEnd):
+                accepted += 1
+        elapsed = time.perf_counter() - started
+        print(f"{bookingCount:>6} bookings: {elapsed / bookingCount * 1e6:.1f} us per booking "
+              f"({accepted} accepted, {garage.reservationBook.reservationMetrics()['open']} open)")
+    
+    for maximumSlots in (300, 10000, 100000):
+        generator = random.Random(seed)
+        garage = GarageManager(outputSink=NullSink(), clock=VirtualClock(startTime), reservations=True,
+                               maximumSlots=maximumSlots)
+        for number in range(maximumSlots // 2):
+            garage.handleCheckIn("Car", f"PARKED-{number}")
+        started = time.perf_counter()
+        for number in range(2000):
+            windowStart = startTime + timedelta(minutes=generator.randrange(24 * 60))
+            garage.reserveSpace(f"SIZE-{number}", generator.choice(vehicleTypes), windowStart,
+                                windowStart + timedelta(hours=2))
+        elapsed = time.perf_counter() - started
+        print(f"{maximumSlots:>6} spaces, half full: {elapsed / 2000 * 1e6:.1f} us per booking")
+    
+    for label, reservations in (("walk-in, no book", False), ("walk-in, book on", True)):
+        garage = GarageManager(outputSink=NullSink(), clock=VirtualClock(startTime), reservations=reservations)
+        if reservations:
+            for number in range(200):
+                windowStart = startTime + timedelta(days=1, minutes=7 * number)
+                garage.reserveSpace(f"AHEAD-{number}", "Car", windowStart, windowStart + timedelta(hours=1))
+        started = time.perf_counter()
+        for cycle in range(cycles):
+            plate = f"WALK-{cycle}"
+            garage.handleCheckIn("Car", plate)
+            garage.handleCheckOut(plate)
+            garage.paymentProcess(plate)
+        elapsed = time.perf_counter() - started
+        print(f"{label:>18}: {elapsed / cycles * 1e6:.1f} us per check-in/out/pay cycle")
+
+
+class SlowSubscriber(EventSubscriber):
+    
+    def __init__(self, batchDelay=0.005):
+        self.batchDelay = batchDelay
+    
+    def handleBatch(self, events):
+        time.sleep(self.batchDelay)
+
+
+def benchmarkEventBus(cycles=20000):
+    print("\n====== EVENT BUS (check-in/out/pay cycle) ======")
+    scenarios = [
+        ("no bus", []),
+        ("collector", [CollectingSubscriber()]),
+        ("collector + slow", [CollectingSubscriber(), SlowSubscriber()])
+    ]
+    for label, subscribers in scenarios:
+        eventBus = EventBus() if subscribers else None
+        for subscriber in subscribers:
+            eventBus.subscribe(subscriber)
+        garage = GarageManager(outputSink=NullSink(), eventBus=eventBus)
+        started = time.perf_counter()
+        for cycle in range(cycles):
+            plate = f"BUS-{cycle}"
+            garage.handleCheckIn("Car", plate)
+            garage.handleCheckOut(plate)
+            garage.paymentProcess(plate)
+        elapsed = time.perf_counter() - started
+        print(f"{label:>18}: {elapsed / cycles * 1e6:.1f} us per cycle")
+        if eventBus is not None:
+            for name, metrics in eventBus.lagMetrics().items():
+                print(f"{'':>20}{name}: {metrics['delivered']} delivered, {metrics['dropped']} dropped, "
+                      f"lag {metrics['lagEvents']} events / {metrics['lagSeconds'] * 1000:.1f} ms")
+            eventBus.close(timeout=1)
+
+
+def benchmarkInstrumentation(cycles=20000, repeats=5, chunkSize=500):
+    print("\n====== INSTRUMENTATION OVERHEAD (check-in/out/pay cycle) ======")
+    checkIn = GarageManager.handleCheckIn.__wrapped__
+    checkOut = GarageManager.handleCheckOut.__wrapped__
+    payment = GarageManager.paymentProcess.__wrapped__
+    
+    def runBypassed(garage, plate):
+        checkIn(garage, "Car", plate)
+        checkOut(garage, plate)
+        payment(garage, plate)
+    
+    def runWrapped(garage, plate):
+        garage.handleCheckIn("Car", plate)
+        garage.handleCheckOut(plate)
+        garage.paymentProcess(plate)
+    
+    modes = [
+        ("wrappers bypassed", runBypassed, lambda metrics: None),
+        ("disabled", runWrapped, lambda metrics: None),
+        ("enabled", runWrapped, lambda metrics: metrics.enable()),
+        ("profiling 1/100", runWrapped, lambda metrics: metrics.startProfiling(sampleEvery=100))
+    ]
+    timings = {label: [] for label, _, _ in modes}
+    for repeat in range(repeats):
+        garages = {}
+        for label, _, configure in modes:
+            garages[label] = GarageManager(outputSink=NullSink(), metrics=MetricsRegistry())
+            configure(garages[label].metrics)
+        elapsed = dict.fromkeys(garages, 0.0)
+        for chunkStart in range(0, cycles, chunkSize):
+            rotation = (repeat + chunkStart // chunkSize) % len(modes)
+            for label, runCycle, _ in modes[rotation:] + modes[:rotation]:
+                garage = garages[label]
+                started = time.perf_counter()
+                for cycle in range(chunkStart, min(cycles, chunkStart + chunkSize)):
+                    runCycle(garage, f"INS-{cycle}")
+                elapsed[label] += time.perf_counter() - started
+        for label in garages:
+            timings[label].append(elapsed[label] / cycles)
+    results = {label: statistics.median(elapsed) for label, elapsed in timings.items()}
+    for label, elapsed in results.items():
+        print(f"{label:>18}: {elapsed * 1e6:.2f} us per cycle")
+    
+    disabledMetrics = MetricsRegistry()
+    started = time.perf_counter()
+    for _ in range(cycles):
+        stageLaps = disabledMetrics.stageLaps("checkin")
+        if stageLaps:
+            stageLaps.lap("createVehicle")
+        if stageLaps:
+            stageLaps.lap("verifySubscription")
+        if stageLaps:
+            stageLaps.lap("allocateSpace")
+        if stageLaps:
+            stageLaps.lap("issueTicket")
+        if stageLaps:
+            stageLaps.lap("journal")
+        if stageLaps:
+            stageLaps.lap("receipt")
+    guardCost = (time.perf_counter() - started) / cycles
+    print(f"Disabled stage guards: {guardCost * 1e9:.0f} ns per operation "
+          f"({3 * guardCost / results['wrappers bypassed'] * 100:.2f}% of a cycle)")
+    wrapperCost = statistics.median(disabled - bypassed for disabled, bypassed in
+                                    zip(timings["disabled"], timings["wrappers bypassed"]))
+    print(f"Disabled entry wrappers: {wrapperCost * 1e6:+.2f} us per cycle "
+          f"(median of {repeats} interleaved pairs)")
+
+
+def benchmarkBinarySnapshot(maximumSlots=6000, permitCount=200000, seed=23):
+    print("\n====== BINARY SNAPSHOT ======")
+    generator = random.Random(seed)
+    vehicleTypes = ["Car", "Motorcycle", "Truck", "Bus"]
+    garage = GarageManager(outputSink=NullSink(), maximumSlots=maximumSlots)
+    garage.importPermits(
+        (f"FLEET-{i}", generator.choice(vehicleTypes), generator.choice(["monthly", "daypass"]))
+        for i in range(permitCount)
+    )
+    number = 0
+    while garage.slotCoordinator.availableSpaces() > 3:
+        if garage.handleCheckIn(generator.choice(vehicleTypes), f"FLEET-{number}") is None:
+            break
+        number += 1
+    
+    with tempfile.TemporaryDirectory() as snapshotDirectory:
+        binaryPath = os.path.join(snapshotDirectory, "garage.bin")
+        started = time.perf_counter()
+        snapshotSize = garage.saveBinarySnapshot(binaryPath)
+        binarySave = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        jsonText = json.dumps(garage._snapshotState(), separators=(",", ":"))
+        jsonSave = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        jsonGarage = GarageManager(outputSink=NullSink(), maximumSlots=maximumSlots)
+        jsonGarage._restoreSnapshot(json.loads(jsonText))
+        jsonLoad = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        standby = GarageManager(outputSink=NullSink(), maximumSlots=maximumSlots)
+        standby.loadBinarySnapshot(binaryPath)
+        binaryLoad = time.perf_counter() - started
+        
+        lookupPlates = [f"FLEET-{generator.randrange(permitCount)}" for _ in range(1000)]
+        started = time.perf_counter()
+        for plate in lookupPlates:
+            standby.verifySubscription(plate)
+        firstLookups = time.perf_counter() - started
+        
+        if len(standby.currentReceipts) != len(garage.currentReceipts):
+            raise AssertionError("Binary snapshot lost open tickets")
+        standby.close()
+    
+    print(f"State: {len(garage.currentReceipts)} open tickets, {permitCount} permits, {maximumSlots} spaces")
+    print(f"  JSON:   save {jsonSave * 1000:.0f} ms, {len(jsonText) / 1e6:.1f} MB, restore {jsonLoad * 1000:.0f} ms")
+    print(f"  Binary: save {binarySave * 1000:.0f} ms, {snapshotSize / 1e6:.1f} MB, ready in {binaryLoad * 1000:.0f} ms")
+    print(f"  First permit lookups on the standby: {firstLookups / len(lookupPlates) * 1e6:.1f} us each")
+
+
+def benchmarkSimulatedMonth(days=30, seed=1):
+    printSimulationReport(TrafficSimulator(days=days, seed=seed).run())
+
+
+if __name__ == "__main__":
+    benchmarkFreeSpaceSearch()
+    benchmarkPlacementPolicies()
+    benchmarkSlotStorage()
+    benchmarkBatchPricing()
+    benchmarkSegmentedBilling()
+    benchmarkGateService()
+    stressConcurrentGarage()
+    benchmarkSiteCoordinator()
+    benchmarkOutputModes()
+    benchmarkClockModes()
+    benchmarkPermitImport()
+    benchmarkTicketHistory()
+    benchmarkTicketFootprint()
+    benchmarkReservations()
+    benchmarkEventBus()
+    benchmarkInstrumentation()
+    benchmarkBinarySnapshot()
+    benchmarkSimulatedMonth()
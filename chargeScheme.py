@@ -1,5 +1,52 @@
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import timedelta
+from math import ceil
+from garageClock import SYSTEM_CLOCK
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+TARIFF_PLANS = {
+    "standard": {
+        "title": "Standard Pricing",
+        "heading": "STANDARD PRICING (Base Rates)",
+        "rates": {"Car": 5.00, "Motorcycle": 3.00, "Truck": 8.00, "Bus": 10.00}
+    },
+    "peak": {
+        "title": "Peak Hour Pricing",
+        "heading": "PEAK HOUR PRICING (8 AM - 6 PM Weekdays)",
+        "rates": {"Car": 7.50, "Motorcycle": 4.50, "Truck": 12.00, "Bus": 15.00}
+    },
+    "offPeak": {
+        "title": "Off-Peak Pricing",
+        "heading": "OFF-PEAK PRICING (6 PM - 8 AM Weekdays)",
+        "rates": {"Car": 3.50, "Motorcycle": 2.00, "Truck": 5.50, "Bus": 7.00}
+    },
+    "weekend": {
+        "title": "Weekend Pricing",
+        "heading": "WEEKEND PRICING (Saturday & Sunday)",
+        "rates": {"Car": 6.00, "Motorcycle": 3.50, "Truck": 9.00, "Bus": 12.00}
+    }
+}
+
+TARIFF_SCHEDULE = [
+    ("weekend", range(5, 7), range(0, 24)),
+    ("peak", range(0, 5), range(8, 18)),
+    ("offPeak", range(0, 5), range(0, 24))
+]
+
+DEFAULT_VEHICLE_TYPE = "Car"
+VEHICLE_LABELS = {"Motorcycle": "Bike"}
+HOURS_PER_WEEK = 7 * 24
+BILLING_MODES = ("checkout", "segmented")
+SEGMENTED_PLAN_TITLE = "Time-Segmented Pricing"
+
+
+def billableHours(hoursParked):
+    return max(1, ceil(hoursParked))
 
 
 class RateCalculator(ABC):
@@ -13,144 +60,225 @@ class RateCalculator(ABC):
         pass
 
 
-class RegularPricing(RateCalculator):
+class TariffPlan(RateCalculator):
     
-    def __init__(self):
-        self.ratePerHour = {
-            "Car": 5.00,
-            "Motorcycle": 3.00,
-            "Truck": 8.00,
-            "Bus": 10.00
-        }
+    tariffKey = None
     
-    def calculateFee(self, vehicleType, hoursParked):
-        rate = self.ratePerHour.get(vehicleType, 5.00)
-        if hoursParked < 1:
-            hoursParked = 1
-        hours = int(hoursParked) + (1 if hoursParked % 1 > 0 else 0)
-        return rate * hours
-    
-    def planTitle(self):
-        return "Standard Pricing"
-
-
-class RushHourRates(RateCalculator):
+    def __init__(self, tariffKey=None):
+        if tariffKey is not None:
+            self.tariffKey = tariffKey
+        tariff = TARIFF_PLANS[self.tariffKey]
+        self.title = tariff["title"]
+        self.heading = tariff["heading"]
+        self.ratePerHour = dict(tariff["rates"])
+        self.defaultRate = self.ratePerHour[DEFAULT_VEHICLE_TYPE]
     
-    def __init__(self):
-        self.ratePerHour = {
-            "Car": 7.50,
-            "Motorcycle": 4.50,
-            "Truck": 12.00,
-            "Bus": 15.00
-        }
+    def hourlyRate(self, vehicleType):
+        return self.ratePerHour.get(vehicleType, self.defaultRate)
     
     def calculateFee(self, vehicleType, hoursParked):
-        rate = self.ratePerHour.get(vehicleType, 7.50)
-        if hoursParked < 1:
-            hoursParked = 1
-        hours = int(hoursParked) + (1 if hoursParked % 1 > 0 else 0)
-        return rate * hours
+        return self.hourlyRate(vehicleType) * billableHours(hoursParked)
     
     def planTitle(self):
-        return "Peak Hour Pricing"
+        return self.title
 
 
-class DiscountedRates(RateCalculator):
+class RegularPricing(TariffPlan):
     
-    def __init__(self):
-        self.ratePerHour = {
-            "Car": 3.50,
-            "Motorcycle": 2.00,
-            "Truck": 5.50,
-            "Bus": 7.00
-        }
-    
-    def calculateFee(self, vehicleType, hoursParked):
-        rate = self.ratePerHour.get(vehicleType, 3.50)
-        if hoursParked < 1:
-            hoursParked = 1
-        hours = int(hoursParked) + (1 if hoursParked % 1 > 0 else 0)
-        return rate * hours
-    
-    def planTitle(self):
-        return "Off-Peak Pricing"
+    tariffKey = "standard"
 
 
-class HolidayRates(RateCalculator):
+class RushHourRates(TariffPlan):
     
-    def __init__(self):
-        self.ratePerHour = {
-            "Car": 6.00,
-            "Motorcycle": 3.50,
-            "Truck": 9.00,
-            "Bus": 12.00
-        }
+    tariffKey = "peak"
+
+
+class DiscountedRates(TariffPlan):
     
-    def calculateFee(self, vehicleType, hoursParked):
-        rate = self.ratePerHour.get(vehicleType, 6.00)
-        if hoursParked < 1:
-            hoursParked = 1
-        hours = int(hoursParked) + (1 if hoursParked % 1 > 0 else 0)
-        return rate * hours
+    tariffKey = "offPeak"
+
+
+class HolidayRates(TariffPlan):
     
-    def planTitle(self):
-        return "Weekend Pricing"
+    tariffKey = "weekend"
 
 
 class ChargeController:
     
-    def __init__(self):
+    def __init__(self, billingMode="checkout", clock=None):
+        if billingMode not in BILLING_MODES:
+            raise ValueError(f"Unknown billing mode: {billingMode}")
+        self.billingMode = billingMode
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
         self.regularRates = RegularPricing()
         self.rushHourRates = RushHourRates()
         self.discountRates = DiscountedRates()
         self.holidayRates = HolidayRates()
+        self.tariffPlans = {
+            plan.tariffKey: plan
+            for plan in (self.regularRates, self.rushHourRates, self.discountRates, self.holidayRates)
+        }
+        self.planBySlot = self._compileSchedule()
+        self.planRunLength = self._compilePlanRuns()
+        self.rateTable = self._compileRateTable()
+        self.defaultRates = self.rateTable[DEFAULT_VEHICLE_TYPE]
+        self.cumulativeCost = self._compileCumulativeCost()
+        self.defaultCumulativeCost = self.cumulativeCost[DEFAULT_VEHICLE_TYPE]
+        self.chargeDetails = self._compileChargeDetails()
+        self.activePlanCache = (None, None, None, None)
     
-    def determineActiveRate(self):
-        now = datetime.now()
-        dayOfWeek = now.weekday()
-        currentHour = now.hour
-        
-        if dayOfWeek >= 5:
-            return self.holidayRates
+    def _compileSchedule(self):
+        planBySlot = [None] * HOURS_PER_WEEK
+        for tariffKey, days, hours in reversed(TARIFF_SCHEDULE):
+            for day in days:
+                for hour in hours:
+                    planBySlot[day * 24 + hour] = self.tariffPlans[tariffKey]
+        return planBySlot
+    
+    def _compilePlanRuns(self):
+        planRunLength = [0] * HOURS_PER_WEEK
+        for slot in range(HOURS_PER_WEEK):
+            runLength = 1
+            while runLength < HOURS_PER_WEEK and self.planBySlot[(slot + runLength) % HOURS_PER_WEEK] is self.planBySlot[slot]:
+                runLength += 1
+            planRunLength[slot] = runLength
+        return planRunLength
+    
+    def _compileRateTable(self):
+        vehicleTypes = {vehicleType for tariff in TARIFF_PLANS.values() for vehicleType in tariff["rates"]}
+        return {
+            vehicleType: [plan.hourlyRate(vehicleType) for plan in self.planBySlot]
+            for vehicleType in vehicleTypes
+        }
+    
+    def _compileCumulativeCost(self):
+        cumulativeCost = {}
+        for vehicleType, hourlyRates in self.rateTable.items():
+            runningTotal = [0.0]
+            for rate in hourlyRates:
+                runningTotal.append(runningTotal[-1] + rate)
+            cumulativeCost[vehicleType] = runningTotal
+        return cumulativeCost
+    
+    def _compileChargeDetails(self):
+        lines = ["", "        ========== PRICING INFORMATION ==========", "        "]
+        for plan in self.tariffPlans.values():
+            lines.append(f"        {plan.heading}:")
+            for vehicleType, rate in plan.ratePerHour.items():
+                lines.append(f"        - {VEHICLE_LABELS.get(vehicleType, vehicleType)}: ${rate:.2f}/hour")
+            lines.append("        ")
+        lines.extend(["        =========================================", "        "])
+        return "\n".join(lines)
+    
+    def determineActiveRate(self, currentTime=None):
+        now = currentTime if currentTime is not None else self.clock.now()
+        return self._activeSlot(now)[1]
+    
+    def _activeSlot(self, now):
+        validFrom, validUntil, slot, plan = self.activePlanCache
+        if validFrom is not None and validFrom <= now < validUntil:
+            return slot, plan
         
-        if 8 <= currentHour < 18:
-            return self.rushHourRates
+        slot = now.weekday() * 24 + now.hour
+        plan = self.planBySlot[slot]
+        validFrom = now.replace(minute=0, second=0, microsecond=0)
+        self.activePlanCache = (validFrom, validFrom + timedelta(hours=self.planRunLength[slot]), slot, plan)
+        return slot, plan
         
-        return self.discountRates
+    def _rateForSlot(self, dayOfWeek, currentHour):
+        return self.planBySlot[dayOfWeek * 24 + currentHour]
     
-    def determineParkingCost(self, vehicleType, hoursParked):
-        strategy = self.determineActiveRate()
-        fee = strategy.calculateFee(vehicleType, hoursParked)
-        return fee, strategy.planTitle()
+    def determineParkingCost(self, vehicleType, hoursParked, currentTime=None, checkInTime=None):
+        if self.billingMode == "segmented" and checkInTime is not None:
+            return self.determineSegmentedCost(vehicleType, checkInTime, hoursParked)
+        now = currentTime if currentTime is not None else self.clock.now()
+        slot, plan = self._activeSlot(now)
+        fee = self.rateTable.get(vehicleType, self.defaultRates)[slot] * billableHours(hoursParked)
+        return fee, plan.planTitle()
     
-    def displayChargeDetails(self):
-        info = """
-        ========== PRICING INFORMATION ==========
+    def determineSegmentedCost(self, vehicleType, checkInTime, hoursParked):
+        billedHours = billableHours(hoursParked)
+        startSlot = checkInTime.weekday() * 24 + checkInTime.hour
+        hourFraction = (checkInTime.minute * 60 + checkInTime.second + checkInTime.microsecond / 1e6) / 3600
+        endSlot = startSlot + billedHours
+        
+        cumulativeCost = self.cumulativeCost.get(vehicleType, self.defaultCumulativeCost)
+        hourlyRates = self.rateTable.get(vehicleType, self.defaultRates)
+        fullWeeks, endOffset = divmod(endSlot, HOURS_PER_WEEK)
+        fee = (fullWeeks * cumulativeCost[HOURS_PER_WEEK] + cumulativeCost[endOffset] - cumulativeCost[startSlot]
+               + hourFraction * (hourlyRates[endOffset] - hourlyRates[startSlot]))
+        
+        if hourFraction + billedHours <= self.planRunLength[startSlot]:
+            planName = self.planBySlot[startSlot].planTitle()
+        else:
+            planName = SEGMENTED_PLAN_TITLE
+        return round(fee, 2), planName
+    
+    def determineBatchParkingCost(self, vehicleTypes, hoursParked=None, checkOutTimes=None,
+                                  checkInTimes=None, strategy=None):
+        if hoursParked is None:
+            hoursParked = [(checkOut - checkIn).total_seconds() / 3600
+                           for checkIn, checkOut in zip(checkInTimes, checkOutTimes)]
         
-        STANDARD PRICING (Base Rates):
-        - Car: $5.00/hour
-        - Bike: $3.00/hour
-        - Truck: $8.00/hour
-        - Bus: $10.00/hour
+        if self.billingMode == "segmented" and checkInTimes is not None and strategy is None:
+            segmentedCosts = [self.determineSegmentedCost(vehicleType, checkIn, hours)
+                              for vehicleType, checkIn, hours in zip(vehicleTypes, checkInTimes, hoursParked)]
+            return [fee for fee, _ in segmentedCosts], [planName for _, planName in segmentedCosts]
         
-        PEAK HOUR PRICING (8 AM - 6 PM Weekdays):
-        - Car: $7.50/hour
-        - Bike: $4.50/hour
-        - Truck: $12.00/hour
-        - Bus: $15.00/hour
+        if strategy is not None:
+            strategies = [strategy]
+            planCodes = [0] * len(vehicleTypes)
+        elif checkOutTimes is None:
+            strategies = [self.determineActiveRate()]
+            planCodes = [0] * len(vehicleTypes)
+        else:
+            strategies, planCodes = self._planCodesForTimes(checkOutTimes)
         
-        OFF-PEAK PRICING (6 PM - 8 AM Weekdays):
-        - Car: $3.50/hour
-        - Bike: $2.00/hour
-        - Truck: $5.50/hour
-        - Bus: $7.00/hour
+        typeCodes, rateTable = self._buildRateTable(vehicleTypes, strategies)
+        planTitles = [plan.planTitle() for plan in strategies]
         
-        WEEKEND PRICING (Saturday & Sunday):
-        - Car: $6.00/hour
-        - Bike: $3.50/hour
-        - Truck: $9.00/hour
-        - Bus: $12.00/hour
+        if numpy is not None:
+            planArray = numpy.asarray(planCodes, dtype=numpy.intp)
+            hours = numpy.maximum(numpy.ceil(numpy.asarray(hoursParked, dtype=numpy.float64)), 1.0)
+            rates = numpy.asarray(rateTable, dtype=numpy.float64)[planArray, numpy.asarray(typeCodes, dtype=numpy.intp)]
+            fees = (rates * hours).tolist()
+            planNames = numpy.asarray(planTitles, dtype=object)[planArray].tolist()
+            return fees, planNames
         
-        =========================================
-        """
-        return info
+        fees = [rateTable[plan][typeCode] * (1 if hours < 1 else int(hours) + (1 if hours % 1 > 0 else 0))
+                for plan, typeCode, hours in zip(planCodes, typeCodes, hoursParked)]
+        planNames = [planTitles[plan] for plan in planCodes]
+        return fees, planNames
+    
+    def _planCodesForTimes(self, checkOutTimes):
+        strategies = []
+        strategyCodes = {}
+        slotCodes = {}
+        planCodes = []
+        for checkOut in checkOutTimes:
+            slot = (checkOut.weekday(), checkOut.hour)
+            code = slotCodes.get(slot)
+            if code is None:
+                strategy = self._rateForSlot(*slot)
+                if id(strategy) not in strategyCodes:
+                    strategyCodes[id(strategy)] = len(strategies)
+                    strategies.append(strategy)
+                code = strategyCodes[id(strategy)]
+                slotCodes[slot] = code
+            planCodes.append(code)
+        return strategies, planCodes
+    
+    def _buildRateTable(self, vehicleTypes, strategies):
+        typeIndex = {}
+        typeCodes = []
+        for vehicleType in vehicleTypes:
+            code = typeIndex.get(vehicleType)
+            if code is None:
+                code = typeIndex[vehicleType] = len(typeIndex)
+            typeCodes.append(code)
+        rateTable = [[plan.hourlyRate(vehicleType) for vehicleType in typeIndex]
+                     for plan in strategies]
+        return typeCodes, rateTable
+    
+    def displayChargeDetails(self):
+        return self.chargeDetails
@@ -0,0 +1,128 @@
+from array import array
+from datetime import datetime, timedelta
+from garageClock import SYSTEM_CLOCK
+
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def toEpochMicros(moment):
+    return (moment - EPOCH) // ONE_MICROSECOND
+
+
+def fromEpochMicros(micros):
+    return EPOCH + timedelta(microseconds=micros)
+
+
+class CompactSlotView:
+    
+    __slots__ = ("store", "slotID")
+    
+    def __init__(self, store, slotID):
+        self.store = store
+        self.slotID = slotID
+    
+    @property
+    def slotTaken(self):
+        return self.store.occupancy[self.slotID] == 1
+    
+    @property
+    def vehicle(self):
+        return self.store.vehicleAt(self.slotID)
+    
+    @property
+    def checkInTime(self):
+        return self.store.checkInTimeAt(self.slotID)
+    
+    def assignSlot(self, vehicle, checkInTime=None):
+        return self.store.assign(self.slotID, vehicle, checkInTime)
+    
+    def releaseSlot(self):
+        return self.store.release(self.slotID)
+    
+    def SlotInfo(self):
+        status = "Occupied" if self.slotTaken else "Available"
+        info = f"Space #{self.slotID}: {status}"
+        if self.slotTaken:
+            info += f" | Vehicle: {self.vehicle.PlateNumber()}"
+        return info
+
+
+class CompactSlotStore:
+    
+    def __init__(self, maximumCapacity):
+        self.maximumCapacity = maximumCapacity
+        self.occupancy = bytearray(maximumCapacity + 1)
+        self.checkInMicros = array("q", bytes(8 * (maximumCapacity + 1)))
+        self.vehicleHandles = array("l", bytes(array("l").itemsize * (maximumCapacity + 1)))
+        self.vehicleTable = {}
+        self.handleByVehicle = {}
+        self.handleReferences = {}
+        self.nextHandle = 1
+    
+    def __len__(self):
+        return self.maximumCapacity
+    
+    def __contains__(self, slotID):
+        return isinstance(slotID, int) and 1 <= slotID <= self.maximumCapacity
+    
+    def __iter__(self):
+        return iter(range(1, self.maximumCapacity + 1))
+    
+    def __getitem__(self, slotID):
+        if slotID not in self:
+            raise KeyError(slotID)
+        return CompactSlotView(self, slotID)
+    
+    def values(self):
+        for slotID in self:
+            yield CompactSlotView(self, slotID)
+    
+    def vehicleAt(self, slotID):
+        return self.vehicleTable.get(self.vehicleHandles[slotID])
+    
+    def checkInTimeAt(self, slotID):
+        if not self.occupancy[slotID]:
+            return None
+        return fromEpochMicros(self.checkInMicros[slotID])
+    
+    def _acquireHandle(self, vehicle):
+        handle = self.handleByVehicle.get(id(vehicle))
+        if handle is None:
+            handle = self.nextHandle
+            self.nextHandle += 1
+            self.vehicleTable[handle] = vehicle
+            self.handleByVehicle[id(vehicle)] = handle
+            self.handleReferences[handle] = 0
+        self.handleReferences[handle] += 1
+        return handle
+    
+    def _dropHandle(self, handle):
+        self.handleReferences[handle] -= 1
+        if self.handleReferences[handle] == 0:
+            vehicle = self.vehicleTable.pop(handle)
+            del self.handleByVehicle[id(vehicle)]
+            del self.handleReferences[handle]
+    
+    def assign(self, slotID, vehicle, checkInTime=None):
+        if self.occupancy[slotID]:
+            return False
+        if checkInTime is None:
+            checkInTime = SYSTEM_CLOCK.now()
+        self.occupancy[slotID] = 1
+        self.vehicleHandles[slotID] = self._acquireHandle(vehicle)
+        self.checkInMicros[slotID] = toEpochMicros(checkInTime)
+        return True
+    
+    def release(self, slotID):
+        if not self.occupancy[slotID]:
+            return None, None
+        handle = self.vehicleHandles[slotID]
+        vehicle = self.vehicleTable[handle]
+        checkInTime = fromEpochMicros(self.checkInMicros[slotID])
+        self.occupancy[slotID] = 0
+        self.vehicleHandles[slotID] = 0
+        self.checkInMicros[slotID] = 0
+        self._dropHandle(handle)
+        return vehicle, checkInTime
@@ -0,0 +1,209 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from garageClock import SYSTEM_CLOCK
+
+
+EVENT_TYPES = ("checkin", "checkout", "payment", "monthly", "daypass", "import", "reserve", "cancel")
+
+
+class GarageEvent:
+    
+    __slots__ = ("sequence", "eventType", "registrationNumber", "occurredAt", "payload", "publishedAt")
+    
+    def __init__(self, sequence, eventType, registrationNumber, occurredAt, payload):
+        self.sequence = sequence
+        self.eventType = eventType
+        self.registrationNumber = registrationNumber
+        self.occurredAt = occurredAt
+        self.payload = payload
+        self.publishedAt = time.monotonic()
+    
+    def __repr__(self):
+        return f"GarageEvent({self.sequence}, {self.eventType!r}, {self.registrationNumber!r})"
+
+
+class EventSubscriber(ABC):
+    
+    @abstractmethod
+    def handleBatch(self, events):
+        pass
+    
+    def subscriberName(self):
+        return type(self).__name__
+
+
+class CallbackSubscriber(EventSubscriber):
+    
+    def __init__(self, callback, name=None):
+        self.callback = callback
+        self.name = name
+    
+    def handleBatch(self, events):
+        for event in events:
+            self.callback(event)
+    
+    def subscriberName(self):
+        return self.name or getattr(self.callback, "__name__", "callback")
+
+
+class CollectingSubscriber(EventSubscriber):
+    
+    def __init__(self):
+        self.events = []
+    
+    def handleBatch(self, events):
+        self.events.extend(events)
+
+
+class Subscription:
+    
+    def __init__(self, subscriber, eventTypes=None, queueSize=1024, batchSize=64):
+        if eventTypes is not None:
+            unknownTypes = set(eventTypes) - set(EVENT_TYPES)
+            if unknownTypes:
+                raise ValueError(f"Unknown event types: {', '.join(sorted(unknownTypes))}")
+        self.subscriber = subscriber
+        self.eventTypes = frozenset(eventTypes) if eventTypes is not None else None
+        self.queueSize = queueSize
+        self.batchSize = batchSize
+        self.pendingEvents = deque()
+        self.queueCondition = threading.Condition()
+        self.closing = False
+        self.busy = False
+        self.enqueuedCount = 0
+        self.deliveredCount = 0
+        self.droppedCount = 0
+        self.failedBatches = 0
+        self.batchCount = 0
+        self.worker = threading.Thread(target=self._deliver, name=f"event-{subscriber.subscriberName()}",
+                                       daemon=True)
+        self.worker.start()
+    
+    def accepts(self, eventType):
+        return self.eventTypes is None or eventType in self.eventTypes
+    
+    def offer(self, event):
+        with self.queueCondition:
+            if self.closing:
+                return False
+            if len(self.pendingEvents) >= self.queueSize:
+                self.droppedCount += 1
+                return False
+            self.pendingEvents.append(event)
+            self.enqueuedCount += 1
+            if len(self.pendingEvents) == 1:
+                self.queueCondition.notify_all()
+            return True
+    
+    def _deliver(self):
+        while True:
+            with self.queueCondition:
+                while not self.pendingEvents and not self.closing:
+                    self.queueCondition.wait()
+                if not self.pendingEvents:
+                    return
+                takeCount = min(self.batchSize, len(self.pendingEvents))
+                batch = [self.pendingEvents.popleft() for _ in range(takeCount)]
+                self.busy = True
+            
+            try:
+                self.subscriber.handleBatch(batch)
+            except Exception:
+                failed = True
+            else:
+                failed = False
+            
+            with self.queueCondition:
+                self.busy = False
+                self.batchCount += 1
+                self.deliveredCount += len(batch)
+                if failed:
+                    self.failedBatches += 1
+                self.queueCondition.notify_all()
+    
+    def drain(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queueCondition:
+            while self.pendingEvents or self.busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.queueCondition.wait(remaining)
+            return True
+    
+    def close(self, timeout=None):
+        with self.queueCondition:
+            self.closing = True
+            self.queueCondition.notify_all()
+        self.worker.join(timeout)
+    
+    def lagMetrics(self):
+        with self.queueCondition:
+            oldestEvent = self.pendingEvents[0] if self.pendingEvents else None
+            return {
+                "queued": len(self.pendingEvents),
+                "capacity": self.queueSize,
+                "enqueued": self.enqueuedCount,
+                "delivered": self.deliveredCount,
+                "dropped": self.droppedCount,
+                "failedBatches": self.failedBatches,
+                "batches": self.batchCount,
+                "lagEvents": self.enqueuedCount - self.deliveredCount,
+                "lagSeconds": time.monotonic() - oldestEvent.publishedAt if oldestEvent is not None else 0.0
+            }
+
+
+class EventBus:
+    
+    def __init__(self, queueSize=1024, batchSize=64, clock=None):
+        self.queueSize = queueSize
+        self.batchSize = batchSize
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.subscriptions = []
+        self.publishedCount = 0
+        self.sequenceLock = threading.Lock()
+    
+    def subscribe(self, subscriber, eventTypes=None, queueSize=None, batchSize=None):
+        subscription = Subscription(subscriber, eventTypes,
+                                    queueSize if queueSize is not None else self.queueSize,
+                                    batchSize if batchSize is not None else self.batchSize)
+        self.subscriptions = self.subscriptions + [subscription]
+        return subscription
+    
+    def unsubscribe(self, subscription, timeout=None):
+        self.subscriptions = [current for current in self.subscriptions if current is not subscription]
+        subscription.close(timeout)
+    
+    def publish(self, eventType, registrationNumber=None, payload=None, occurredAt=None):
+        subscriptions = self.subscriptions
+        if not subscriptions:
+            return None
+        with self.sequenceLock:
+            self.publishedCount += 1
+            sequence = self.publishedCount
+        event = GarageEvent(sequence, eventType, registrationNumber,
+                            occurredAt if occurredAt is not None else self.clock.now(), payload or {})
+        for subscription in subscriptions:
+            if subscription.accepts(eventType):
+                subscription.offer(event)
+        return event
+    
+    def drain(self, timeout=None):
+        return all(subscription.drain(timeout) for subscription in self.subscriptions)
+    
+    def close(self, timeout=None):
+        subscriptions = self.subscriptions
+        self.subscriptions = []
+        for subscription in subscriptions:
+            subscription.close(timeout)
+    
+    def lagMetrics(self):
+        metrics = {}
+        for subscription in self.subscriptions:
+            name = subscription.subscriber.subscriberName()
+            if name in metrics:
+                name = f"{name}#{len(metrics)}"
+            metrics[name] = subscription.lagMetrics()
+        return metrics
@@ -0,0 +1,46 @@
+import time
+from datetime import datetime, timedelta
+
+
+class SystemClock:
+    
+    def now(self):
+        return datetime.now()
+
+
+class CoarseClock:
+    
+    def __init__(self, resolution=0.01):
+        self.resolution = resolution
+        self.cachedTime = datetime.now()
+        self.refreshAt = time.monotonic() + resolution
+    
+    def now(self):
+        currentTick = time.monotonic()
+        if currentTick >= self.refreshAt:
+            self.cachedTime = datetime.now()
+            self.refreshAt = currentTick + self.resolution
+        return self.cachedTime
+
+
+class VirtualClock:
+    
+    def __init__(self, startTime=None):
+        self.currentTime = startTime if startTime is not None else datetime(2026, 1, 5)
+    
+    def now(self):
+        return self.currentTime
+    
+    def advance(self, delta):
+        if not isinstance(delta, timedelta):
+            delta = timedelta(seconds=delta)
+        self.currentTime += delta
+        return self.currentTime
+    
+    def advanceTo(self, moment):
+        if moment > self.currentTime:
+            self.currentTime = moment
+        return self.currentTime
+
+
+SYSTEM_CLOCK = SystemClock()
@@ -0,0 +1,222 @@
+import cProfile
+import functools
+import io
+import pstats
+import threading
+import time
+from bisect import bisect_left
+
+
+LATENCY_BUCKETS = (0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.1, 1.0)
+
+
+class LatencyHistogram:
+    
+    def __init__(self, bucketBounds=LATENCY_BUCKETS):
+        self.bucketBounds = bucketBounds
+        self.bucketCounts = [0] * (len(bucketBounds) + 1)
+        self.observationCount = 0
+        self.totalSeconds = 0.0
+    
+    def observe(self, seconds):
+        self.bucketCounts[bisect_left(self.bucketBounds, seconds)] += 1
+        self.observationCount += 1
+        self.totalSeconds += seconds
+    
+    def percentile(self, fraction):
+        if not self.observationCount:
+            return 0.0
+        target = fraction * self.observationCount
+        seen = 0
+        for position, bucketCount in enumerate(self.bucketCounts):
+            seen += bucketCount
+            if seen >= target:
+                return self.bucketBounds[position] if position < len(self.bucketBounds) else float("inf")
+        return float("inf")
+    
+    def cumulativeBuckets(self):
+        seen = 0
+        for bound, bucketCount in zip(self.bucketBounds + (float("inf"),), self.bucketCounts):
+            seen += bucketCount
+            yield bound, seen
+
+
+class StageLaps:
+    
+    __slots__ = ("registry", "operationName", "lastLap")
+    
+    def __init__(self, registry, operationName):
+        self.registry = registry
+        self.operationName = operationName
+        self.lastLap = time.perf_counter()
+    
+    def lap(self, stageName):
+        now = time.perf_counter()
+        self.registry.observeStage(self.operationName, stageName, now - self.lastLap)
+        self.lastLap = now
+
+
+class MetricsRegistry:
+    
+    def __init__(self, enabled=False, bucketBounds=LATENCY_BUCKETS):
+        self.enabled = enabled
+        self.bucketBounds = bucketBounds
+        self.operationHistograms = {}
+        self.stageHistograms = {}
+        self.counters = {}
+        self.profiles = {}
+        self.profileEvery = 0
+        self.profileCalls = 0
+        self.active = enabled
+        self.registryLock = threading.Lock()
+    
+    def enable(self):
+        self.enabled = True
+        self.active = True
+    
+    def disable(self):
+        self.enabled = False
+        self.active = self.profileEvery > 0
+    
+    def reset(self):
+        with self.registryLock:
+            self.operationHistograms = {}
+            self.stageHistograms = {}
+            self.counters = {}
+    
+    def _observe(self, histograms, key, seconds):
+        with self.registryLock:
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = LatencyHistogram(self.bucketBounds)
+            histogram.observe(seconds)
+    
+    def stageLaps(self, operationName):
+        if not self.enabled:
+            return None
+        return StageLaps(self, operationName)
+    
+    def observeStage(self, operationName, stageName, seconds):
+        self._observe(self.stageHistograms, (operationName, stageName), seconds)
+    
+    def increment(self, counterName, labels="", amount=1):
+        if self.enabled:
+            key = (counterName, labels)
+            with self.registryLock:
+                self.counters[key] = self.counters.get(key, 0) + amount
+    
+    def measureOperation(self, operationName, method, instance, args, kwargs):
+        profile = self._sampledProfile()
+        started = time.perf_counter()
+        if profile is not None:
+            result = profile.runcall(method, instance, *args, **kwargs)
+        else:
+            result = method(instance, *args, **kwargs)
+        elapsed = time.perf_counter() - started
+        if self.enabled:
+            self._observe(self.operationHistograms, operationName, elapsed)
+            outcome = "refused" if result is None or result is False else "ok"
+            self.increment("garage_operations_total", f'operation="{operationName}",outcome="{outcome}"')
+        return result
+    
+    def startProfiling(self, sampleEvery=1):
+        self.profileCalls = 0
+        self.profiles = {}
+        self.profileEvery = max(1, sampleEvery)
+        self.active = True
+    
+    def stopProfiling(self):
+        self.profileEvery = 0
+        self.active = self.enabled
+        return self.profileStats()
+    
+    def _sampledProfile(self):
+        if not self.profileEvery:
+            return None
+        with self.registryLock:
+            self.profileCalls += 1
+            if self.profileCalls % self.profileEvery:
+                return None
+            threadID = threading.get_ident()
+            profile = self.profiles.get(threadID)
+            if profile is None:
+                profile = self.profiles[threadID] = cProfile.Profile()
+            return profile
+    
+    def profileStats(self, sortKey="cumulative", limit=25):
+        profiles = list(self.profiles.values())
+        if not profiles:
+            return ""
+        output = io.StringIO()
+        stats = pstats.Stats(profiles[0], stream=output)
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.sort_stats(sortKey).print_stats(limit)
+        return output.getvalue()
+    
+    def metricsSnapshot(self):
+        with self.registryLock:
+            return {
+                "operations": {
+                    name: {"count": histogram.observationCount, "totalSeconds": histogram.totalSeconds,
+                           "p50": histogram.percentile(0.5), "p99": histogram.percentile(0.99)}
+                    for name, histogram in self.operationHistograms.items()
+                },
+                "stages": {
+                    f"{operationName}.{stageName}": {"count": histogram.observationCount,
+                                                     "totalSeconds": histogram.totalSeconds,
+                                                     "p50": histogram.percentile(0.5),
+                                                     "p99": histogram.percentile(0.99)}
+                    for (operationName, stageName), histogram in self.stageHistograms.items()
+                },
+                "counters": {f"{name}{{{labels}}}" if labels else name: value
+                             for (name, labels), value in self.counters.items()}
+            }
+    
+    def exportPrometheus(self):
+        with self.registryLock:
+            operations = sorted(self.operationHistograms.items())
+            stages = sorted(self.stageHistograms.items())
+            counters = sorted(self.counters.items())
+            return self._prometheusText(operations, stages, counters)
+    
+    def _prometheusText(self, operations, stages, counters):
+        lines = [
+            "# HELP garage_operation_seconds Latency of GarageManager entry points.",
+            "# TYPE garage_operation_seconds histogram"
+        ]
+        for operationName, histogram in operations:
+            lines.extend(self._histogramLines("garage_operation_seconds", f'operation="{operationName}"', histogram))
+        
+        lines.append("# HELP garage_stage_seconds Latency of individual stages inside an operation.")
+        lines.append("# TYPE garage_stage_seconds histogram")
+        for (operationName, stageName), histogram in stages:
+            lines.extend(self._histogramLines("garage_stage_seconds",
+                                              f'operation="{operationName}",stage="{stageName}"', histogram))
+        
+        previousName = None
+        for (counterName, labels), value in counters:
+            if counterName != previousName:
+                lines.append(f"# TYPE {counterName} counter")
+                previousName = counterName
+            lines.append(f"{counterName}{{{labels}}} {value}" if labels else f"{counterName} {value}")
+        return "\n".join(lines) + "\n"
+    
+    def _histogramLines(self, metricName, labels, histogram):
+        for bound, seen in histogram.cumulativeBuckets():
+            upperBound = "+Inf" if bound == float("inf") else repr(bound)
+            yield f'{metricName}_bucket{{{labels},le="{upperBound}"}} {seen}'
+        yield f"{metricName}_sum{{{labels}}} {histogram.totalSeconds!r}"
+        yield f"{metricName}_count{{{labels}}} {histogram.observationCount}"
+
+
+def instrumentedOperation(operationName):
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.metrics.active:
+                return method(self, *args, **kwargs)
+            return self.metrics.measureOperation(operationName, method, self, args, kwargs)
+        return wrapper
+    return decorate
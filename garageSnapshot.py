@@ -0,0 +1,229 @@
+import mmap
+import os
+import struct
+from array import array
+from compactSlotStore import toEpochMicros, fromEpochMicros
+
+
+SNAPSHOT_MAGIC = b"GARSNAP\x00"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<8sHHIqqqqIIIIQQQQQQ")
+TICKET_RECORD = struct.Struct("<qIIIIHBxqqd")
+PERMIT_RECORD = struct.Struct("<IIIqBB6x")
+NO_STRING = 0xFFFFFFFF
+NO_TIME = -(2 ** 63)
+
+
+class SnapshotStrings:
+    
+    def __init__(self):
+        self.strings = []
+        self.stringIDs = {}
+    
+    def reference(self, value):
+        if value is None:
+            return NO_STRING
+        stringID = self.stringIDs.get(value)
+        if stringID is None:
+            stringID = self.stringIDs[value] = len(self.strings)
+            self.strings.append(value)
+        return stringID
+    
+    def encode(self):
+        offsets = array("I", [0])
+        blob = bytearray()
+        for value in self.strings:
+            blob += value.encode()
+            offsets.append(len(blob))
+        return offsets.tobytes(), bytes(blob)
+
+
+def _alignedLength(length):
+    return (length + 7) & ~7
+
+
+def writeGarageSnapshot(path, maximumCapacity, counters, openTickets, monthlyPermits, singlePermits, createdAt):
+    strings = SnapshotStrings()
+    tickets = sorted(openTickets, key=lambda ticket: ticket.registrationNumber)
+    slotTable = array("I", bytes(4 * maximumCapacity))
+    ticketTable = bytearray()
+    for ticketIndex, ticket in enumerate(tickets):
+        slotIDs = list(ticket.assignedSlots)
+        if slotIDs != list(range(slotIDs[0], slotIDs[0] + len(slotIDs))):
+            raise ValueError(f"Ticket {ticket.tokenNumber} does not hold a contiguous run of slots")
+        for slotID in slotIDs:
+            slotTable[slotID - 1] = ticketIndex + 1
+        ticketTable += TICKET_RECORD.pack(
+            ticket.tokenNumber,
+            strings.reference(ticket.registrationNumber),
+            strings.reference(ticket.vehicleType),
+            strings.reference(ticket.pricingPlan),
+            slotIDs[0],
+            len(slotIDs),
+            1 if ticket.paymentStatus else 0,
+            toEpochMicros(ticket.checkInTime),
+            toEpochMicros(ticket.checkOutTime) if ticket.checkOutTime else NO_TIME,
+            ticket.parkingCharge
+        )
+    
+    permitTables = []
+    for permits in (monthlyPermits, singlePermits):
+        permitTable = bytearray()
+        for permit in sorted(permits, key=lambda permit: permit.registrationNumber):
+            permitTable += PERMIT_RECORD.pack(
+                strings.reference(permit.permitID),
+                strings.reference(permit.registrationNumber),
+                strings.reference(permit.vehicleType),
+                toEpochMicros(permit.activationDate),
+                1 if permit.activeStatus else 0,
+                1 if getattr(permit, "redemptionStatus", False) else 0
+            )
+        permitTables.append(permitTable)
+    
+    stringOffsets, stringData = strings.encode()
+    sections = [slotTable.tobytes(), bytes(ticketTable), bytes(permitTables[0]), bytes(permitTables[1]),
+                stringOffsets, stringData]
+    sectionOffsets = []
+    position = SNAPSHOT_HEADER.size
+    for section in sections:
+        sectionOffsets.append(position)
+        position += _alignedLength(len(section))
+    
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, SNAPSHOT_HEADER.size, maximumCapacity,
+        counters["tokenCounter"], counters["monthlyIDCounter"], counters["singleIDCounter"], toEpochMicros(createdAt),
+        len(tickets), len(permitTables[0]) // PERMIT_RECORD.size, len(permitTables[1]) // PERMIT_RECORD.size,
+        len(strings.strings), *sectionOffsets
+    )
+    
+    temporaryPath = path + ".tmp"
+    with open(temporaryPath, "wb") as snapshotFile:
+        snapshotFile.write(header)
+        for section in sections:
+            snapshotFile.write(section)
+            snapshotFile.write(bytes(_alignedLength(len(section)) - len(section)))
+        snapshotFile.flush()
+        os.fsync(snapshotFile.fileno())
+    os.replace(temporaryPath, path)
+    return position
+
+
+class GarageSnapshot:
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as snapshotFile:
+            self.mapping = mmap.mmap(snapshotFile.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mapping) < SNAPSHOT_HEADER.size:
+            self.mapping.close()
+            raise ValueError(f"{path} is too short to be a garage snapshot")
+        
+        (magic, version, headerSize, self.maximumCapacity, self.tokenCounter, self.monthlyIDCounter,
+         self.singleIDCounter, createdAt, self.ticketCount, self.monthlyCount, self.singleCount, self.stringCount,
+         slotOffset, ticketOffset, monthlyOffset, singleOffset, stringOffsetsOffset,
+         stringDataOffset) = SNAPSHOT_HEADER.unpack_from(self.mapping, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.mapping.close()
+            raise ValueError(f"{path} is not a garage snapshot")
+        if version != SNAPSHOT_VERSION or headerSize != SNAPSHOT_HEADER.size:
+            self.mapping.close()
+            raise ValueError(f"Unsupported garage snapshot version {version}")
+        
+        self.createdAt = fromEpochMicros(createdAt)
+        self.ticketOffset = ticketOffset
+        self.permitOffsets = {"monthly": monthlyOffset, "single": singleOffset}
+        self.permitCounts = {"monthly": self.monthlyCount, "single": self.singleCount}
+        self.stringDataOffset = stringDataOffset
+        self.view = memoryview(self.mapping)
+        self.slotTickets = self.view[slotOffset:slotOffset + 4 * self.maximumCapacity].cast("I")
+        self.stringOffsets = self.view[stringOffsetsOffset:stringOffsetsOffset + 4 * (self.stringCount + 1)].cast("I")
+        self.stringCache = {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exceptionInfo):
+        self.close()
+    
+    def close(self):
+        if self.mapping is None:
+            return
+        self.slotTickets.release()
+        self.stringOffsets.release()
+        self.view.release()
+        self.mapping.close()
+        self.mapping = None
+    
+    def stringAt(self, stringID):
+        if stringID == NO_STRING:
+            return None
+        value = self.stringCache.get(stringID)
+        if value is None:
+            start = self.stringDataOffset + self.stringOffsets[stringID]
+            end = self.stringDataOffset + self.stringOffsets[stringID + 1]
+            value = self.stringCache[stringID] = str(self.view[start:end], "utf-8")
+        return value
+    
+    def slotOccupied(self, slotID):
+        return self.slotTickets[slotID - 1] != 0
+    
+    def occupiedSlotCount(self):
+        return sum(1 for ticketIndex in self.slotTickets if ticketIndex)
+    
+    def ticketAt(self, ticketIndex):
+        (token, plateRef, typeRef, planRef, firstSlot, slotCount, paid, checkIn, checkOut,
+         fee) = TICKET_RECORD.unpack_from(self.mapping, self.ticketOffset + ticketIndex * TICKET_RECORD.size)
+        return (
+            token,
+            self.stringAt(plateRef),
+            self.stringAt(typeRef),
+            list(range(firstSlot, firstSlot + slotCount)),
+            fromEpochMicros(checkIn),
+            fromEpochMicros(checkOut) if checkOut != NO_TIME else None,
+            fee,
+            self.stringAt(planRef),
+            bool(paid)
+        )
+    
+    def tickets(self):
+        for ticketIndex in range(self.ticketCount):
+            yield self.ticketAt(ticketIndex)
+    
+    def ticketForSlot(self, slotID):
+        ticketIndex = self.slotTickets[slotID - 1]
+        return self.ticketAt(ticketIndex - 1) if ticketIndex else None
+    
+    def _plateAt(self, offset, recordSize, plateField, index):
+        return self.stringAt(struct.unpack_from("<I", self.mapping, offset + index * recordSize + plateField)[0])
+    
+    def _searchPlate(self, offset, recordSize, plateField, count, registrationNumber):
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if self._plateAt(offset, recordSize, plateField, middle) < registrationNumber:
+                low = middle + 1
+            else:
+                high = middle
+        if low < count and self._plateAt(offset, recordSize, plateField, low) == registrationNumber:
+            return low
+        return None
+    
+    def findTicket(self, registrationNumber):
+        ticketIndex = self._searchPlate(self.ticketOffset, TICKET_RECORD.size, 8, self.ticketCount, registrationNumber)
+        return self.ticketAt(ticketIndex) if ticketIndex is not None else None
+    
+    def permitAt(self, permitKind, permitIndex):
+        permitID, plateRef, typeRef, activation, active, redeemed = PERMIT_RECORD.unpack_from(
+            self.mapping, self.permitOffsets[permitKind] + permitIndex * PERMIT_RECORD.size
+        )
+        return (self.stringAt(permitID), self.stringAt(plateRef), self.stringAt(typeRef),
+                fromEpochMicros(activation), bool(active), bool(redeemed))
+    
+    def permits(self, permitKind):
+        for permitIndex in range(self.permitCounts[permitKind]):
+            yield self.permitAt(permitKind, permitIndex)
+    
+    def findPermit(self, permitKind, registrationNumber):
+        permitIndex = self._searchPlate(self.permitOffsets[permitKind], PERMIT_RECORD.size, 4,
+                                        self.permitCounts[permitKind], registrationNumber)
+        return self.permitAt(permitKind, permitIndex) if permitIndex is not None else None
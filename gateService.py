@@ -0,0 +1,122 @@
+import asyncio
+import json
+from parkingSystem import GarageManager, VEHICLE_CLASSES
+from outputSink import NullSink
+
+
+class GateService:
+    
+    def __init__(self, garage, host="127.0.0.1", port=8765):
+        self.garage = garage
+        self.host = host
+        self.port = port
+        self.server = None
+        self.operations = {
+            "checkin": self.checkIn,
+            "checkout": self.checkOut,
+            "payment": self.payment,
+            "track": self.track,
+            "capacity": self.capacity
+        }
+    
+    async def start(self):
+        self.server = await asyncio.start_server(self.handleConnection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+    
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+    
+    async def handleConnection(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = self.dispatch(line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    
+    def dispatch(self, line):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"ok": False, "error": "Malformed request"}
+        return self.handleRequest(request)
+    
+    def handleRequest(self, request):
+        try:
+            operation = self.operations[request["op"]]
+        except (KeyError, TypeError):
+            return {"ok": False, "error": "Malformed request"}
+        
+        try:
+            return operation(request)
+        except KeyError as missing:
+            return {"ok": False, "error": f"Missing field {missing}"}
+        except ValueError as invalid:
+            return {"ok": False, "error": str(invalid)}
+        except Exception as failure:
+            return {"ok": False, "error": f"Request failed: {type(failure).__name__}"}
+    
+    def _textField(self, request, fieldName):
+        value = request[fieldName]
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"Field '{fieldName}' must be a non-empty string")
+        return value
+    
+    def checkIn(self, request):
+        vehicleType = self._textField(request, "type")
+        registrationNumber = self._textField(request, "plate")
+        if vehicleType.lower() not in VEHICLE_CLASSES:
+            return {"ok": False, "error": f"Unknown vehicle type {vehicleType}"}
+        ticket = self.garage.handleCheckIn(vehicleType, registrationNumber)
+        if ticket is None:
+            return {"ok": False, "error": "Check-in refused"}
+        return {"ok": True, "token": ticket.tokenNumber, "slots": ticket.assignedSlots}
+    
+    def checkOut(self, request):
+        result = self.garage.handleCheckOut(self._textField(request, "plate"))
+        if result is None:
+            return {"ok": False, "error": "No active token"}
+        ticket, fee = result
+        return {"ok": True, "token": ticket.tokenNumber, "fee": fee, "plan": ticket.pricingPlan}
+    
+    def payment(self, request):
+        if not self.garage.paymentProcess(self._textField(request, "plate")):
+            return {"ok": False, "error": "No pending transaction"}
+        return {"ok": True}
+    
+    def track(self, request):
+        slotIDs = self.garage.slotCoordinator.searchVehicle(self._textField(request, "plate"))
+        if slotIDs is None:
+            return {"ok": False, "error": "Vehicle not in facility"}
+        return {"ok": True, "slots": slotIDs}
+    
+    def capacity(self, request):
+        allocator = self.garage.slotCoordinator
+        return {
+            "ok": True,
+            "available": allocator.availableSpaces(),
+            "occupied": allocator.OccupiedSpaces(),
+            "total": allocator.maximumCapacity
+        }
+
+
+async def serveGates(host="127.0.0.1", port=8765):
+    service = GateService(GarageManager(outputSink=NullSink()), host, port)
+    server = await service.start()
+    print(f"Gate service listening on {service.host}:{service.port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(serveGates())
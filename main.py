@@ -149,6 +149,7 @@ def main():
             print("Thank you for choosing Urban City Parking!")
             print("Drive safely!")
             print("*" * 50)
+            garageController.close()
             break
         
         else:
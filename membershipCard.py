@@ -1,17 +1,19 @@
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from datetime import timedelta
+from garageClock import SYSTEM_CLOCK
 
 
 class MembershipCard(ABC):
     
-    def __init__(self, permitID, registrationNumber):
+    def __init__(self, permitID, registrationNumber, activationDate=None, clock=None):
         self.permitID = permitID
         self.registrationNumber = registrationNumber
-        self.activationDate = datetime.now()
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.activationDate = activationDate if activationDate is not None else self.clock.now()
         self.activeStatus = True
     
     @abstractmethod
-    def checkValidity(self):
+    def checkValidity(self, currentTime=None):
         pass
     
     @abstractmethod
@@ -19,7 +21,7 @@ class MembershipCard(ABC):
         pass
     
     @abstractmethod
-    def passDetails(self):
+    def passDetails(self, currentTime=None):
         pass
     
     def subscriptionID(self):
@@ -34,8 +36,8 @@ class MembershipCard(ABC):
 
 class MonthlySubscription(MembershipCard):
     
-    def __init__(self, permitID, registrationNumber, vehicleType):
-        super().__init__(permitID, registrationNumber)
+    def __init__(self, permitID, registrationNumber, vehicleType, activationDate=None, clock=None):
+        super().__init__(permitID, registrationNumber, activationDate, clock)
         self.vehicleType = vehicleType
         self.terminationDate = self.activationDate + timedelta(days=30)
         self.subscriptionCost = self.purchaseAmount()
@@ -49,8 +51,9 @@ class MonthlySubscription(MembershipCard):
         }
         return prices.get(self.vehicleType, 150.00)
     
-    def checkValidity(self):
-        currentTime = datetime.now()
+    def checkValidity(self, currentTime=None):
+        if currentTime is None:
+            currentTime = self.clock.now()
         if self.activeStatus and currentTime <= self.terminationDate:
             return True
         return False
@@ -58,8 +61,8 @@ class MonthlySubscription(MembershipCard):
     def passType(self):
         return "Monthly Pass"
     
-    def passDetails(self):
-        status = "Active" if self.checkValidity() else "Expired"
+    def passDetails(self, currentTime=None):
+        status = "Active" if self.checkValidity(currentTime) else "Expired"
         details = f"""
         Pass ID: {self.permitID}
         License Plate: {self.registrationNumber}
@@ -72,18 +75,19 @@ class MonthlySubscription(MembershipCard):
         """
         return details
     
-    def calculateRemainingDays(self):
-        if not self.checkValidity():
+    def calculateRemainingDays(self, currentTime=None):
+        currentTime = currentTime if currentTime is not None else self.clock.now()
+        if not self.checkValidity(currentTime):
             return 0
-        remaining = self.terminationDate - datetime.now()
+        remaining = self.terminationDate - currentTime
         return remaining.days
 
 
 class DayPass(MembershipCard):
 
     
-    def __init__(self, permitID, registrationNumber, vehicleType):
-        super().__init__(permitID, registrationNumber)
+    def __init__(self, permitID, registrationNumber, vehicleType, activationDate=None, clock=None):
+        super().__init__(permitID, registrationNumber, activationDate, clock)
         self.vehicleType = vehicleType
         self.redemptionStatus = False
         self.terminationDate = self.activationDate + timedelta(hours=24)
@@ -98,14 +102,15 @@ class DayPass(MembershipCard):
         }
         return prices.get(self.vehicleType, 15.00)
     
-    def checkValidity(self):
-        currentTime = datetime.now()
+    def checkValidity(self, currentTime=None):
+        if currentTime is None:
+            currentTime = self.clock.now()
         if self.activeStatus and not self.redemptionStatus and currentTime <= self.terminationDate:
             return True
         return False
     
-    def usePass(self):
-        if self.checkValidity():
+    def usePass(self, currentTime=None):
+        if self.checkValidity(currentTime):
             self.redemptionStatus = True
             return True
         return False
@@ -113,10 +118,10 @@ class DayPass(MembershipCard):
     def passType(self):
         return "Single Entry Pass"
     
-    def passDetails(self):
+    def passDetails(self, currentTime=None):
         if self.redemptionStatus:
             status = "Used"
-        elif self.checkValidity():
+        elif self.checkValidity(currentTime):
             status = "Active"
         else:
             status = "Expired"
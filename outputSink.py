@@ -0,0 +1,32 @@
+import logging
+from abc import ABC, abstractmethod
+
+
+class OutputSink(ABC):
+    
+    @abstractmethod
+    def publish(self, render):
+        pass
+
+
+class ConsoleSink(OutputSink):
+    
+    def publish(self, render):
+        print(render())
+
+
+class LogSink(OutputSink):
+    
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger if logger is not None else logging.getLogger("parking")
+        self.level = level
+    
+    def publish(self, render):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, render())
+
+
+class NullSink(OutputSink):
+    
+    def publish(self, render):
+        pass
@@ -1,244 +1,628 @@
+import csv
+import threading
+from contextlib import ExitStack, nullcontext
 from datetime import datetime
 from vehicle import Car, Bike, Track, Bus
 from slotAllocator import SpaceAllocator
 from membershipCard import MonthlySubscription, DayPass
 from chargeScheme import ChargeController
 from receiptToken import ParkingPass
+from outputSink import ConsoleSink
+from permitRegistry import PermitRegistry
+from garageClock import SystemClock
+from ticketHistory import TicketHistoryStore
+from reservationBook import ReservationBook
+from garageMetrics import MetricsRegistry, instrumentedOperation
+from garageSnapshot import GarageSnapshot, writeGarageSnapshot
+
+
+VEHICLE_CLASSES = {
+    "car": Car,
+    "motorcycle": Bike,
+    "truck": Track,
+    "bus": Bus
+}
+
+PASS_KIND_MONTHLY = ("monthly", "monthly pass", "mp")
+PASS_KIND_SINGLE = ("daypass", "day pass", "day", "single", "single entry pass", "se")
 
 
 class GarageManager:
     
-    def __init__(self):
-        self.slotCoordinator = SpaceAllocator(300)
-        self.rateCoordinator = ChargeController()
+    def __init__(self, compactStorage=False, journal=None, threadSafe=False, outputSink=None,
+                 billingMode="checkout", maximumSlots=300, garageName="Urban City Parking", zones=None,
+                 placementPolicy="firstFit", clock=None, historyDirectory=None, reservations=False,
+                 eventBus=None, metrics=None):
+        self.outputSink = outputSink if outputSink is not None else ConsoleSink()
+        self.clock = clock if clock is not None else SystemClock()
+        self.slotCoordinator = SpaceAllocator(maximumSlots, compactStorage, threadSafe, zones, placementPolicy,
+                                              self.clock)
+        self.rateCoordinator = ChargeController(billingMode, self.clock)
         self.currentReceipts = {}
-        self.passRecords = []
-        self.monthlyPermits = {}
-        self.singlePermits = {}
+        self.ticketHistory = TicketHistoryStore(spillDirectory=historyDirectory, threadSafe=threadSafe)
+        self.monthlyPermits = PermitRegistry(threadSafe, self.clock)
+        self.singlePermits = PermitRegistry(threadSafe, self.clock)
+        self.reservationBook = (ReservationBook(self.slotCoordinator, self.clock, threadSafe=threadSafe)
+                                if reservations else None)
+        self.dailyStatistics = {}
         
         self.monthlyIDCounter = 6000  
         self.singleIDCounter = 9000  
         
-        self.garageName = "Urban City Parking"
-        self.maximumSlots = 300
-        
-        print(f"\n{self.garageName} System Initialized")
-        print(f"Total Parking Capacity: {self.maximumSlots} spaces\n")
+        self.garageName = garageName
+        self.maximumSlots = maximumSlots
+        
+        self.threadSafe = threadSafe
+        self.noLock = nullcontext()
+        self.plateLocks = [threading.Lock() for _ in range(64)] if threadSafe else []
+        self.permitLock = threading.Lock() if threadSafe else self.noLock
+        self.statisticsLock = threading.Lock() if threadSafe else self.noLock
+        
+        self.eventBus = eventBus
+        self.binarySnapshot = None
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self.journal = journal
+        self.snapshotDue = False
+        if self.journal is not None:
+            self._recoverFromJournal()
+        
+        self.outputSink.publish(lambda: f"\n{self.garageName} System Initialized\n"
+                                        f"Total Parking Capacity: {self.maximumSlots} spaces\n")
     
     def createVehicle(self, vehicleType, registrationNumber):
         vehicleType = vehicleType.lower()
         
-        vehicleMap = {
-            "car": Car,
-            "motorcycle": Bike,
-            "truck": Track,
-            "bus": Bus
-        }
-        
-        if vehicleType in vehicleMap:
-            return vehicleMap[vehicleType](registrationNumber)
+        if vehicleType in VEHICLE_CLASSES:
+            return VEHICLE_CLASSES[vehicleType](registrationNumber)
         else:
-            print(f"Unrecognized vehicle category: {vehicleType}")
+            self.outputSink.publish(lambda: f"Unrecognized vehicle category: {vehicleType}")
             return None
     
-    def verifyMonthlySubscription(self, registrationNumber):
-        if registrationNumber in self.monthlyPermits:
-            return self.monthlyPermits[registrationNumber].checkValidity()
-        return False
+    def verifyMonthlySubscription(self, registrationNumber, currentTime=None):
+        return self.monthlyPermits.isValid(registrationNumber, currentTime)
     
-    def checkDayPass(self, registrationNumber):
-        if registrationNumber in self.singlePermits:
-            return self.singlePermits[registrationNumber].checkValidity()
-        return False
+    def checkDayPass(self, registrationNumber, currentTime=None):
+        return self.singlePermits.isValid(registrationNumber, currentTime)
     
-    def verifySubscription(self, registrationNumber):
-        return self.verifyMonthlySubscription(registrationNumber) or self.checkDayPass(registrationNumber)
+    def verifySubscription(self, registrationNumber, currentTime=None):
+        currentTime = currentTime if currentTime is not None else self.clock.now()
+        return (self.verifyMonthlySubscription(registrationNumber, currentTime)
+                or self.checkDayPass(registrationNumber, currentTime))
     
+    @instrumentedOperation("checkin")
     def handleCheckIn(self, vehicleType, registrationNumber):
-        if registrationNumber in self.currentReceipts:
-            print(f"\nAlert: Vehicle {registrationNumber} already has active token!")
-            return None
-        
-        vehicle = self.createVehicle(vehicleType, registrationNumber)
-        if vehicle is None:
-            return None
-        
-        hasValidPass = self.verifySubscription(registrationNumber)
-        
-        slotsNeeded = vehicle.SpaceRequired()
-        if not self._checkSlotAvailability(slotsNeeded):
-            return None
-        
-        reservedSlots = self.slotCoordinator.allocateSpace(vehicle)
-        if reservedSlots is None:
-            print("\nError: Slot allocation failed.")
-            return None
-        
-        ticket = ParkingPass(vehicle, reservedSlots)
-        self.currentReceipts[registrationNumber] = ticket
-        
+        stageLaps = self.metrics.stageLaps("checkin")
+        with self._plateLock(registrationNumber):
+            if registrationNumber in self.currentReceipts:
+                self.outputSink.publish(lambda: f"\nAlert: Vehicle {registrationNumber} already has active token!")
+                return None
+            
+            vehicle = self.createVehicle(vehicleType, registrationNumber)
+            if vehicle is None:
+                return None
+            
+            currentTime = self.clock.now()
+            if stageLaps:
+                stageLaps.lap("createVehicle")
+            hasValidPass = self.verifySubscription(registrationNumber, currentTime)
+            if stageLaps:
+                stageLaps.lap("verifySubscription")
+            
+            reservation = None
+            if self.reservationBook is not None:
+                reservation = self.reservationBook.claimReservation(registrationNumber, vehicle.VehicleType(),
+                                                                    currentTime)
+                if stageLaps:
+                    stageLaps.lap("claimReservation")
+            
+            if reservation is not None:
+                reservedSlots = self.slotCoordinator.occupyHeldSlots(vehicle, reservation.slotIDs, currentTime)
+            else:
+                slotsNeeded = vehicle.SpaceRequired()
+                if not self._checkSlotAvailability(slotsNeeded):
+                    return None
+                if stageLaps:
+                    stageLaps.lap("checkSlotAvailability")
+                
+                reservedSpans = None
+                if self.reservationBook is not None:
+                    reservedSpans = self.reservationBook.walkInReservedSpans(vehicle.VehicleType(), currentTime)
+                reservedSlots = self.slotCoordinator.allocateSpace(vehicle, currentTime, reservedSpans)
+                if reservedSlots is None:
+                    self.outputSink.publish(lambda: "\nError: Slot allocation failed.")
+                    return None
+            if stageLaps:
+                stageLaps.lap("allocateSpace")
+            
+            try:
+                ticket = ParkingPass(vehicle, reservedSlots, checkInTime=currentTime, clock=self.clock)
+                self._registerTicket(ticket)
+                if stageLaps:
+                    stageLaps.lap("issueTicket")
+                checkInEvent = {
+                    "plate": registrationNumber,
+                    "type": vehicleType,
+                    "token": ticket.tokenNumber,
+                    "slots": reservedSlots,
+                    "time": ticket.checkInTime.isoformat()
+                }
+                if reservation is not None:
+                    checkInEvent["reservation"] = reservation.reservationID
+                self._journalEvent("checkin", checkInEvent)
+            except Exception:
+                if registrationNumber in self.currentReceipts:
+                    self._unregisterTicket(self.currentReceipts[registrationNumber])
+                if reservation is not None:
+                    self.slotCoordinator.restoreHeldSlots(reservedSlots)
+                    self.reservationBook.releaseClaim(reservation)
+                else:
+                    self.slotCoordinator.freeAllocatedSlots(reservedSlots)
+                raise
+        
+        self._snapshotIfDue()
+        if stageLaps:
+            stageLaps.lap("journal")
+        self._publishEvent("checkin", registrationNumber, ticket.checkInTime, lambda: {
+            "token": ticket.tokenNumber,
+            "type": vehicle.VehicleType(),
+            "slots": list(reservedSlots),
+            "subscriber": hasValidPass,
+            "reservation": reservation.reservationID if reservation is not None else None
+        })
+        if stageLaps:
+            stageLaps.lap("publishEvent")
         self._displayCheckInConfirmation(ticket, registrationNumber, vehicle, reservedSlots, hasValidPass)
+        if stageLaps:
+            stageLaps.lap("receipt")
         
         return ticket
     
     def _checkSlotAvailability(self, slotsNeeded):
         availableSlots = self.slotCoordinator.availableSpaces()
         if availableSlots < slotsNeeded:
-            print(f"\nInsufficient capacity!")
-            print(f"Needed: {slotsNeeded} | Available: {availableSlots}")
+            self.outputSink.publish(lambda: f"\nInsufficient capacity!\n"
+                                            f"Needed: {slotsNeeded} | Available: {availableSlots}")
             return False
         return True
     
     def _displayCheckInConfirmation(self, ticket, registrationNumber, vehicle, reservedSlots, hasValidPass):
-        print("\n" + "*" * 40)
-        print("        CHECK-IN COMPLETED")
-        print("*" * 40)
-        print(f"Registration: {registrationNumber}")
-        print(f"Category: {vehicle.VehicleType()}")
-        print(f"Assigned Slot(s): {', '.join(map(str, reservedSlots))}")
-        print(f"Arrival Time: {ticket.checkInTime.strftime('%Y-%m-%d %H:%M:%S')}")
+        self.outputSink.publish(lambda: self._formatCheckInConfirmation(
+            ticket, registrationNumber, vehicle, reservedSlots, hasValidPass
+        ))
+    
+    def _formatCheckInConfirmation(self, ticket, registrationNumber, vehicle, reservedSlots, hasValidPass):
+        lines = [
+            "\n" + "*" * 40,
+            "        CHECK-IN COMPLETED",
+            "*" * 40,
+            f"Registration: {registrationNumber}",
+            f"Category: {vehicle.VehicleType()}",
+            f"Assigned Slot(s): {', '.join(map(str, reservedSlots))}",
+            f"Arrival Time: {ticket.checkInTime.strftime('%Y-%m-%d %H:%M:%S')}"
+        ]
         
         if hasValidPass:
-            print(f"Subscription: ACTIVE MEMBERSHIP VERIFIED")
+            lines.append("Subscription: ACTIVE MEMBERSHIP VERIFIED")
         
-        print("*" * 40)
-        print(ticket.createCheckInReceipt())
+        lines.append("*" * 40)
+        lines.append(ticket.createCheckInReceipt())
+        return "\n".join(lines)
     
+    @instrumentedOperation("checkout")
     def handleCheckOut(self, registrationNumber):
-        if registrationNumber not in self.currentReceipts:
-            print(f"\nAlert: No active token found for {registrationNumber}!")
-            return None
-        
-        ticket = self.currentReceipts[registrationNumber]
-        ticket.logExitTime()
-        
-        fee, strategyName = self._calculateDepartureFee(ticket, registrationNumber)
-        ticket.assignParkingFee(fee, strategyName)
-        
+        stageLaps = self.metrics.stageLaps("checkout")
+        with self._plateLock(registrationNumber):
+            if registrationNumber not in self.currentReceipts:
+                self.outputSink.publish(lambda: f"\nAlert: No active token found for {registrationNumber}!")
+                return None
+            
+            ticket = self.currentReceipts[registrationNumber]
+            ticket.logExitTime(self.clock.now())
+            
+            fee, strategyName = self._calculateDepartureFee(ticket, registrationNumber)
+            ticket.assignParkingFee(fee, strategyName)
+            if stageLaps:
+                stageLaps.lap("pricing")
+            self._journalEvent("checkout", {
+                "plate": registrationNumber,
+                "time": ticket.checkOutTime.isoformat(),
+                "fee": fee,
+                "plan": strategyName
+            })
+        
+        self._snapshotIfDue()
+        if stageLaps:
+            stageLaps.lap("journal")
+        self._publishEvent("checkout", registrationNumber, ticket.checkOutTime, lambda: {
+            "token": ticket.tokenNumber,
+            "type": ticket.vehicleType,
+            "hours": ticket.calculateParkingTime(),
+            "fee": fee,
+            "plan": strategyName
+        })
+        if stageLaps:
+            stageLaps.lap("publishEvent")
         self._displayDepartureSummary(ticket, registrationNumber, strategyName, fee)
+        if stageLaps:
+            stageLaps.lap("receipt")
         
         return ticket, fee
     
     def _calculateDepartureFee(self, ticket, registrationNumber):
-        if self.verifyMonthlySubscription(registrationNumber):
-            print("\nMonthly Subscription Applied - Complimentary parking!")
+        currentTime = ticket.checkOutTime
+        if self.verifyMonthlySubscription(registrationNumber, currentTime):
+            self.outputSink.publish(lambda: "\nMonthly Subscription Applied - Complimentary parking!")
             return 0.0, "Monthly Subscription - No Charge"
-        elif self.checkDayPass(registrationNumber):
-            print("\nDay Pass Redeemed - Prepaid entry!")
-            self.singlePermits[registrationNumber].usePass()
+        elif self.checkDayPass(registrationNumber, currentTime):
+            self.outputSink.publish(lambda: "\nDay Pass Redeemed - Prepaid entry!")
+            dayPass = self.singlePermits[registrationNumber]
+            dayPass.usePass(currentTime)
+            self.singlePermits.markInactive(dayPass)
+            self._journalEvent("redeem", {"plate": registrationNumber})
             return 0.0, "Single Entry Pass - Prepaid"
         else:
             duration = ticket.calculateParkingTime()
             fee, strategyName = self.rateCoordinator.determineParkingCost(
-                ticket.vehicleType, duration
+                ticket.vehicleType, duration, ticket.checkOutTime, ticket.checkInTime
             )
             return fee, strategyName
     
     def _displayDepartureSummary(self, ticket, registrationNumber, strategyName, fee):
-        print("\n" + "*" * 40)
-        print("      DEPARTURE IN PROGRESS")
-        print("*" * 40)
-        print(f"Token ID: {ticket.tokenNumber}")
-        print(f"Registration: {registrationNumber}")
-        print(f"Parked For: {ticket.displayTimeSpent()}")
-        print(f"Rate Plan: {strategyName}")
-        print(f"Amount Due: ${fee:.2f}")
-        print("*" * 40)
+        self.outputSink.publish(lambda: "\n".join([
+            "\n" + "*" * 40,
+            "      DEPARTURE IN PROGRESS",
+            "*" * 40,
+            f"Token ID: {ticket.tokenNumber}",
+            f"Registration: {registrationNumber}",
+            f"Parked For: {ticket.displayTimeSpent()}",
+            f"Rate Plan: {strategyName}",
+            f"Amount Due: ${fee:.2f}",
+            "*" * 40
+        ]))
     
+    @instrumentedOperation("payment")
     def paymentProcess(self, registrationNumber):
-        if registrationNumber not in self.currentReceipts:
-            print(f"\nAlert: No pending transaction for {registrationNumber}")
-            return False
-        
-        ticket = self.currentReceipts[registrationNumber]
-        ticket.confirmPayment()
-        
-        self.slotCoordinator.freeAllocatedSlots(ticket.assignedSlots)
-        self.passRecords.append(ticket)
-        del self.currentReceipts[registrationNumber]
-        
-        print("\n" + "*" * 40)
-        print("       PAYMENT CONFIRMED")
-        print("*" * 40)
-        print(ticket.createCheckOutReceipt())
+        stageLaps = self.metrics.stageLaps("payment")
+        with self._plateLock(registrationNumber):
+            if registrationNumber not in self.currentReceipts:
+                self.outputSink.publish(lambda: f"\nAlert: No pending transaction for {registrationNumber}")
+                return False
+            
+            ticket = self.currentReceipts[registrationNumber]
+            self._settleTicket(ticket)
+            if stageLaps:
+                stageLaps.lap("settle")
+            self._journalEvent("payment", {"plate": registrationNumber})
+        
+        self._snapshotIfDue()
+        if stageLaps:
+            stageLaps.lap("journal")
+        self._publishEvent("payment", registrationNumber, None, lambda: {
+            "token": ticket.tokenNumber,
+            "fee": ticket.parkingCharge,
+            "plan": ticket.pricingPlan
+        })
+        if stageLaps:
+            stageLaps.lap("publishEvent")
+        
+        self.outputSink.publish(lambda: self._formatBanner("       PAYMENT CONFIRMED", ticket.createCheckOutReceipt()))
+        if stageLaps:
+            stageLaps.lap("receipt")
         
         return True
     
+    @instrumentedOperation("monthly")
     def buyMonthlySubscription(self, registrationNumber, vehicleType):
-        self.monthlyIDCounter += 1
-        permitID = f"MP-{self.monthlyIDCounter}"
+        with self.permitLock:
+            self.monthlyIDCounter += 1
+            permitID = f"MP-{self.monthlyIDCounter}"
+            
+            newPass = MonthlySubscription(permitID, registrationNumber, vehicleType, self.clock.now(), self.clock)
+            self._registerPermit(self.monthlyPermits, newPass, 'monthlySold')
+            self._journalEvent("monthly", self._permitPayload(newPass))
         
-        newPass = MonthlySubscription(permitID, registrationNumber, vehicleType)
-        self.monthlyPermits[registrationNumber] = newPass
+        self._snapshotIfDue()
+        self._publishEvent("monthly", registrationNumber, newPass.activationDate, lambda: self._permitEvent(newPass))
         
-        print("\n" + "*" * 40)
-        print("  MONTHLY SUBSCRIPTION ACTIVATED")
-        print("*" * 40)
-        print(newPass.passDetails())
+        self.outputSink.publish(lambda: self._formatBanner("  MONTHLY SUBSCRIPTION ACTIVATED", newPass.passDetails()))
         
         return newPass
     
+    @instrumentedOperation("daypass")
     def buyOneTimeTicket(self, registrationNumber, vehicleType):
-        self.singleIDCounter += 1
-        permitID = f"SE-{self.singleIDCounter}"
+        with self.permitLock:
+            self.singleIDCounter += 1
+            permitID = f"SE-{self.singleIDCounter}"
+            
+            newPass = DayPass(permitID, registrationNumber, vehicleType, self.clock.now(), self.clock)
+            self._registerPermit(self.singlePermits, newPass, 'dailySold')
+            self._journalEvent("daypass", self._permitPayload(newPass))
         
-        newPass = DayPass(permitID, registrationNumber, vehicleType)
-        self.singlePermits[registrationNumber] = newPass
+        self._snapshotIfDue()
+        self._publishEvent("daypass", registrationNumber, newPass.activationDate, lambda: self._permitEvent(newPass))
         
-        print("\n" + "*" * 40)
-        print("    DAY PASS ACTIVATED")
-        print("*" * 40)
-        print(newPass.passDetails())
+        self.outputSink.publish(lambda: self._formatBanner("    DAY PASS ACTIVATED", newPass.passDetails()))
         
         return newPass
     
+    @instrumentedOperation("reserve")
+    def reserveSpace(self, registrationNumber, vehicleType, startTime, endTime):
+        if self.reservationBook is None:
+            self.outputSink.publish(lambda: "\nAlert: Reservations are not enabled for this garage!")
+            return None
+        vehicleClass = VEHICLE_CLASSES.get(vehicleType.lower())
+        if vehicleClass is None:
+            self.outputSink.publish(lambda: f"Unrecognized vehicle category: {vehicleType}")
+            return None
+        with self._plateLock(registrationNumber):
+            reservation = self.reservationBook.reserve(registrationNumber, vehicleClass.vehicleType,
+                                                       vehicleClass.slotsRequired, startTime, endTime,
+                                                       self.clock.now())
+            if reservation is None:
+                self.outputSink.publish(lambda: f"\nAlert: No space can be reserved for {registrationNumber} "
+                                                f"from {startTime.strftime('%Y-%m-%d %H:%M')} "
+                                                f"to {endTime.strftime('%Y-%m-%d %H:%M')}!")
+                return None
+            self._journalEvent("reserve", {
+                "plate": registrationNumber,
+                "type": reservation.vehicleType,
+                "reservation": reservation.reservationID,
+                "slots": reservation.slotIDs,
+                "start": startTime.isoformat(),
+                "end": endTime.isoformat()
+            })
+        
+        self._snapshotIfDue()
+        self._publishEvent("reserve", registrationNumber, None, lambda: {
+            "reservation": reservation.reservationID,
+            "type": reservation.vehicleType,
+            "slots": list(reservation.slotIDs),
+            "start": reservation.startTime,
+            "end": reservation.endTime
+        })
+        
+        self.outputSink.publish(lambda: self._formatBanner("      RESERVATION CONFIRMED",
+                                                           reservation.reservationDetails()))
+        
+        return reservation
+    
+    @instrumentedOperation("cancel")
+    def cancelReservation(self, registrationNumber):
+        if self.reservationBook is None:
+            return None
+        with self._plateLock(registrationNumber):
+            reservation = self.reservationBook.cancelReservation(registrationNumber)
+            if reservation is None:
+                self.outputSink.publish(lambda: f"\nAlert: No open reservation for {registrationNumber}")
+                return None
+            self._journalEvent("cancel", {"plate": registrationNumber})
+        
+        self._snapshotIfDue()
+        self._publishEvent("cancel", registrationNumber, None, lambda: {"reservation": reservation.reservationID})
+        
+        self.outputSink.publish(lambda: f"\nReservation {reservation.reservationID} cancelled.")
+        
+        return reservation
+    
+    def _formatBanner(self, title, body):
+        return "\n".join(["\n" + "*" * 40, title, "*" * 40, body])
+    
+    def _plateLock(self, registrationNumber):
+        if not self.threadSafe:
+            return self.noLock
+        return self.plateLocks[hash(registrationNumber) % len(self.plateLocks)]
+    
+    def _registerTicket(self, ticket):
+        ticket.vehicle.registrationNumber = self.ticketHistory.internPlate(ticket.registrationNumber)
+        self.currentReceipts[ticket.registrationNumber] = ticket
+        with self.statisticsLock:
+            self._dailyTotals(ticket.checkInTime.date())['entries'] += 1
+    
+    def _unregisterTicket(self, ticket):
+        del self.currentReceipts[ticket.registrationNumber]
+        with self.statisticsLock:
+            self._dailyTotals(ticket.checkInTime.date())['entries'] -= 1
+    
+    def _settleTicket(self, ticket):
+        ticket.confirmPayment()
+        
+        self.slotCoordinator.freeAllocatedSlots(ticket.assignedSlots)
+        if self.reservationBook is not None:
+            self.reservationBook.completeReservation(ticket.registrationNumber)
+            self.reservationBook.retryPendingHolds(ticket.assignedSlots)
+        self.ticketHistory.appendTicket(ticket)
+        del self.currentReceipts[ticket.registrationNumber]
+        
+        if ticket.checkOutTime:
+            with self.statisticsLock:
+                dayTotals = self._dailyTotals(ticket.checkOutTime.date())
+                dayTotals['exits'] += 1
+                dayTotals['revenue'] += ticket.parkingCharge
+    
+    def _registerPermit(self, permits, newPass, soldCounter):
+        permits.addPermit(newPass, newPass.activationDate)
+        with self.statisticsLock:
+            self._dailyTotals(newPass.activationDate.date())[soldCounter] += 1
+    
+    @instrumentedOperation("import")
+    def importPermits(self, rows):
+        monthlyRows = []
+        singleRows = []
+        for rowNumber, row in enumerate(rows, 1):
+            if len(row) < 3:
+                raise ValueError(f"Permit row {rowNumber}: expected plate, vehicle type and pass kind, got {list(row)}")
+            registrationNumber, vehicleType, passKind = row[:3]
+            vehicleClass = VEHICLE_CLASSES.get(vehicleType.strip().lower())
+            if vehicleClass is None:
+                raise ValueError(f"Permit row {rowNumber}: Unrecognized vehicle category: {vehicleType}")
+            passKind = passKind.strip().lower()
+            if passKind in PASS_KIND_MONTHLY:
+                monthlyRows.append((registrationNumber, vehicleClass.vehicleType))
+            elif passKind in PASS_KIND_SINGLE:
+                singleRows.append((registrationNumber, vehicleClass.vehicleType))
+            else:
+                raise ValueError(f"Permit row {rowNumber}: Unrecognized pass kind: {passKind}")
+        
+        activationDate = self.clock.now()
+        with self.permitLock:
+            firstMonthlyID = self.monthlyIDCounter + 1
+            firstSingleID = self.singleIDCounter + 1
+            self.monthlyIDCounter += len(monthlyRows)
+            self.singleIDCounter += len(singleRows)
+            
+            permitRecords = [
+                [f"MP-{firstMonthlyID + offset}", registrationNumber, vehicleType, "monthly"]
+                for offset, (registrationNumber, vehicleType) in enumerate(monthlyRows)
+            ]
+            permitRecords.extend(
+                [f"SE-{firstSingleID + offset}", registrationNumber, vehicleType, "daypass"]
+                for offset, (registrationNumber, vehicleType) in enumerate(singleRows)
+            )
+            self._storeImportedPermits(permitRecords, activationDate)
+            self._journalEvent("import", {
+                "permits": permitRecords,
+                "time": activationDate.isoformat(),
+                "monthlyCounter": self.monthlyIDCounter,
+                "singleCounter": self.singleIDCounter
+            })
+        
+        self._snapshotIfDue()
+        self._publishEvent("import", None, activationDate, lambda: {
+            "monthly": len(monthlyRows),
+            "daypass": len(singleRows)
+        })
+        self.outputSink.publish(lambda: f"\nImported {len(monthlyRows)} monthly and {len(singleRows)} day passes")
+        
+        return len(permitRecords)
+    
+    def _storeImportedPermits(self, permitRecords, activationDate):
+        monthlyPasses = []
+        singlePasses = []
+        for permitID, registrationNumber, vehicleType, passKind in permitRecords:
+            if passKind == "monthly":
+                monthlyPasses.append(MonthlySubscription(permitID, registrationNumber, vehicleType, activationDate,
+                                                         self.clock))
+            else:
+                singlePasses.append(DayPass(permitID, registrationNumber, vehicleType, activationDate, self.clock))
+        
+        self.monthlyPermits.addPermits(monthlyPasses, activationDate)
+        self.singlePermits.addPermits(singlePasses, activationDate)
+        with self.statisticsLock:
+            dayTotals = self._dailyTotals(activationDate.date())
+            dayTotals['monthlySold'] += len(monthlyPasses)
+            dayTotals['dailySold'] += len(singlePasses)
+    
+    def importPermitsFromCSV(self, csvPath):
+        with open(csvPath, newline="") as csvFile:
+            rows = [row for row in csv.reader(csvFile) if row]
+        columns = (0, 1, 2)
+        if rows and "plate" in [heading.strip().lower() for heading in rows[0]]:
+            header = [heading.strip().lower() for heading in rows.pop(0)]
+            columns = (
+                header.index("plate"),
+                self._headerColumn(header, ("vehicletype", "type")),
+                self._headerColumn(header, ("passtype", "passkind", "kind"))
+            )
+        return self.importPermits([row[column] for column in columns if column < len(row)] for row in rows)
+    
+    def _headerColumn(self, header, columnNames):
+        column = next((header.index(name) for name in columnNames if name in header), None)
+        if column is None:
+            raise ValueError(f"CSV header has no {columnNames[0]} column (accepted names: {', '.join(columnNames)})")
+        return column
+    
+    def exportPermits(self, csvFile):
+        writer = csv.writer(csvFile)
+        writer.writerow(["permitID", "plate", "vehicleType", "passType", "issued", "expires", "status"])
+        currentTime = self.clock.now()
+        exportedCount = 0
+        for permits in (self.monthlyPermits, self.singlePermits):
+            for permit in list(permits.values()):
+                writer.writerow([
+                    permit.permitID,
+                    permit.registrationNumber,
+                    permit.vehicleType,
+                    permit.passType(),
+                    permit.activationDate.isoformat(),
+                    permit.terminationDate.isoformat(),
+                    "Active" if permit.checkValidity(currentTime) else "Inactive"
+                ])
+                exportedCount += 1
+        return exportedCount
+    
+    def exportPermitsToCSV(self, csvPath):
+        with open(csvPath, "w", newline="") as csvFile:
+            return self.exportPermits(csvFile)
+    
     def showSubscriptionData(self, registrationNumber):
         found = False
         
         if registrationNumber in self.monthlyPermits:
-            print(self.monthlyPermits[registrationNumber].passDetails())
+            permit = self.monthlyPermits[registrationNumber]
+            self.outputSink.publish(permit.passDetails)
             found = True
         
         if registrationNumber in self.singlePermits:
-            print(self.singlePermits[registrationNumber].passDetails())
+            permit = self.singlePermits[registrationNumber]
+            self.outputSink.publish(permit.passDetails)
             found = True
         
         if not found:
-            print(f"\nNo subscription found for: {registrationNumber}")
+            self.outputSink.publish(lambda: f"\nNo subscription found for: {registrationNumber}")
     
     def trackVehicle(self, registrationNumber):
         slotIDs = self.slotCoordinator.searchVehicle(registrationNumber)
         
         if slotIDs:
             ticket = self.currentReceipts.get(registrationNumber)
-            print("\n" + "*" * 40)
-            print("      VEHICLE LOCATED")
-            print("*" * 40)
-            print(f"Registration: {registrationNumber}")
-            print(f"Located At: {', '.join(map(str, slotIDs))}")
-            if ticket:
-                print(f"Checked In: {ticket.checkInTime.strftime('%Y-%m-%d %H:%M')}")
-                print(f"Parked For: {ticket.displayTimeSpent()}")
-            print("*" * 40)
+            self.outputSink.publish(lambda: self._formatVehicleLocation(registrationNumber, slotIDs, ticket))
             return True
         else:
-            print(f"\nVehicle {registrationNumber} not currently in facility.")
+            possibleMatches = self.findVehiclesByPartialPlate(registrationNumber)
+            self.outputSink.publish(lambda: self._formatVehicleNotFound(registrationNumber, possibleMatches))
             return False
     
+    def _formatVehicleLocation(self, registrationNumber, slotIDs, ticket):
+        lines = [
+            "\n" + "*" * 40,
+            "      VEHICLE LOCATED",
+            "*" * 40,
+            f"Registration: {registrationNumber}",
+            f"Located At: {', '.join(map(str, slotIDs))}"
+        ]
+        if ticket:
+            lines.append(f"Checked In: {ticket.checkInTime.strftime('%Y-%m-%d %H:%M')}")
+            lines.append(f"Parked For: {ticket.displayTimeSpent()}")
+        lines.append("*" * 40)
+        return "\n".join(lines)
+    
+    def _formatVehicleNotFound(self, registrationNumber, possibleMatches):
+        lines = [f"\nVehicle {registrationNumber} not currently in facility."]
+        if possibleMatches:
+            lines.append("Possible matches:")
+            for plate, slots in possibleMatches.items():
+                lines.append(f"  {plate} at {', '.join(map(str, slots))}")
+        return "\n".join(lines)
+    
+    def findVehiclesByPartialPlate(self, plateFragment):
+        if plateFragment == "":
+            return {}
+        return self.slotCoordinator.searchPartialPlate(plateFragment)
+    
     def checkCapacity(self):
-        print(self.slotCoordinator.generateStatusSummary())
+        self.outputSink.publish(self.slotCoordinator.generateStatusSummary)
         return self.slotCoordinator.availableSpaces()
     
     def displayChargeInfo(self):
-        print(self.rateCoordinator.displayChargeDetails())
+        self.outputSink.publish(self.rateCoordinator.displayChargeDetails)
     
     def showCurrentCharges(self):
-        strategy = self.rateCoordinator.determineActiveRate()
-        print(f"\nActive Rate Plan: {strategy.planTitle()}")
+        strategy = self.rateCoordinator.determineActiveRate(self.clock.now())
+        self.outputSink.publish(lambda: f"\nActive Rate Plan: {strategy.planTitle()}")
         return strategy.planTitle()
     
-    def generateDailySummary(self):
-        today = datetime.now().date()
+    def generateDailySummary(self, reportDate=None):
+        today = reportDate if reportDate is not None else self.clock.now().date()
         
         stats = self._calculateDailyStatistics(today)
         
@@ -261,35 +645,280 @@ class GarageManager:
         SUBSCRIPTIONS:
         Active Monthly: {stats['monthly']}
         Active Day Pass: {stats['daily']}
+        Monthly Sold: {stats['monthlySold']}
+        Day Passes Sold: {stats['dailySold']}
         **********************************
         """
-        print(report)
+        self.outputSink.publish(lambda: report)
         return report
     
+    def _emptyDailyTotals(self):
+        return {
+            'entries': 0,
+            'exits': 0,
+            'revenue': 0.0,
+            'monthlySold': 0,
+            'dailySold': 0
+        }
+    
+    def _dailyTotals(self, day):
+        dayTotals = self.dailyStatistics.get(day)
+        if dayTotals is None:
+            dayTotals = self._emptyDailyTotals()
+            self.dailyStatistics[day] = dayTotals
+        return dayTotals
+    
     def _calculateDailyStatistics(self, today):
-        todayEntries = 0
-        todayExits = 0
-        todayRevenue = 0.0
-        
-        for ticket in self.passRecords:
-            if ticket.checkInTime.date() == today:
-                todayEntries += 1
-            if ticket.checkOutTime and ticket.checkOutTime.date() == today:
-                todayExits += 1
-                todayRevenue += ticket.parkingCharge
-        
-        for registrationNumber in self.currentReceipts:
-            ticket = self.currentReceipts[registrationNumber]
-            if ticket.checkInTime.date() == today:
-                todayEntries += 1
+        currentTime = self.clock.now()
+        dayTotals = self.dailyStatistics.get(today) or self._emptyDailyTotals()
         
         return {
-            'entries': todayEntries,
-            'exits': todayExits,
+            'entries': dayTotals['entries'],
+            'exits': dayTotals['exits'],
             'active': len(self.currentReceipts),
             'available': self.slotCoordinator.availableSpaces(),
             'occupied': self.slotCoordinator.OccupiedSpaces(),
-            'revenue': todayRevenue,
-            'monthly': len([p for p in self.monthlyPermits.values() if p.checkValidity()]),
-            'daily': len([p for p in self.singlePermits.values() if p.checkValidity()])
+            'revenue': dayTotals['revenue'],
+            'monthlySold': dayTotals['monthlySold'],
+            'dailySold': dayTotals['dailySold'],
+            'monthly': self.monthlyPermits.activeCount(currentTime),
+            'daily': self.singlePermits.activeCount(currentTime)
+        }
+
+    def _journalEvent(self, eventType, payload):
+        if self.journal is None:
+            return
+        if self.journal.appendEvent(eventType, payload):
+            self.snapshotDue = True
+    
+    def _publishEvent(self, eventType, registrationNumber, occurredAt, describe):
+        if self.eventBus is not None:
+            self.eventBus.publish(eventType, registrationNumber, describe(),
+                                  occurredAt if occurredAt is not None else self.clock.now())
+    
+    def _permitEvent(self, permit):
+        return {
+            "permit": permit.permitID,
+            "type": permit.vehicleType,
+            "expires": permit.terminationDate,
+            "cost": permit.subscriptionCost
         }
+    
+    def _snapshotIfDue(self):
+        if self.snapshotDue:
+            self.saveSnapshot()
+    
+    def _permitPayload(self, permit):
+        return {
+            "permit": permit.permitID,
+            "plate": permit.registrationNumber,
+            "type": permit.vehicleType,
+            "time": permit.activationDate.isoformat(),
+            "counter": self.monthlyIDCounter if isinstance(permit, MonthlySubscription) else self.singleIDCounter
+        }
+    
+    def saveSnapshot(self):
+        if self.journal is None:
+            return False
+        with ExitStack() as heldLocks:
+            for lock in self.plateLocks:
+                heldLocks.enter_context(lock)
+            heldLocks.enter_context(self.permitLock)
+            self.snapshotDue = False
+            self.journal.writeSnapshot(self._snapshotState())
+        return True
+    
+    def saveBinarySnapshot(self, path):
+        with ExitStack() as heldLocks:
+            for lock in self.plateLocks:
+                heldLocks.enter_context(lock)
+            heldLocks.enter_context(self.permitLock)
+            counters = {
+                "tokenCounter": ParkingPass.tokenCounter,
+                "monthlyIDCounter": self.monthlyIDCounter,
+                "singleIDCounter": self.singleIDCounter
+            }
+            return writeGarageSnapshot(path, self.maximumSlots, counters, list(self.currentReceipts.values()),
+                                       self.monthlyPermits.values(), self.singlePermits.values(), self.clock.now())
+    
+    def loadBinarySnapshot(self, path):
+        if self.currentReceipts or self.slotCoordinator.OccupiedSpaces():
+            raise ValueError("A binary snapshot can only be loaded into an empty garage")
+        snapshot = GarageSnapshot(path)
+        if snapshot.maximumCapacity != self.maximumSlots:
+            snapshot.close()
+            raise ValueError(f"Snapshot is for {snapshot.maximumCapacity} spaces, garage has {self.maximumSlots}")
+        
+        with self.permitLock:
+            ParkingPass.tokenCounter = max(ParkingPass.tokenCounter, snapshot.tokenCounter)
+            self.monthlyIDCounter = max(self.monthlyIDCounter, snapshot.monthlyIDCounter)
+            self.singleIDCounter = max(self.singleIDCounter, snapshot.singleIDCounter)
+        
+        tickets = [self._buildTicket(*record) for record in snapshot.tickets()]
+        self.slotCoordinator.occupyTickets((ticket.vehicle, ticket.assignedSlots, ticket.checkInTime)
+                                           for ticket in tickets)
+        for ticket in tickets:
+            self.currentReceipts[ticket.registrationNumber] = ticket
+        
+        for permits, permitKind in ((self.monthlyPermits, "monthly"), (self.singlePermits, "single")):
+            permits.attachSource(
+                lambda registrationNumber, permitKind=permitKind: self._permitFromSnapshot(
+                    snapshot.findPermit(permitKind, registrationNumber), permitKind),
+                lambda permitKind=permitKind: (self._permitFromSnapshot(record, permitKind)
+                                               for record in snapshot.permits(permitKind))
+            )
+        self.binarySnapshot = snapshot
+        
+        self.outputSink.publish(lambda: f"\nRestored {snapshot.ticketCount} open tickets from {path} "
+                                        f"({snapshot.monthlyCount} monthly and {snapshot.singleCount} day passes "
+                                        f"on demand)")
+        return snapshot
+    
+    def close(self):
+        self.ticketHistory.close()
+        if self.binarySnapshot is not None:
+            self.binarySnapshot.close()
+            self.binarySnapshot = None
+    
+    def _permitFromSnapshot(self, record, permitKind):
+        if record is None:
+            return None
+        permitID, registrationNumber, vehicleType, activationDate, active, redeemed = record
+        if permitKind == "monthly":
+            permit = MonthlySubscription(permitID, registrationNumber, vehicleType, activationDate, self.clock)
+        else:
+            permit = DayPass(permitID, registrationNumber, vehicleType, activationDate, self.clock)
+            permit.redemptionStatus = redeemed
+        permit.activeStatus = active
+        return permit
+    
+    def _ticketRecord(self, ticket):
+        return [
+            ticket.tokenNumber,
+            ticket.registrationNumber,
+            ticket.vehicleType,
+            ticket.assignedSlots,
+            ticket.checkInTime.isoformat(),
+            ticket.checkOutTime.isoformat() if ticket.checkOutTime else None,
+            ticket.parkingCharge,
+            ticket.pricingPlan,
+            ticket.paymentStatus
+        ]
+    
+    def _snapshotState(self):
+        return {
+            "tokenCounter": ParkingPass.tokenCounter,
+            "monthlyIDCounter": self.monthlyIDCounter,
+            "singleIDCounter": self.singleIDCounter,
+            "openTickets": [self._ticketRecord(ticket) for ticket in self.currentReceipts.values()],
+            "ticketHistory": self.ticketHistory.snapshotState(),
+            "monthlyPermits": [
+                [p.permitID, p.registrationNumber, p.vehicleType, p.activationDate.isoformat(), p.activeStatus]
+                for p in self.monthlyPermits.values()
+            ],
+            "singlePermits": [
+                [p.permitID, p.registrationNumber, p.vehicleType, p.activationDate.isoformat(), p.activeStatus,
+                 p.redemptionStatus]
+                for p in self.singlePermits.values()
+            ],
+            "dailyStatistics": {day.isoformat(): totals for day, totals in self.dailyStatistics.items()},
+            "reservations": self.reservationBook.snapshotState() if self.reservationBook is not None else None
+        }
+    
+    def _restoreTicket(self, record):
+        token, registrationNumber, vehicleType, slots, checkIn, checkOut, fee, plan, paid = record
+        return self._buildTicket(token, registrationNumber, vehicleType, slots, datetime.fromisoformat(checkIn),
+                                 datetime.fromisoformat(checkOut) if checkOut is not None else None, fee, plan, paid)
+    
+    def _buildTicket(self, token, registrationNumber, vehicleType, slots, checkInTime, checkOutTime, fee, plan, paid):
+        vehicle = self.createVehicle(vehicleType, self.ticketHistory.internPlate(registrationNumber))
+        ticket = ParkingPass(vehicle, slots, token, checkInTime, self.clock)
+        ticket.checkOutTime = checkOutTime
+        ticket.parkingCharge = fee
+        ticket.pricingPlan = plan
+        ticket.paymentStatus = paid
+        return ticket
+    
+    def _restoreSnapshot(self, state):
+        ParkingPass.tokenCounter = max(ParkingPass.tokenCounter, state["tokenCounter"])
+        self.monthlyIDCounter = state["monthlyIDCounter"]
+        self.singleIDCounter = state["singleIDCounter"]
+        
+        tickets = [self._restoreTicket(record) for record in state["openTickets"]]
+        self.slotCoordinator.occupyTickets((ticket.vehicle, ticket.assignedSlots, ticket.checkInTime)
+                                           for ticket in tickets)
+        for ticket in tickets:
+            self.currentReceipts[ticket.registrationNumber] = ticket
+        if "ticketHistory" in state:
+            self.ticketHistory.restoreState(state["ticketHistory"])
+        for record in state.get("closedTickets", []):
+            self.ticketHistory.appendTicket(self._restoreTicket(record))
+        
+        for permitID, registrationNumber, vehicleType, activation, active in state["monthlyPermits"]:
+            permit = MonthlySubscription(permitID, registrationNumber, vehicleType,
+                                         datetime.fromisoformat(activation), self.clock)
+            permit.activeStatus = active
+            self.monthlyPermits.addPermit(permit, self.clock.now())
+        for permitID, registrationNumber, vehicleType, activation, active, redeemed in state["singlePermits"]:
+            permit = DayPass(permitID, registrationNumber, vehicleType, datetime.fromisoformat(activation), self.clock)
+            permit.activeStatus = active
+            permit.redemptionStatus = redeemed
+            self.singlePermits.addPermit(permit, self.clock.now())
+        
+        for day, totals in state["dailyStatistics"].items():
+            self.dailyStatistics[datetime.fromisoformat(day).date()] = totals
+        
+        if self.reservationBook is not None and state.get("reservations"):
+            self.reservationBook.restoreState(state["reservations"])
+    
+    def _applyJournalEvent(self, event):
+        eventType = event["event"]
+        registrationNumber = event.get("plate")
+        
+        if eventType == "checkin":
+            vehicle = self.createVehicle(event["type"], registrationNumber)
+            checkInTime = datetime.fromisoformat(event["time"])
+            reservedSlots = self.slotCoordinator.occupySlots(vehicle, event["slots"], checkInTime)
+            self._registerTicket(ParkingPass(vehicle, reservedSlots, event["token"], checkInTime, self.clock))
+            if self.reservationBook is not None and "reservation" in event:
+                self.reservationBook.markFulfilled(event["reservation"], reservedSlots)
+        elif eventType == "checkout":
+            ticket = self.currentReceipts[registrationNumber]
+            ticket.checkOutTime = datetime.fromisoformat(event["time"])
+            ticket.assignParkingFee(event["fee"], event["plan"])
+        elif eventType == "redeem":
+            dayPass = self.singlePermits.get(registrationNumber)
+            if dayPass is not None:
+                dayPass.redemptionStatus = True
+                self.singlePermits.markInactive(dayPass)
+        elif eventType == "payment":
+            self._settleTicket(self.currentReceipts[registrationNumber])
+        elif eventType == "monthly":
+            permit = MonthlySubscription(event["permit"], registrationNumber, event["type"],
+                                         datetime.fromisoformat(event["time"]), self.clock)
+            self._registerPermit(self.monthlyPermits, permit, 'monthlySold')
+            self.monthlyIDCounter = event["counter"]
+        elif eventType == "daypass":
+            permit = DayPass(event["permit"], registrationNumber, event["type"],
+                             datetime.fromisoformat(event["time"]), self.clock)
+            self._registerPermit(self.singlePermits, permit, 'dailySold')
+            self.singleIDCounter = event["counter"]
+        elif eventType == "reserve":
+            if self.reservationBook is not None:
+                self.reservationBook.restoreReservation(event["reservation"], registrationNumber, event["type"],
+                                                        event["slots"], datetime.fromisoformat(event["start"]),
+                                                        datetime.fromisoformat(event["end"]))
+        elif eventType == "cancel":
+            if self.reservationBook is not None:
+                self.reservationBook.cancelReservation(registrationNumber)
+        elif eventType == "import":
+            self._storeImportedPermits(event["permits"], datetime.fromisoformat(event["time"]))
+            self.monthlyIDCounter = event["monthlyCounter"]
+            self.singleIDCounter = event["singleCounter"]
+    
+    def _recoverFromJournal(self):
+        state = self.journal.loadSnapshot()
+        if state is not None:
+            self._restoreSnapshot(state)
+        for event in self.journal.replayEvents():
+            self._applyJournalEvent(event)
@@ -0,0 +1,140 @@
+import heapq
+import threading
+from contextlib import nullcontext
+from itertools import count
+from garageClock import SYSTEM_CLOCK
+
+
+class PermitRegistry:
+    
+    def __init__(self, threadSafe=False, clock=None):
+        self.permits = {}
+        self.expiryQueue = []
+        self.livePermits = set()
+        self.insertionOrder = count()
+        self.registryLock = threading.Lock() if threadSafe else nullcontext()
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.permitSource = None
+        self.faultedPlates = set()
+    
+    def __contains__(self, registrationNumber):
+        if self.permitSource is not None:
+            self._faultPermit(registrationNumber)
+        return registrationNumber in self.permits
+    
+    def __getitem__(self, registrationNumber):
+        if self.permitSource is not None:
+            self._faultPermit(registrationNumber)
+        return self.permits[registrationNumber]
+    
+    def __setitem__(self, registrationNumber, permit):
+        self.addPermit(permit)
+    
+    def __len__(self):
+        self._faultAllPermits()
+        return len(self.permits)
+    
+    def __iter__(self):
+        self._faultAllPermits()
+        return iter(self.permits)
+    
+    def get(self, registrationNumber, default=None):
+        if self.permitSource is not None:
+            self._faultPermit(registrationNumber)
+        return self.permits.get(registrationNumber, default)
+    
+    def values(self):
+        self._faultAllPermits()
+        return self.permits.values()
+    
+    def items(self):
+        self._faultAllPermits()
+        return self.permits.items()
+    
+    def attachSource(self, findPermit, loadPermits):
+        with self.registryLock:
+            self.permitSource = (findPermit, loadPermits)
+            self.faultedPlates = set()
+    
+    def _faultPermit(self, registrationNumber):
+        if registrationNumber in self.faultedPlates:
+            return
+        with self.registryLock:
+            if self.permitSource is None or registrationNumber in self.faultedPlates:
+                return
+            self.faultedPlates.add(registrationNumber)
+            if registrationNumber in self.permits:
+                return
+            permit = self.permitSource[0](registrationNumber)
+            if permit is not None:
+                self._storePermit(permit, self.clock.now())
+                heapq.heappush(self.expiryQueue, (permit.terminationDate, next(self.insertionOrder), permit))
+    
+    def _faultAllPermits(self):
+        if self.permitSource is None:
+            return
+        with self.registryLock:
+            if self.permitSource is None:
+                return
+            loadPermits = self.permitSource[1]
+            currentTime = self.clock.now()
+            for permit in loadPermits():
+                if permit.registrationNumber not in self.faultedPlates:
+                    self._storePermit(permit, currentTime)
+                    self.expiryQueue.append((permit.terminationDate, next(self.insertionOrder), permit))
+            heapq.heapify(self.expiryQueue)
+            self.permitSource = None
+            self.faultedPlates = set()
+    
+    def _storePermit(self, permit, currentTime):
+        if self.permitSource is not None:
+            self.faultedPlates.add(permit.registrationNumber)
+        previous = self.permits.get(permit.registrationNumber)
+        if previous is not None:
+            self.livePermits.discard(id(previous))
+        self.permits[permit.registrationNumber] = permit
+        if permit.checkValidity(currentTime):
+            self.livePermits.add(id(permit))
+    
+    def addPermit(self, permit, currentTime=None):
+        currentTime = currentTime if currentTime is not None else self.clock.now()
+        with self.registryLock:
+            self._storePermit(permit, currentTime)
+            heapq.heappush(self.expiryQueue, (permit.terminationDate, next(self.insertionOrder), permit))
+    
+    def addPermits(self, permits, currentTime=None):
+        currentTime = currentTime if currentTime is not None else self.clock.now()
+        with self.registryLock:
+            for permit in permits:
+                self._storePermit(permit, currentTime)
+                self.expiryQueue.append((permit.terminationDate, next(self.insertionOrder), permit))
+            heapq.heapify(self.expiryQueue)
+    
+    def markInactive(self, permit):
+        with self.registryLock:
+            self.livePermits.discard(id(permit))
+    
+    def isValid(self, registrationNumber, currentTime=None):
+        if self.permitSource is not None:
+            self._faultPermit(registrationNumber)
+        permit = self.permits.get(registrationNumber)
+        if permit is None:
+            return False
+        return permit.checkValidity(currentTime)
+    
+    def sweepExpired(self, currentTime=None):
+        currentTime = currentTime if currentTime is not None else self.clock.now()
+        self._faultAllPermits()
+        expiredCount = 0
+        with self.registryLock:
+            while self.expiryQueue and self.expiryQueue[0][0] < currentTime:
+                permit = heapq.heappop(self.expiryQueue)[2]
+                self.livePermits.discard(id(permit))
+                if self.permits.get(permit.registrationNumber) is permit:
+                    del self.permits[permit.registrationNumber]
+                expiredCount += 1
+        return expiredCount
+    
+    def activeCount(self, currentTime=None):
+        self.sweepExpired(currentTime)
+        return len(self.livePermits)
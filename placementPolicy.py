@@ -0,0 +1,178 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+
+
+class FreeRunRegistry:
+    
+    def __init__(self, capacity):
+        self.runStarts = []
+        self.runLengths = {}
+        self.runEnds = {}
+        self.startsByLength = {}
+        self.lengths = []
+        self.freeCount = 0
+        if capacity > 0:
+            self._addRun(0, capacity)
+    
+    def _addRun(self, start, length):
+        insort(self.runStarts, start)
+        self.runLengths[start] = length
+        self.runEnds[start + length - 1] = start
+        bucket = self.startsByLength.get(length)
+        if bucket is None:
+            self.startsByLength[length] = [start]
+            insort(self.lengths, length)
+        else:
+            insort(bucket, start)
+        self.freeCount += length
+    
+    def _removeRun(self, start):
+        length = self.runLengths.pop(start)
+        del self.runEnds[start + length - 1]
+        del self.runStarts[bisect_left(self.runStarts, start)]
+        bucket = self.startsByLength[length]
+        del bucket[bisect_left(bucket, start)]
+        if not bucket:
+            del self.startsByLength[length]
+            del self.lengths[bisect_left(self.lengths, length)]
+        self.freeCount -= length
+        return length
+    
+    def containingRun(self, position):
+        index = bisect_right(self.runStarts, position) - 1
+        if index < 0:
+            return None
+        start = self.runStarts[index]
+        if position < start + self.runLengths[start]:
+            return start
+        return None
+    
+    def occupyRange(self, start, count):
+        runStart = self.containingRun(start)
+        if runStart is None:
+            return
+        runLength = self._removeRun(runStart)
+        if start > runStart:
+            self._addRun(runStart, start - runStart)
+        tailLength = runStart + runLength - start - count
+        if tailLength > 0:
+            self._addRun(start + count, tailLength)
+    
+    def releasePosition(self, position):
+        if self.containingRun(position) is not None:
+            return
+        start = position
+        length = 1
+        leftStart = self.runEnds.get(position - 1)
+        if leftStart is not None:
+            length += self._removeRun(leftStart)
+            start = leftStart
+        if position + 1 in self.runLengths:
+            length += self._removeRun(position + 1)
+        self._addRun(start, length)
+    
+    def smallestRunAtLeast(self, runLength):
+        index = bisect_left(self.lengths, runLength)
+        if index == len(self.lengths):
+            return None
+        length = self.lengths[index]
+        return self.startsByLength[length][0], length
+    
+    def runsAtLeast(self, runLength):
+        for length in self.lengths[bisect_left(self.lengths, runLength):]:
+            for start in self.startsByLength[length]:
+                yield start, length
+    
+    def largestRun(self):
+        return self.lengths[-1] if self.lengths else 0
+    
+    def runCount(self):
+        return len(self.runStarts)
+    
+    def runHistogram(self):
+        return {length: len(self.startsByLength[length]) for length in self.lengths}
+
+
+class PlacementPolicy(ABC):
+    
+    @abstractmethod
+    def findRun(self, zone, slotsNeeded):
+        pass
+    
+    @abstractmethod
+    def policyName(self):
+        pass
+
+
+class FirstFitPlacement(PlacementPolicy):
+    
+    def findRun(self, zone, slotsNeeded):
+        return zone.freeRunIndex.findFirstRun(slotsNeeded)
+    
+    def policyName(self):
+        return "First Fit"
+
+
+class BestFitPlacement(PlacementPolicy):
+    
+    def findRun(self, zone, slotsNeeded):
+        bestRun = zone.runRegistry.smallestRunAtLeast(slotsNeeded)
+        if bestRun is None:
+            return None
+        return bestRun[0]
+    
+    def policyName(self):
+        return "Best Fit"
+
+
+class SizeSegregatedPlacement(PlacementPolicy):
+    
+    def __init__(self, largeVehicleSlots=2):
+        self.largeVehicleSlots = largeVehicleSlots
+    
+    def findRun(self, zone, slotsNeeded):
+        if slotsNeeded >= self.largeVehicleSlots:
+            return zone.freeRunIndex.findFirstRun(slotsNeeded)
+        smallestRun = zone.runRegistry.smallestRunAtLeast(slotsNeeded)
+        if smallestRun is None:
+            return None
+        length = smallestRun[1]
+        return zone.runRegistry.startsByLength[length][-1] + length - slotsNeeded
+    
+    def policyName(self):
+        return "Size Segregated"
+
+
+class BuddyPlacement(PlacementPolicy):
+    
+    def findRun(self, zone, slotsNeeded):
+        blockSize = 1
+        while blockSize < slotsNeeded:
+            blockSize *= 2
+        fallback = None
+        for start, length in zone.runRegistry.runsAtLeast(slotsNeeded):
+            alignedStart = -(-start // blockSize) * blockSize
+            if alignedStart + slotsNeeded <= start + length:
+                return alignedStart
+            if fallback is None:
+                fallback = start
+        return fallback
+    
+    def policyName(self):
+        return "Buddy"
+
+
+PLACEMENT_POLICIES = {
+    "firstFit": FirstFitPlacement,
+    "bestFit": BestFitPlacement,
+    "sizeSegregated": SizeSegregatedPlacement,
+    "buddy": BuddyPlacement
+}
+
+
+def createPlacementPolicy(placementPolicy):
+    if isinstance(placementPolicy, PlacementPolicy):
+        return placementPolicy
+    if placementPolicy not in PLACEMENT_POLICIES:
+        raise ValueError(f"Unknown placement policy: {placementPolicy}")
+    return PLACEMENT_POLICIES[placementPolicy]()
@@ -1,32 +1,53 @@
-from datetime import datetime
+import threading
+from garageClock import SYSTEM_CLOCK
 
 
 class ParkingPass:
     
+    __slots__ = ("tokenNumber", "vehicle", "assignedSlots", "clock", "checkInTime", "checkOutTime",
+                 "parkingCharge", "paymentStatus", "pricingPlan")
+    
     tokenCounter = 1500 
+    tokenLock = threading.Lock()
     
-    def __init__(self, vehicle, assignedSlots):
-        ParkingPass.tokenCounter += 1
-        self.tokenNumber = ParkingPass.tokenCounter
+    def __init__(self, vehicle, assignedSlots, tokenNumber=None, checkInTime=None, clock=None):
+        with ParkingPass.tokenLock:
+            if tokenNumber is None:
+                ParkingPass.tokenCounter += 1
+                tokenNumber = ParkingPass.tokenCounter
+            elif tokenNumber > ParkingPass.tokenCounter:
+                ParkingPass.tokenCounter = tokenNumber
+        self.tokenNumber = tokenNumber
         
         self.vehicle = vehicle
-        self.registrationNumber = vehicle.PlateNumber()
-        self.vehicleType = vehicle.VehicleType()
         
         self.assignedSlots = assignedSlots
         
-        self.checkInTime = datetime.now()
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.checkInTime = checkInTime if checkInTime is not None else self.clock.now()
         self.checkOutTime = None
         
         self.parkingCharge = 0.0
         self.paymentStatus = False
         self.pricingPlan = None
     
-    def logExitTime(self):
-        self.checkOutTime = datetime.now()
+    @property
+    def registrationNumber(self):
+        return self.vehicle.registrationNumber
+    
+    @property
+    def vehicleType(self):
+        return self.vehicle.vehicleType
+    
+    @property
+    def typeCode(self):
+        return self.vehicle.typeCode
+    
+    def logExitTime(self, exitTime=None):
+        self.checkOutTime = exitTime if exitTime is not None else self.clock.now()
     
-    def calculateParkingTime(self):
-        endTime = self.checkOutTime if self.checkOutTime else datetime.now()
+    def calculateParkingTime(self, currentTime=None):
+        endTime = self.checkOutTime or currentTime or self.clock.now()
         duration = endTime - self.checkInTime
         hoursParked = duration.total_seconds() / 3600
         return hoursParked
@@ -0,0 +1,354 @@
+import heapq
+import threading
+from bisect import bisect_left, bisect_right, insort
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from garageClock import SYSTEM_CLOCK
+
+
+HOLD_LEAD_TIME = timedelta(minutes=30)
+HOLD_GRACE_PERIOD = timedelta(minutes=15)
+WALK_IN_STAY = timedelta(hours=4)
+OPEN_STATES = ("booked", "held")
+
+
+class Reservation:
+    
+    __slots__ = ("reservationID", "registrationNumber", "vehicleType", "slotIDs", "startTime", "endTime", "status")
+    
+    def __init__(self, reservationID, registrationNumber, vehicleType, slotIDs, startTime, endTime, status="booked"):
+        self.reservationID = reservationID
+        self.registrationNumber = registrationNumber
+        self.vehicleType = vehicleType
+        self.slotIDs = slotIDs
+        self.startTime = startTime
+        self.endTime = endTime
+        self.status = status
+    
+    def reservationDetails(self):
+        details = f"""
+        Reservation ID: {self.reservationID}
+        Registration: {self.registrationNumber}
+        Category: {self.vehicleType}
+        Reserved Slot(s): {', '.join(map(str, self.slotIDs))}
+        From: {self.startTime.strftime('%Y-%m-%d %H:%M')}
+        Until: {self.endTime.strftime('%Y-%m-%d %H:%M')}
+        Status: {self.status.capitalize()}
+        """
+        return details
+
+
+class ZoneSchedule:
+    
+    __slots__ = ("startTimes", "endTimes", "slotSpans", "reservations", "durations")
+    
+    def __init__(self):
+        self.startTimes = []
+        self.endTimes = []
+        self.slotSpans = []
+        self.reservations = []
+        self.durations = []
+    
+    def __len__(self):
+        return len(self.startTimes)
+    
+    def add(self, reservation):
+        position = bisect_right(self.startTimes, reservation.startTime)
+        self.startTimes.insert(position, reservation.startTime)
+        self.endTimes.insert(position, reservation.endTime)
+        self.slotSpans.insert(position, (min(reservation.slotIDs), max(reservation.slotIDs)))
+        self.reservations.insert(position, reservation)
+        insort(self.durations, reservation.endTime - reservation.startTime)
+    
+    def remove(self, reservation):
+        position = bisect_left(self.startTimes, reservation.startTime)
+        while self.reservations[position] is not reservation:
+            position += 1
+        del self.startTimes[position]
+        del self.endTimes[position]
+        del self.slotSpans[position]
+        del self.reservations[position]
+        del self.durations[bisect_left(self.durations, reservation.endTime - reservation.startTime)]
+    
+    @property
+    def longestDuration(self):
+        return self.durations[-1] if self.durations else timedelta(0)
+    
+    def reservedSpans(self, startTime, endTime):
+        firstPosition = bisect_right(self.startTimes, startTime - self.longestDuration)
+        lastPosition = bisect_left(self.startTimes, endTime, firstPosition)
+        reservedSpans = [slotSpan for slotSpan, reservationEnd in zip(self.slotSpans[firstPosition:lastPosition],
+                                                                      self.endTimes[firstPosition:lastPosition])
+                         if reservationEnd > startTime]
+        reservedSpans.sort()
+        return reservedSpans
+
+
+class ReservationBook:
+    
+    def __init__(self, allocator, clock=None, holdLeadTime=HOLD_LEAD_TIME, gracePeriod=HOLD_GRACE_PERIOD,
+                 walkInStay=WALK_IN_STAY, threadSafe=False):
+        self.allocator = allocator
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.holdLeadTime = holdLeadTime
+        self.gracePeriod = gracePeriod
+        self.walkInStay = walkInStay
+        self.schedules = {}
+        self.reservations = {}
+        self.reservationsByPlate = {}
+        self.activationQueue = []
+        self.expiryQueue = []
+        self.pendingHolds = set()
+        self.reservationCounter = 0
+        self.bookLock = threading.RLock() if threadSafe else nullcontext()
+        self.statistics = {"booked": 0, "fulfilled": 0, "expired": 0, "cancelled": 0, "displaced": 0,
+                           "relocated": 0}
+    
+    def __len__(self):
+        return len(self.reservations)
+    
+    def __contains__(self, registrationNumber):
+        return registrationNumber in self.reservationsByPlate
+    
+    def get(self, registrationNumber, default=None):
+        return self.reservationsByPlate.get(registrationNumber, default)
+    
+    def findRun(self, vehicleType, slotsNeeded, startTime, endTime, requireVacant=False):
+        for zone in self.allocator.zonesForType(vehicleType):
+            if requireVacant and zone.largestRun() < slotsNeeded:
+                continue
+            schedule = self.schedules.get(zone)
+            reservedSpans = schedule.reservedSpans(startTime, endTime) if schedule is not None else []
+            if requireVacant:
+                firstSlot = zone.searchRunExcluding(reservedSpans, slotsNeeded)
+            else:
+                firstSlot = self._firstGap(zone, reservedSpans, slotsNeeded)
+            if firstSlot is not None:
+                return list(range(firstSlot, firstSlot + slotsNeeded))
+        return None
+    
+    def walkInReservedSpans(self, vehicleType, currentTime=None):
+        currentTime = currentTime if currentTime is not None else self.clock.now()
+        with self.bookLock:
+            return {zone: self.schedules[zone].reservedSpans(currentTime, currentTime + self.walkInStay)
+                    for zone in self.allocator.zonesForType(vehicleType) if zone in self.schedules}
+    
+    def _firstGap(self, zone, reservedSpans, slotsNeeded):
+        gapStart = zone.firstSlot
+        for firstSlot, lastSlot in reservedSpans:
+            if firstSlot - gapStart >= slotsNeeded:
+                return gapStart
+            if lastSlot >= gapStart:
+                gapStart = lastSlot + 1
+        if zone.firstSlot + zone.slotCount - gapStart >= slotsNeeded:
+            return gapStart
+        return None
+    
+    def reserve(self, registrationNumber, vehicleType, slotsNeeded, startTime, endTime, currentTime=None):
+        if endTime <= startTime:
+            raise ValueError("Reservation must end after it starts")
+        currentTime = currentTime if currentTime is not None else self.clock.now()
+        if endTime <= currentTime:
+            return None
+        
+        with self.bookLock:
+            self.processDue(currentTime)
+            if registrationNumber in self.reservationsByPlate:
+                return None
+            
+            holdNow = startTime - self.holdLeadTime <= currentTime
+            slotIDs = self.findRun(vehicleType, slotsNeeded, startTime, endTime, holdNow)
+            if slotIDs is None:
+                return None
+            
+            self.reservationCounter += 1
+            reservation = Reservation(f"RS-{self.reservationCounter}", registrationNumber, vehicleType, slotIDs,
+                                      startTime, endTime)
+            self._addReservation(reservation)
+            self.statistics["booked"] += 1
+            if holdNow:
+                self._activate(reservation)
+            return reservation
+    
+    def restoreReservation(self, reservationID, registrationNumber, vehicleType, slotIDs, startTime, endTime,
+                           status="booked"):
+        with self.bookLock:
+            reservation = Reservation(reservationID, registrationNumber, vehicleType, list(slotIDs), startTime,
+                                      endTime, "booked" if status == "held" else status)
+            self._addReservation(reservation)
+            self.reservationCounter = max(self.reservationCounter, int(reservationID.split("-")[1]))
+            return reservation
+    
+    def _addReservation(self, reservation):
+        self.reservations[reservation.reservationID] = reservation
+        self.reservationsByPlate[reservation.registrationNumber] = reservation
+        self._addToSchedules(reservation)
+        heapq.heappush(self.activationQueue, (reservation.startTime - self.holdLeadTime, reservation.reservationID))
+        heapq.heappush(self.expiryQueue, (reservation.startTime + self.gracePeriod, reservation.reservationID))
+    
+    def _reservationZones(self, reservation):
+        return {self.allocator.zoneForSlot(slotID) for slotID in reservation.slotIDs}
+    
+    def _addToSchedules(self, reservation):
+        for zone in self._reservationZones(reservation):
+            schedule = self.schedules.get(zone)
+            if schedule is None:
+                schedule = self.schedules[zone] = ZoneSchedule()
+            schedule.add(reservation)
+    
+    def _removeFromSchedules(self, reservation):
+        for zone in self._reservationZones(reservation):
+            schedule = self.schedules[zone]
+            schedule.remove(reservation)
+            if not schedule:
+                del self.schedules[zone]
+    
+    def _activate(self, reservation):
+        if reservation.status != "booked":
+            return reservation.status == "held"
+        if self.allocator.holdSlots(reservation.slotIDs):
+            reservation.status = "held"
+            self.pendingHolds.discard(reservation.reservationID)
+            return True
+        
+        self._removeFromSchedules(reservation)
+        slotIDs = self.findRun(reservation.vehicleType, len(reservation.slotIDs), reservation.startTime,
+                               reservation.endTime, True)
+        if slotIDs is not None and self.allocator.holdSlots(slotIDs):
+            reservation.slotIDs = slotIDs
+            reservation.status = "held"
+            self._addToSchedules(reservation)
+            self.pendingHolds.discard(reservation.reservationID)
+            self.statistics["relocated"] += 1
+            return True
+        
+        self._addToSchedules(reservation)
+        self.pendingHolds.add(reservation.reservationID)
+        return False
+    
+    def _closeReservation(self, reservation, status):
+        if reservation.status == "held":
+            self.allocator.releaseHeldSlots(reservation.slotIDs)
+        self._removeFromSchedules(reservation)
+        self.pendingHolds.discard(reservation.reservationID)
+        del self.reservations[reservation.reservationID]
+        if self.reservationsByPlate.get(reservation.registrationNumber) is reservation:
+            del self.reservationsByPlate[reservation.registrationNumber]
+        reservation.status = status
+        self.statistics[status] += 1
+    
+    def processDue(self, currentTime=None):
+        currentTime = currentTime if currentTime is not None else self.clock.now()
+        if not ((self.activationQueue and self.activationQueue[0][0] <= currentTime)
+                or (self.expiryQueue and self.expiryQueue[0][0] <= currentTime)):
+            return
+        
+        with self.bookLock:
+            while self.activationQueue and self.activationQueue[0][0] <= currentTime:
+                reservation = self.reservations.get(heapq.heappop(self.activationQueue)[1])
+                if reservation is not None:
+                    self._activate(reservation)
+            while self.expiryQueue and self.expiryQueue[0][0] <= currentTime:
+                reservation = self.reservations.get(heapq.heappop(self.expiryQueue)[1])
+                if reservation is not None and reservation.status in OPEN_STATES:
+                    self._closeReservation(reservation, "expired" if reservation.status == "held" else "displaced")
+    
+    def retryPendingHolds(self, releasedSlotIDs=None):
+        if not self.pendingHolds:
+            return
+        with self.bookLock:
+            releasedZones = (None if releasedSlotIDs is None
+                             else {self.allocator.zoneForSlot(slotID) for slotID in releasedSlotIDs})
+            for reservationID in sorted(self.pendingHolds, key=lambda pending: self.reservations[pending].startTime):
+                reservation = self.reservations[reservationID]
+                if releasedZones is None or any(
+                        zone.accepts(reservation.vehicleType) and zone.largestRun() >= len(reservation.slotIDs)
+                        for zone in releasedZones):
+                    self._activate(reservation)
+    
+    def claimReservation(self, registrationNumber, vehicleType, currentTime=None):
+        currentTime = currentTime if currentTime is not None else self.clock.now()
+        self.processDue(currentTime)
+        if registrationNumber not in self.reservationsByPlate:
+            return None
+        
+        with self.bookLock:
+            reservation = self.reservationsByPlate.get(registrationNumber)
+            if reservation is None or reservation.status not in OPEN_STATES or reservation.vehicleType != vehicleType:
+                return None
+            if not self._activate(reservation):
+                return None
+            reservation.status = "fulfilled"
+            self.statistics["fulfilled"] += 1
+            return reservation
+    
+    def releaseClaim(self, reservation):
+        with self.bookLock:
+            if reservation.status == "fulfilled":
+                reservation.status = "held"
+                self.statistics["fulfilled"] -= 1
+    
+    def markFulfilled(self, reservationID, slotIDs):
+        with self.bookLock:
+            reservation = self.reservations.get(reservationID)
+            if reservation is None:
+                return None
+            self._removeFromSchedules(reservation)
+            reservation.slotIDs = list(slotIDs)
+            self._addToSchedules(reservation)
+            reservation.status = "fulfilled"
+            self.statistics["fulfilled"] += 1
+            return reservation
+    
+    def completeReservation(self, registrationNumber):
+        with self.bookLock:
+            reservation = self.reservationsByPlate.get(registrationNumber)
+            if reservation is None or reservation.status != "fulfilled":
+                return None
+            self._removeFromSchedules(reservation)
+            del self.reservations[reservation.reservationID]
+            del self.reservationsByPlate[registrationNumber]
+            return reservation
+    
+    def cancelReservation(self, registrationNumber):
+        with self.bookLock:
+            reservation = self.reservationsByPlate.get(registrationNumber)
+            if reservation is None or reservation.status not in OPEN_STATES:
+                return None
+            self._closeReservation(reservation, "cancelled")
+            return reservation
+    
+    def upcomingReservations(self, startTime, endTime):
+        with self.bookLock:
+            return sorted(
+                (reservation for reservation in self.reservations.values()
+                 if reservation.startTime < endTime and startTime < reservation.endTime),
+                key=lambda reservation: reservation.startTime
+            )
+    
+    def reservationMetrics(self):
+        with self.bookLock:
+            metrics = dict(self.statistics)
+            metrics["open"] = sum(1 for reservation in self.reservations.values()
+                                  if reservation.status in OPEN_STATES)
+            metrics["held"] = sum(1 for reservation in self.reservations.values() if reservation.status == "held")
+            metrics["pendingHolds"] = len(self.pendingHolds)
+            metrics["heldSlots"] = self.allocator.heldSpaces()
+            return metrics
+    
+    def snapshotState(self):
+        with self.bookLock:
+            return {
+                "counter": self.reservationCounter,
+                "reservations": [
+                    [r.reservationID, r.registrationNumber, r.vehicleType, r.slotIDs, r.startTime.isoformat(),
+                     r.endTime.isoformat(), r.status]
+                    for r in self.reservations.values()
+                ]
+            }
+    
+    def restoreState(self, state):
+        for reservationID, registrationNumber, vehicleType, slotIDs, start, end, status in state["reservations"]:
+            self.restoreReservation(reservationID, registrationNumber, vehicleType, slotIDs,
+                                    datetime.fromisoformat(start), datetime.fromisoformat(end), status)
+        self.reservationCounter = max(self.reservationCounter, state["counter"])
@@ -0,0 +1,178 @@
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from math import dist
+from parkingSystem import GarageManager, VEHICLE_CLASSES
+from gateService import GateService
+from outputSink import NullSink
+from receiptToken import ParkingPass
+from vehicle import VEHICLE_TYPE_NAMES
+
+
+SITE_TOKEN_RANGE = 10 ** 8
+
+
+def runSite(siteName, maximumSlots, connection, firstToken):
+    ParkingPass.tokenCounter = firstToken
+    garage = GarageManager(outputSink=NullSink(), maximumSlots=maximumSlots, garageName=siteName)
+    service = GateService(garage)
+    allocator = garage.slotCoordinator
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        response = service.handleRequest(request)
+        response["siteLargestRun"] = {vehicleType: allocator.largestFreeRun(vehicleType)
+                                      for vehicleType in VEHICLE_TYPE_NAMES}
+        response["siteAvailable"] = allocator.availableSpaces()
+        connection.send(response)
+    connection.close()
+
+
+class GarageSite:
+    
+    def __init__(self, siteName, location, maximumSlots, context, firstToken):
+        self.siteName = siteName
+        self.location = location
+        self.maximumSlots = maximumSlots
+        self.largestRun = dict.fromkeys(VEHICLE_TYPE_NAMES, maximumSlots)
+        self.available = maximumSlots
+        self.connection, workerConnection = context.Pipe()
+        self.process = context.Process(target=runSite, args=(siteName, maximumSlots, workerConnection, firstToken), daemon=True)
+        self.siteLock = threading.Lock()
+    
+    def start(self):
+        self.process.start()
+    
+    def stop(self):
+        with self.siteLock:
+            if self.process.is_alive():
+                self.connection.send(None)
+            self.process.join()
+            self.connection.close()
+    
+    def request(self, request):
+        with self.siteLock:
+            self.connection.send(request)
+            response = self.connection.recv()
+            self.largestRun = response.pop("siteLargestRun")
+            self.available = response.pop("siteAvailable")
+        response["site"] = self.siteName
+        return response
+
+
+class SiteCoordinator:
+    
+    def __init__(self, siteDefinitions, startMethod=None):
+        context = multiprocessing.get_context(startMethod)
+        self.sites = {}
+        for siteIndex, (siteName, location, maximumSlots) in enumerate(siteDefinitions):
+            self.sites[siteName] = GarageSite(siteName, location, maximumSlots, context,
+                                              ParkingPass.tokenCounter + siteIndex * SITE_TOKEN_RANGE)
+        self.plateSites = {}
+        self.routingLock = threading.Lock()
+        self.fanOutPool = None
+    
+    def start(self):
+        for site in self.sites.values():
+            site.start()
+        self.fanOutPool = ThreadPoolExecutor(max_workers=len(self.sites))
+        return self
+    
+    def stop(self):
+        if self.fanOutPool is not None:
+            self.fanOutPool.shutdown()
+            self.fanOutPool = None
+        for site in self.sites.values():
+            site.stop()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.stop()
+    
+    def _fanOut(self, request):
+        return list(self.fanOutPool.map(lambda site: site.request(dict(request)), self.sites.values()))
+    
+    def sitesByDistance(self, origin):
+        return sorted(self.sites.values(), key=lambda site: dist(origin, site.location))
+    
+    def routeVehicle(self, vehicleType, slotsNeeded, origin, excludedSites=()):
+        for site in self.sitesByDistance(origin):
+            if site.siteName not in excludedSites and site.largestRun[vehicleType] >= slotsNeeded:
+                return site
+        return None
+    
+    def checkIn(self, vehicleType, registrationNumber, origin=(0, 0)):
+        vehicleClass = VEHICLE_CLASSES.get(vehicleType.lower())
+        if vehicleClass is None:
+            return {"ok": False, "error": f"Unrecognized vehicle category: {vehicleType}"}
+        vehicle = vehicleClass(registrationNumber)
+        slotsNeeded = vehicle.SpaceRequired()
+        routedType = vehicle.VehicleType()
+        
+        with self.routingLock:
+            if registrationNumber in self.plateSites:
+                return {"ok": False, "error": "Vehicle already has active token", "site": self.plateSites[registrationNumber]}
+            self.plateSites[registrationNumber] = None
+        
+        triedSites = set()
+        site = self.routeVehicle(routedType, slotsNeeded, origin)
+        while site is not None:
+            response = site.request({"op": "checkin", "type": vehicleType, "plate": registrationNumber})
+            if response["ok"]:
+                with self.routingLock:
+                    self.plateSites[registrationNumber] = site.siteName
+                return response
+            triedSites.add(site.siteName)
+            site = self.routeVehicle(routedType, slotsNeeded, origin, triedSites)
+        
+        with self.routingLock:
+            del self.plateSites[registrationNumber]
+        return {"ok": False, "error": "No site has a free run for this vehicle"}
+    
+    def _siteForPlate(self, registrationNumber):
+        siteName = self.plateSites.get(registrationNumber)
+        if siteName is not None:
+            return self.sites[siteName]
+        locations = self.locateVehicle(registrationNumber)
+        if not locations:
+            return None
+        return self.sites[next(iter(locations))]
+    
+    def checkOut(self, registrationNumber):
+        site = self._siteForPlate(registrationNumber)
+        if site is None:
+            return {"ok": False, "error": "No active token"}
+        return site.request({"op": "checkout", "plate": registrationNumber})
+    
+    def payment(self, registrationNumber):
+        site = self._siteForPlate(registrationNumber)
+        if site is None:
+            return {"ok": False, "error": "No pending transaction"}
+        response = site.request({"op": "payment", "plate": registrationNumber})
+        if response["ok"]:
+            with self.routingLock:
+                self.plateSites.pop(registrationNumber, None)
+        return response
+    
+    def locateVehicle(self, registrationNumber):
+        responses = self._fanOut({"op": "track", "plate": registrationNumber})
+        return {response["site"]: response["slots"] for response in responses if response["ok"]}
+    
+    def fleetOccupancy(self):
+        responses = self._fanOut({"op": "capacity"})
+        sites = {response["site"]: response for response in responses}
+        return {
+            "available": sum(response["available"] for response in responses),
+            "occupied": sum(response["occupied"] for response in responses),
+            "total": sum(response["total"] for response in responses),
+            "sites": sites
+        }
+    
+    def cachedCapacity(self):
+        return {
+            siteName: {"available": site.available, "largestRun": site.largestRun}
+            for siteName, site in self.sites.items()
+        }
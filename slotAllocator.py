@@ -1,19 +1,26 @@
-from datetime import datetime
+import threading
+from bisect import bisect_left, bisect_right, insort
+from contextlib import nullcontext
+from compactSlotStore import CompactSlotStore
+from garageClock import SYSTEM_CLOCK
+from placementPolicy import FreeRunRegistry, createPlacementPolicy
 
 
 class ParkingSlot:
     
+    __slots__ = ("slotID", "slotTaken", "vehicle", "checkInTime")
+    
     def __init__(self, slotID):
         self.slotID = slotID
         self.slotTaken = False
         self.vehicle = None
         self.checkInTime = None
     
-    def assignSlot(self, vehicle):
+    def assignSlot(self, vehicle, checkInTime=None):
         if not self.slotTaken:
             self.slotTaken = True
             self.vehicle = vehicle
-            self.checkInTime = datetime.now()
+            self.checkInTime = checkInTime if checkInTime is not None else SYSTEM_CLOCK.now()
             return True
         return False
     
@@ -35,25 +42,306 @@ class ParkingSlot:
         return info
 
 
+class FreeRunIndex:
+    
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.size = 1
+        while self.size < capacity:
+            self.size *= 2
+        self.prefixRun = [0] * (2 * self.size)
+        self.suffixRun = [0] * (2 * self.size)
+        self.longestRun = [0] * (2 * self.size)
+        
+        spanLength = 1
+        while spanLength <= self.size:
+            levelStart = self.size // spanLength
+            fullSpans = min(capacity // spanLength, levelStart)
+            partialSpan = capacity - fullSpans * spanLength if fullSpans < levelStart else 0
+            runs = [spanLength] * fullSpans + ([partialSpan] if partialSpan else [])
+            self.prefixRun[levelStart:levelStart + len(runs)] = runs
+            self.longestRun[levelStart:levelStart + len(runs)] = runs
+            self.suffixRun[levelStart:levelStart + fullSpans] = [spanLength] * fullSpans
+            spanLength *= 2
+    
+    def _combine(self, node, half):
+        left = 2 * node
+        right = left + 1
+        prefixRun = self.prefixRun
+        suffixRun = self.suffixRun
+        leftPrefix = prefixRun[left]
+        rightSuffix = suffixRun[right]
+        prefixRun[node] = leftPrefix if leftPrefix < half else half + prefixRun[right]
+        suffixRun[node] = rightSuffix if rightSuffix < half else half + suffixRun[left]
+        self.longestRun[node] = max(self.longestRun[left], self.longestRun[right],
+                                    suffixRun[left] + prefixRun[right])
+    
+    def _setLeaf(self, position, value):
+        node = self.size + position
+        self.prefixRun[node] = value
+        self.suffixRun[node] = value
+        self.longestRun[node] = value
+        node //= 2
+        half = 1
+        while node >= 1:
+            self._combine(node, half)
+            node //= 2
+            half *= 2
+    
+    def occupy(self, position):
+        self._setLeaf(position, 0)
+    
+    def release(self, position):
+        self._setLeaf(position, 1)
+    
+    def occupyMany(self, positions):
+        self._setLeaves(positions, 0)
+    
+    def releaseMany(self, positions):
+        self._setLeaves(positions, 1)
+    
+    def _setLeaves(self, positions, value):
+        dirtyNodes = set()
+        for position in positions:
+            node = self.size + position
+            self.prefixRun[node] = value
+            self.suffixRun[node] = value
+            self.longestRun[node] = value
+            dirtyNodes.add(node // 2)
+        half = 1
+        while dirtyNodes:
+            for node in dirtyNodes:
+                self._combine(node, half)
+            dirtyNodes = {node // 2 for node in dirtyNodes if node > 1}
+            half *= 2
+    
+    def isFree(self, position):
+        return self.longestRun[self.size + position] == 1
+    
+    def largestRun(self):
+        return self.longestRun[1]
+    
+    def findFirstRun(self, runLength):
+        if runLength < 1:
+            runLength = 1
+        if self.longestRun[1] < runLength:
+            return None
+        node = 1
+        start = 0
+        half = self.size // 2
+        while node < self.size:
+            left = 2 * node
+            if self.longestRun[left] >= runLength:
+                node = left
+            elif self.suffixRun[left] + self.prefixRun[left + 1] >= runLength:
+                return start + half - self.suffixRun[left]
+            else:
+                node = left + 1
+                start += half
+            half //= 2
+        return start
+
+
+class GarageZone:
+    
+    def __init__(self, zoneName, firstSlot, slotCount, allowedTypes=None, threadSafe=False, placementPolicy=None):
+        self.zoneName = zoneName
+        self.firstSlot = firstSlot
+        self.slotCount = slotCount
+        self.allowedTypes = frozenset(allowedTypes) if allowedTypes is not None else None
+        self.freeRunIndex = FreeRunIndex(slotCount)
+        self.runRegistry = FreeRunRegistry(slotCount)
+        self.placementPolicy = createPlacementPolicy(placementPolicy or "firstFit")
+        self.zoneLock = threading.Lock() if threadSafe else nullcontext()
+    
+    def accepts(self, vehicleType):
+        return self.allowedTypes is None or vehicleType in self.allowedTypes
+    
+    def largestRun(self):
+        return self.freeRunIndex.largestRun()
+    
+    def searchRun(self, slotsNeeded):
+        position = self.placementPolicy.findRun(self, slotsNeeded)
+        if position is None:
+            return None
+        return self.firstSlot + position
+    
+    def claimRun(self, slotsNeeded, excludedSpans=()):
+        with self.zoneLock:
+            maskedPositions = self._maskSpans(excludedSpans) if excludedSpans else ()
+            firstSpace = self.searchRun(slotsNeeded)
+            for position in maskedPositions:
+                self.freeRunIndex.release(position)
+                self.runRegistry.releasePosition(position)
+            if firstSpace is None:
+                return None
+            for slotID in range(firstSpace, firstSpace + slotsNeeded):
+                self.freeRunIndex.occupy(slotID - self.firstSlot)
+            self.runRegistry.occupyRange(firstSpace - self.firstSlot, slotsNeeded)
+            return firstSpace
+    
+    def claimSlot(self, slotID):
+        with self.zoneLock:
+            self.freeRunIndex.occupy(slotID - self.firstSlot)
+            self.runRegistry.occupyRange(slotID - self.firstSlot, 1)
+    
+    def claimSlots(self, slotIDs):
+        with self.zoneLock:
+            if not all(self.freeRunIndex.isFree(slotID - self.firstSlot) for slotID in slotIDs):
+                return False
+            for slotID in slotIDs:
+                self.freeRunIndex.occupy(slotID - self.firstSlot)
+                self.runRegistry.occupyRange(slotID - self.firstSlot, 1)
+            return True
+    
+    def claimRuns(self, slotRuns):
+        with self.zoneLock:
+            self.freeRunIndex.occupyMany(
+                slotID - self.firstSlot for firstSlot, slotCount in slotRuns
+                for slotID in range(firstSlot, firstSlot + slotCount)
+            )
+            for firstSlot, slotCount in slotRuns:
+                self.runRegistry.occupyRange(firstSlot - self.firstSlot, slotCount)
+    
+    def _maskSpans(self, excludedSpans):
+        positions = [slotID - self.firstSlot for firstSlot, lastSlot in excludedSpans
+                     for slotID in range(firstSlot, lastSlot + 1)
+                     if self.freeRunIndex.isFree(slotID - self.firstSlot)]
+        for position in positions:
+            self.freeRunIndex.occupy(position)
+            self.runRegistry.occupyRange(position, 1)
+        return positions
+    
+    def searchRunExcluding(self, excludedSpans, slotsNeeded):
+        with self.zoneLock:
+            positions = {slotID - self.firstSlot for firstSlot, lastSlot in excludedSpans
+                         for slotID in range(firstSlot, lastSlot + 1)
+                         if self.freeRunIndex.isFree(slotID - self.firstSlot)}
+            self.freeRunIndex.occupyMany(positions)
+            position = self.freeRunIndex.findFirstRun(slotsNeeded)
+            self.freeRunIndex.releaseMany(positions)
+        return self.firstSlot + position if position is not None else None
+    
+    def isSlotFree(self, slotID):
+        return self.freeRunIndex.isFree(slotID - self.firstSlot)
+    
+    def releaseSlot(self, slotID):
+        with self.zoneLock:
+            self.freeRunIndex.release(slotID - self.firstSlot)
+            self.runRegistry.releasePosition(slotID - self.firstSlot)
+    
+    def fragmentationMetrics(self):
+        with self.zoneLock:
+            return {
+                "largestFreeRun": self.runRegistry.largestRun(),
+                "freeSlots": self.runRegistry.freeCount,
+                "runCount": self.runRegistry.runCount(),
+                "runHistogram": self.runRegistry.runHistogram()
+            }
+
+
 class SpaceAllocator:
     
-    def __init__(self, maximumCapacity=300):
+    def __init__(self, maximumCapacity=300, compactStorage=False, threadSafe=False, zones=None,
+                 placementPolicy="firstFit", clock=None):
         self.maximumCapacity = maximumCapacity
-        self.spaceCollection = {}
-        for i in range(1, maximumCapacity + 1):
-            self.spaceCollection[i] = ParkingSlot(i)
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.allocationLock = threading.Lock() if threadSafe else nullcontext()
+        if compactStorage:
+            self.spaceCollection = CompactSlotStore(maximumCapacity)
+        else:
+            self.spaceCollection = {}
+            for i in range(1, maximumCapacity + 1):
+                self.spaceCollection[i] = ParkingSlot(i)
+        self.placementPolicy = placementPolicy
+        self.zones = self._buildZones(zones, threadSafe)
+        self.zoneStarts = [zone.firstSlot for zone in self.zones]
+        self.zonesByType = {}
+        self.freeSlotCount = maximumCapacity
+        self.occupiedSlotsByType = {}
+        self.vehiclesByType = {}
+        self.plateIndex = {}
+        self.sortedPlates = []
+        self.heldSlots = set()
+    
+    def _buildZones(self, zoneDefinitions, threadSafe):
+        if zoneDefinitions is None:
+            zoneDefinitions = [("Main", self.maximumCapacity, None)]
+        if sum(slotCount for _, slotCount, _ in zoneDefinitions) != self.maximumCapacity:
+            raise ValueError("Zone sizes must add up to the garage capacity")
+        
+        zones = []
+        firstSlot = 1
+        for zoneName, slotCount, allowedTypes in zoneDefinitions:
+            zones.append(GarageZone(zoneName, firstSlot, slotCount, allowedTypes, threadSafe, self.placementPolicy))
+            firstSlot += slotCount
+        return zones
+    
+    def zonesForType(self, vehicleType):
+        candidateZones = self.zonesByType.get(vehicleType)
+        if candidateZones is None:
+            candidateZones = [zone for zone in self.zones if zone.accepts(vehicleType)]
+            self.zonesByType[vehicleType] = candidateZones
+        return candidateZones
+    
+    def zoneForSlot(self, slotID):
+        return self.zones[bisect_right(self.zoneStarts, slotID) - 1]
+    
+    def largestFreeRun(self, vehicleType=None):
+        zones = self.zones if vehicleType is None else self.zonesForType(vehicleType)
+        return max((zone.largestRun() for zone in zones), default=0)
+    
+    def fragmentationMetrics(self):
+        largestFreeRun = 0
+        freeSlots = 0
+        runCount = 0
+        runHistogram = {}
+        for zone in self.zones:
+            zoneMetrics = zone.fragmentationMetrics()
+            largestFreeRun = max(largestFreeRun, zoneMetrics["largestFreeRun"])
+            freeSlots += zoneMetrics["freeSlots"]
+            runCount += zoneMetrics["runCount"]
+            for length, count in zoneMetrics["runHistogram"].items():
+                runHistogram[length] = runHistogram.get(length, 0) + count
+        return {
+            "largestFreeRun": largestFreeRun,
+            "freeSlots": freeSlots,
+            "runCount": runCount,
+            "runHistogram": dict(sorted(runHistogram.items())),
+            "fragmentation": 1 - largestFreeRun / freeSlots if freeSlots else 0.0
+        }
     
     def availableSpaces(self):
-        count = 0
-        for slotID in self.spaceCollection:
-            if not self.spaceCollection[slotID].slotTaken:
-                count += 1
-        return count
+        return self.freeSlotCount
+    
+    def heldSpaces(self):
+        return len(self.heldSlots)
     
     def OccupiedSpaces(self):
-        return self.maximumCapacity - self.availableSpaces()
+        return self.maximumCapacity - self.freeSlotCount
+    
+    def occupiedSpacesByType(self, vehicleType):
+        return self.occupiedSlotsByType.get(vehicleType, 0)
+    
+    def vehicleCountByType(self, vehicleType):
+        return self.vehiclesByType.get(vehicleType, 0)
+    
+    def _recordSlotAssigned(self, vehicleType):
+        self.freeSlotCount -= 1
+        self.occupiedSlotsByType[vehicleType] = self.occupiedSlotsByType.get(vehicleType, 0) + 1
     
-    def searchFreeSpace(self, slotsNeeded=1):
+    def _recordSlotReleased(self, vehicleType):
+        self.freeSlotCount += 1
+        self.occupiedSlotsByType[vehicleType] -= 1
+    
+    def searchFreeSpace(self, slotsNeeded=1, vehicleType=None):
+        zones = self.zones if vehicleType is None else self.zonesForType(vehicleType)
+        for zone in zones:
+            if zone.largestRun() >= slotsNeeded:
+                return zone.searchRun(slotsNeeded)
+        return None
+    
+    def scanFreeSpace(self, slotsNeeded=1):
         continuousSlots = 0
         firstSpace = None
         
@@ -70,45 +358,171 @@ class SpaceAllocator:
         
         return None
     
-    def allocateSpace(self, vehicle):
+    def allocateSpace(self, vehicle, checkInTime=None, reservedSpans=None):
         slotsNeeded = vehicle.SpaceRequired()
-        firstSpace = self.searchFreeSpace(slotsNeeded)
-        
-        if firstSpace is None:
-            return None 
-        
-        reservedSlots = []
-        for i in range(slotsNeeded):
-            slotID = firstSpace + i
-            self.spaceCollection[slotID].assignSlot(vehicle)
-            reservedSlots.append(slotID)
+        checkInTime = checkInTime if checkInTime is not None else self.clock.now()
+        for zone in self.zonesForType(vehicle.VehicleType()):
+            if zone.largestRun() < slotsNeeded:
+                continue
+            firstSpace = zone.claimRun(slotsNeeded, reservedSpans.get(zone, ()) if reservedSpans else ())
+            if firstSpace is not None:
+                try:
+                    with self.allocationLock:
+                        return self._occupySlots(vehicle, range(firstSpace, firstSpace + slotsNeeded), checkInTime)
+                except Exception:
+                    for slotID in range(firstSpace, firstSpace + slotsNeeded):
+                        zone.releaseSlot(slotID)
+                    raise
+        return None
+    
+    def occupySlots(self, vehicle, slotIDs, checkInTime=None):
+        slotIDs = list(slotIDs)
+        checkInTime = checkInTime if checkInTime is not None else self.clock.now()
+        for slotID in slotIDs:
+            self.zoneForSlot(slotID).claimSlot(slotID)
+        with self.allocationLock:
+            return self._occupySlots(vehicle, slotIDs, checkInTime)
+    
+    def holdSlots(self, slotIDs):
+        if not self.zoneForSlot(slotIDs[0]).claimSlots(slotIDs):
+            return False
+        with self.allocationLock:
+            self.heldSlots.update(slotIDs)
+            self.freeSlotCount -= len(slotIDs)
+        return True
+    
+    def releaseHeldSlots(self, slotIDs):
+        with self.allocationLock:
+            self.heldSlots.difference_update(slotIDs)
+            self.freeSlotCount += len(slotIDs)
+        for slotID in slotIDs:
+            self.zoneForSlot(slotID).releaseSlot(slotID)
+    
+    def occupyHeldSlots(self, vehicle, slotIDs, checkInTime=None):
+        checkInTime = checkInTime if checkInTime is not None else self.clock.now()
+        with self.allocationLock:
+            self.heldSlots.difference_update(slotIDs)
+            self.freeSlotCount += len(slotIDs)
+            return self._occupySlots(vehicle, slotIDs, checkInTime)
+    
+    def restoreHeldSlots(self, slotIDs):
+        with self.allocationLock:
+            self._vacateSlots(slotIDs)
+            self.heldSlots.update(slotIDs)
+            self.freeSlotCount -= len(slotIDs)
+    
+    def occupyTickets(self, assignments):
+        now = self.clock.now()
+        assignments = [(vehicle, list(slotIDs), checkInTime if checkInTime is not None else now)
+                       for vehicle, slotIDs, checkInTime in assignments]
+        runsByZone = {}
+        for _, slotIDs, _ in assignments:
+            for slotID in slotIDs:
+                zoneRuns = runsByZone.setdefault(self.zoneForSlot(slotID), [])
+                if zoneRuns and zoneRuns[-1][0] + zoneRuns[-1][1] == slotID:
+                    zoneRuns[-1][1] += 1
+                else:
+                    zoneRuns.append([slotID, 1])
+        for zone, zoneRuns in runsByZone.items():
+            zone.claimRuns(zoneRuns)
+        with self.allocationLock:
+            return [self._occupySlots(vehicle, slotIDs, checkInTime) for vehicle, slotIDs, checkInTime in assignments]
+    
+    def _occupySlots(self, vehicle, slotIDs, checkInTime=None):
+        vehicleType = vehicle.VehicleType()
+        reservedSlots = list(slotIDs)
+        self._indexPlate(vehicle.PlateNumber(), reservedSlots)
+        for slotID in reservedSlots:
+            if self.spaceCollection[slotID].assignSlot(vehicle, checkInTime):
+                self._recordSlotAssigned(vehicleType)
+        self.vehiclesByType[vehicleType] = self.vehiclesByType.get(vehicleType, 0) + 1
         
         return reservedSlots
     
+    def _indexPlate(self, registrationNumber, slotIDs):
+        if registrationNumber in self.plateIndex:
+            self.plateIndex[registrationNumber].extend(slotIDs)
+        else:
+            insort(self.sortedPlates, registrationNumber)
+            self.plateIndex[registrationNumber] = list(slotIDs)
+    
+    def _unindexPlate(self, registrationNumber, slotIDs):
+        indexedSlots = self.plateIndex.get(registrationNumber)
+        if indexedSlots is None:
+            return
+        for slotID in slotIDs:
+            if slotID in indexedSlots:
+                indexedSlots.remove(slotID)
+        if not indexedSlots:
+            del self.plateIndex[registrationNumber]
+            position = bisect_left(self.sortedPlates, registrationNumber)
+            del self.sortedPlates[position]
+    
     def freeAllocatedSlots(self, assignedSlots):
+        with self.allocationLock:
+            vehicleInfo, checkInTime, releasedSlots = self._vacateSlots(assignedSlots)
+        
+        for slotID in releasedSlots:
+            self.zoneForSlot(slotID).releaseSlot(slotID)
+        
+        return vehicleInfo, checkInTime
+    
+    def _vacateSlots(self, assignedSlots):
         vehicleInfo = None
         checkInTime = None
+        releasedSlots = []
         
         for slotID in assignedSlots:
             if slotID in self.spaceCollection:
                 vehicle, entry = self.spaceCollection[slotID].releaseSlot()
                 if vehicle is not None:
+                    self._recordSlotReleased(vehicle.VehicleType())
+                    releasedSlots.append(slotID)
                     vehicleInfo = vehicle
                     checkInTime = entry
         
-        return vehicleInfo, checkInTime
+        if vehicleInfo is not None:
+            self.vehiclesByType[vehicleInfo.VehicleType()] -= 1
+            self._unindexPlate(vehicleInfo.PlateNumber(), releasedSlots)
+        return vehicleInfo, checkInTime, releasedSlots
     
     def searchVehicle(self, registrationNumber):
-        foundSpaces = []
-        for slotID in self.spaceCollection:
-            space = self.spaceCollection[slotID]
-            if space.slotTaken and space.vehicle.PlateNumber() == registrationNumber:
-                foundSpaces.append(slotID)
-        return foundSpaces if foundSpaces else None
+        with self.allocationLock:
+            foundSpaces = self.plateIndex.get(registrationNumber)
+            return list(foundSpaces) if foundSpaces else None
+    
+    def searchPlatePrefix(self, platePrefix):
+        with self.allocationLock:
+            return self._searchPlatePrefix(platePrefix)
+    
+    def _searchPlatePrefix(self, platePrefix):
+        matches = {}
+        position = bisect_left(self.sortedPlates, platePrefix)
+        while position < len(self.sortedPlates):
+            registrationNumber = self.sortedPlates[position]
+            if not registrationNumber.startswith(platePrefix):
+                break
+            matches[registrationNumber] = list(self.plateIndex[registrationNumber])
+            position += 1
+        return matches
+    
+    def searchPartialPlate(self, plateFragment):
+        with self.allocationLock:
+            matches = self._searchPlatePrefix(plateFragment)
+            for registrationNumber in self.sortedPlates:
+                if registrationNumber not in matches and plateFragment in registrationNumber:
+                    matches[registrationNumber] = list(self.plateIndex[registrationNumber])
+            return matches
     
     def generateStatusSummary(self):
         available = self.availableSpaces()
         occupied = self.OccupiedSpaces()
+        zoneSection = ""
+        if len(self.zones) > 1:
+            zoneSection = "\n        " + "".join(
+                f"\n        {zone.zoneName}: largest free run {zone.largestRun()} of {zone.slotCount}"
+                for zone in self.zones
+            )
         
         report = f"""
         ====== PARKING SPACE STATUS ======
@@ -116,6 +530,9 @@ class SpaceAllocator:
         Available: {available}
         Occupied: {occupied}
         Occupancy Rate: {(occupied/self.maximumCapacity)*100:.1f}%
+        
+        Cars: {self.vehicleCountByType('Car')} | Motorcycles: {self.vehicleCountByType('Motorcycle')}
+        Trucks: {self.vehicleCountByType('Truck')} | Buses: {self.vehicleCountByType('Bus')}{zoneSection}
         ==================================
         """
         return report
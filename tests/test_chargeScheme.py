@@ -0,0 +1,67 @@
+import random
+from datetime import datetime, timedelta
+import pytest
+from chargeScheme import ChargeController, SEGMENTED_PLAN_TITLE, billableHours
+
+
+MONDAY = datetime(2026, 1, 5)
+
+
+def integratedCost(controller, vehicleType, checkInTime, billedHours):
+    hourlyRates = controller.rateTable[vehicleType]
+    endTime = checkInTime + timedelta(hours=billedHours)
+    cost = 0.0
+    cursor = checkInTime
+    while cursor < endTime:
+        boundary = min(endTime, cursor.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1))
+        cost += hourlyRates[cursor.weekday() * 24 + cursor.hour] * (boundary - cursor).total_seconds() / 3600
+        cursor = boundary
+    return cost
+
+
+def test_segmented_cost_matches_hour_by_hour_integration():
+    controller = ChargeController(billingMode="segmented")
+    generator = random.Random(3)
+    for _ in range(500):
+        vehicleType = generator.choice(["Car", "Motorcycle", "Truck", "Bus"])
+        checkInTime = MONDAY + timedelta(minutes=generator.randrange(7 * 24 * 60), seconds=generator.randrange(60))
+        hoursParked = generator.random() * generator.choice([2, 30, 24 * 20])
+        fee, _ = controller.determineSegmentedCost(vehicleType, checkInTime, hoursParked)
+        assert fee == pytest.approx(integratedCost(controller, vehicleType, checkInTime, billableHours(hoursParked)),
+                                    abs=0.01)
+
+
+def test_segmented_plan_title():
+    controller = ChargeController(billingMode="segmented")
+    assert controller.determineSegmentedCost("Car", MONDAY + timedelta(hours=9), 2)[1] == "Peak Hour Pricing"
+    assert controller.determineSegmentedCost("Car", MONDAY + timedelta(hours=17), 2)[1] == SEGMENTED_PLAN_TITLE
+
+
+def test_checkout_mode_bills_the_exit_rate_for_every_hour():
+    controller = ChargeController()
+    assert controller.determineParkingCost("Bus", 2.5, MONDAY + timedelta(hours=9)) == (45.0, "Peak Hour Pricing")
+    assert controller.determineParkingCost("Car", 0.2, MONDAY + timedelta(days=5, hours=3)) == (6.0,
+                                                                                                 "Weekend Pricing")
+    assert controller.determineParkingCost("Car", 2, MONDAY + timedelta(hours=20),
+                                           MONDAY + timedelta(hours=18)) == (7.0, "Off-Peak Pricing")
+
+
+@pytest.mark.parametrize("billingMode", ["checkout", "segmented"])
+def test_batch_costs_match_single_costs(billingMode):
+    controller = ChargeController(billingMode=billingMode)
+    generator = random.Random(11)
+    vehicleTypes = [generator.choice(["Car", "Motorcycle", "Truck", "Bus"]) for _ in range(200)]
+    checkInTimes = [MONDAY + timedelta(minutes=generator.randrange(7 * 24 * 60)) for _ in range(200)]
+    checkOutTimes = [checkIn + timedelta(minutes=generator.randrange(1, 3000)) for checkIn in checkInTimes]
+    fees, planNames = controller.determineBatchParkingCost(vehicleTypes, checkOutTimes=checkOutTimes,
+                                                           checkInTimes=checkInTimes)
+    for vehicleType, checkIn, checkOut, fee, planName in zip(vehicleTypes, checkInTimes, checkOutTimes, fees,
+                                                             planNames):
+        hoursParked = (checkOut - checkIn).total_seconds() / 3600
+        assert (fee, planName) == pytest.approx(controller.determineParkingCost(vehicleType, hoursParked, checkOut,
+                                                                                checkIn))
+
+
+def test_unknown_billing_mode():
+    with pytest.raises(ValueError):
+        ChargeController(billingMode="hourly")
@@ -0,0 +1,74 @@
+import random
+import sys
+import threading
+import pytest
+from outputSink import NullSink
+from parkingSystem import GarageManager
+
+
+@pytest.fixture
+def fastSwitching():
+    previousInterval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    yield
+    sys.setswitchinterval(previousInterval)
+
+
+def test_threaded_churn_keeps_garage_invariants(fastSwitching):
+    garage = GarageManager(threadSafe=True, outputSink=NullSink(), maximumSlots=60)
+    threadCount, operationsPerThread = 8, 250
+    issuedTickets = []
+    settledCount = [0]
+    resultsLock = threading.Lock()
+    startSignal = threading.Event()
+    
+    def worker(workerNumber):
+        generator = random.Random(workerNumber)
+        parked = []
+        startSignal.wait()
+        for operation in range(operationsPerThread):
+            if parked and generator.random() < 0.45:
+                plate = parked.pop(generator.randrange(len(parked)))
+                assert garage.handleCheckOut(plate) is not None
+                assert garage.paymentProcess(plate)
+                with resultsLock:
+                    settledCount[0] += 1
+            else:
+                plate = f"T{workerNumber}-{operation}"
+                ticket = garage.handleCheckIn(generator.choice(["Car", "Motorcycle", "Truck", "Bus"]), plate)
+                if ticket is not None:
+                    parked.append(plate)
+                    with resultsLock:
+                        issuedTickets.append(ticket)
+    
+    workers = [threading.Thread(target=worker, args=(number,)) for number in range(threadCount)]
+    for thread in workers:
+        thread.start()
+    startSignal.set()
+    for thread in workers:
+        thread.join()
+    
+    allocator = garage.slotCoordinator
+    slotOwners = {}
+    for ticket in garage.currentReceipts.values():
+        for slotID in ticket.assignedSlots:
+            assert slotID not in slotOwners, f"slot {slotID} assigned twice"
+            slotOwners[slotID] = ticket.registrationNumber
+            assert allocator.spaceCollection[slotID].vehicle is ticket.vehicle
+        assert allocator.searchVehicle(ticket.registrationNumber) == ticket.assignedSlots
+    assert sum(slot.slotTaken for slot in allocator.spaceCollection.values()) == len(slotOwners)
+    
+    assert allocator.OccupiedSpaces() == len(slotOwners)
+    assert allocator.availableSpaces() == allocator.maximumCapacity - len(slotOwners)
+    assert sum(zone.runRegistry.freeCount for zone in allocator.zones) == allocator.availableSpaces()
+    for vehicleType in ("Car", "Motorcycle", "Truck", "Bus"):
+        openTickets = [ticket for ticket in garage.currentReceipts.values() if ticket.vehicleType == vehicleType]
+        assert allocator.vehicleCountByType(vehicleType) == len(openTickets)
+        assert allocator.occupiedSpacesByType(vehicleType) == sum(len(ticket.assignedSlots) for ticket in openTickets)
+    
+    assert len({ticket.tokenNumber for ticket in issuedTickets}) == len(issuedTickets)
+    assert len(issuedTickets) == settledCount[0] + len(garage.currentReceipts)
+    assert len(garage.ticketHistory) == settledCount[0]
+    dailyTotals = list(garage.dailyStatistics.values())
+    assert sum(totals["entries"] for totals in dailyTotals) == len(issuedTickets)
+    assert sum(totals["exits"] for totals in dailyTotals) == settledCount[0]
@@ -0,0 +1,61 @@
+import threading
+import time
+from garageMetrics import LatencyHistogram, MetricsRegistry
+from outputSink import NullSink
+from parkingSystem import GarageManager
+
+
+def test_concurrent_observations_are_not_lost(monkeypatch):
+    def interleavingObserve(histogram, seconds):
+        observationCount = histogram.observationCount
+        time.sleep(0)
+        histogram.observationCount = observationCount + 1
+        histogram.bucketCounts[0] += 1
+    monkeypatch.setattr(LatencyHistogram, "observe", interleavingObserve)
+    
+    registry = MetricsRegistry(enabled=True)
+    threadCount, observations = 8, 500
+    
+    def observe():
+        for _ in range(observations):
+            registry.observeStage("checkin", "allocateSpace", 0.00002)
+    workers = [threading.Thread(target=observe) for _ in range(threadCount)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    
+    histogram = registry.stageHistograms[("checkin", "allocateSpace")]
+    assert histogram.observationCount == threadCount * observations
+    assert histogram.bucketCounts[0] == threadCount * observations
+
+
+def test_disabled_registry_records_nothing():
+    garage = GarageManager(outputSink=NullSink())
+    garage.handleCheckIn("car", "M-1")
+    snapshot = garage.metrics.metricsSnapshot()
+    assert snapshot == {"operations": {}, "stages": {}, "counters": {}}
+
+
+def test_threadsafe_garage_counts_every_operation():
+    garage = GarageManager(outputSink=NullSink(), threadSafe=True, maximumSlots=400,
+                           metrics=MetricsRegistry(enabled=True))
+    
+    def cycle(worker):
+        for number in range(50):
+            plate = f"M-{worker}-{number}"
+            garage.handleCheckIn("car", plate)
+            garage.handleCheckOut(plate)
+            garage.paymentProcess(plate)
+    workers = [threading.Thread(target=cycle, args=(worker,)) for worker in range(6)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    
+    operations = garage.metrics.metricsSnapshot()["operations"]
+    assert {name: totals["count"] for name, totals in operations.items()} == \
+        {"checkin": 300, "checkout": 300, "payment": 300}
+    exported = garage.metrics.exportPrometheus()
+    assert 'garage_operation_seconds_count{operation="checkin"} 300' in exported
+    assert 'garage_operations_total{operation="payment",outcome="ok"} 300' in exported
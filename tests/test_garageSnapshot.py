@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+import pytest
+from garageClock import VirtualClock
+from garageSnapshot import GarageSnapshot
+from outputSink import NullSink
+from parkingSystem import GarageManager
+
+
+START = datetime(2026, 1, 5, 7, 0)
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock(START)
+
+
+def populatedGarage(clock):
+    garage = GarageManager(outputSink=NullSink(), clock=clock, maximumSlots=120)
+    for number in range(40):
+        garage.buyMonthlySubscription(f"M-{number}", "Car")
+        garage.buyOneTimeTicket(f"D-{number}", "Bus")
+    clock.advance(timedelta(hours=1))
+    for number in range(30):
+        garage.handleCheckIn(("Car", "Bus", "Truck")[number % 3], f"D-{number}")
+    for number in range(0, 30, 4):
+        garage.handleCheckOut(f"D-{number}")
+    garage.handleCheckIn("Car", "ZÖ-ü 7")
+    return garage
+
+
+def ticketState(garage):
+    return sorted(
+        (plate, ticket.tokenNumber, ticket.vehicleType, ticket.assignedSlots, ticket.checkInTime,
+         ticket.checkOutTime, ticket.parkingCharge, ticket.pricingPlan, ticket.paymentStatus)
+        for plate, ticket in garage.currentReceipts.items()
+    )
+
+
+def test_round_trip_restores_tickets_slots_and_counters(clock, tmp_path):
+    garage = populatedGarage(clock)
+    path = str(tmp_path / "garage.snap")
+    garage.saveBinarySnapshot(path)
+    
+    standby = GarageManager(outputSink=NullSink(), clock=clock, maximumSlots=120)
+    standby.loadBinarySnapshot(path)
+    assert ticketState(standby) == ticketState(garage)
+    allocator, restoredAllocator = garage.slotCoordinator, standby.slotCoordinator
+    assert restoredAllocator.availableSpaces() == allocator.availableSpaces()
+    assert restoredAllocator.largestFreeRun() == allocator.largestFreeRun()
+    assert restoredAllocator.searchVehicle("ZÖ-ü 7") == allocator.searchVehicle("ZÖ-ü 7")
+    assert (standby.monthlyIDCounter, standby.singleIDCounter) == (garage.monthlyIDCounter, garage.singleIDCounter)
+    
+    standby.paymentProcess("D-0")
+    assert "D-0" not in standby.currentReceipts
+    newTicket = standby.handleCheckIn("Car", "NEW-1")
+    assert newTicket.tokenNumber > max(ticket.tokenNumber for ticket in garage.currentReceipts.values())
+    standby.close()
+
+
+def test_permits_are_faulted_in_lazily(clock, tmp_path):
+    garage = populatedGarage(clock)
+    path = str(tmp_path / "garage.snap")
+    garage.saveBinarySnapshot(path)
+    
+    standby = GarageManager(outputSink=NullSink(), clock=clock, maximumSlots=120)
+    standby.loadBinarySnapshot(path)
+    assert not standby.monthlyPermits.permits
+    assert standby.verifyMonthlySubscription("M-5")
+    assert not standby.verifyMonthlySubscription("NOBODY")
+    assert list(standby.monthlyPermits.permits) == ["M-5"]
+    assert standby.checkDayPass("D-35") == garage.checkDayPass("D-35")
+    assert standby.checkDayPass("D-1") == garage.checkDayPass("D-1")
+    
+    assert len(standby.monthlyPermits) == len(garage.monthlyPermits) == 40
+    assert sorted(permit.permitID for permit in standby.singlePermits.values()) == \
+        sorted(permit.permitID for permit in garage.singlePermits.values())
+    standby.close()
+
+
+def test_snapshot_reader_lookups(clock, tmp_path):
+    garage = populatedGarage(clock)
+    path = str(tmp_path / "garage.snap")
+    garage.saveBinarySnapshot(path)
+    
+    with GarageSnapshot(path) as snapshot:
+        assert snapshot.ticketCount == len(garage.currentReceipts)
+        assert snapshot.occupiedSlotCount() == garage.slotCoordinator.OccupiedSpaces()
+        ticket = garage.currentReceipts["D-3"]
+        record = snapshot.findTicket("D-3")
+        assert record[0] == ticket.tokenNumber and record[3] == ticket.assignedSlots
+        assert snapshot.ticketForSlot(ticket.assignedSlots[-1]) == record
+        assert snapshot.findTicket("NOBODY") is None
+        assert snapshot.findPermit("monthly", "M-39")[0] == garage.monthlyPermits.get("M-39").permitID
+
+
+def test_rejects_foreign_files_and_mismatched_garages(clock, tmp_path):
+    foreign = tmp_path / "foreign.snap"
+    foreign.write_bytes(b"not a garage snapshot" * 10)
+    with pytest.raises(ValueError, match="not a garage snapshot"):
+        GarageSnapshot(str(foreign))
+    short = tmp_path / "short.snap"
+    short.write_bytes(b"GAR")
+    with pytest.raises(ValueError, match="too short"):
+        GarageSnapshot(str(short))
+    
+    garage = populatedGarage(clock)
+    path = str(tmp_path / "garage.snap")
+    garage.saveBinarySnapshot(path)
+    with pytest.raises(ValueError, match="empty garage"):
+        garage.loadBinarySnapshot(path)
+    with pytest.raises(ValueError, match="120 spaces"):
+        GarageManager(outputSink=NullSink(), clock=clock, maximumSlots=300).loadBinarySnapshot(path)
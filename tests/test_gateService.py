@@ -0,0 +1,95 @@
+import asyncio
+import json
+import pytest
+from gateService import GateService
+from outputSink import NullSink
+from parkingSystem import GarageManager
+
+
+@pytest.fixture
+def service():
+    return GateService(GarageManager(outputSink=NullSink()))
+
+
+def test_checkin_checkout_and_payment(service):
+    checkIn = service.handleRequest({"op": "checkin", "type": "Car", "plate": "G-1"})
+    assert checkIn["ok"] and checkIn["slots"] == [1]
+    assert service.handleRequest({"op": "track", "plate": "G-1"}) == {"ok": True, "slots": [1]}
+    checkOut = service.handleRequest({"op": "checkout", "plate": "G-1"})
+    assert checkOut["ok"] and checkOut["token"] == checkIn["token"]
+    assert service.handleRequest({"op": "payment", "plate": "G-1"}) == {"ok": True}
+    assert service.handleRequest({"op": "capacity"})["available"] == 300
+
+
+@pytest.mark.parametrize("request_", [
+    {"op": "checkin", "type": "Bus", "plate": 123},
+    {"op": "checkin", "type": "Car", "plate": None},
+    {"op": "checkin", "type": "Car", "plate": "  "},
+    {"op": "checkin", "type": 5, "plate": "G-2"},
+    {"op": "checkin", "type": "Hovercraft", "plate": "G-2"},
+    {"op": "checkout", "plate": ["G-2"]},
+    {"op": "payment", "plate": {}},
+    {"op": "track", "plate": 7},
+])
+def test_invalid_fields_are_refused_without_claiming_slots(service, request_):
+    response = service.handleRequest(request_)
+    assert response["ok"] is False
+    assert "error" in response
+    assert service.handleRequest({"op": "capacity"})["available"] == 300
+    assert not service.garage.currentReceipts
+
+
+def test_malformed_requests(service):
+    assert service.dispatch(b"not json")["ok"] is False
+    assert service.dispatch(b"[1, 2]")["ok"] is False
+    assert service.handleRequest({"op": "launch"})["ok"] is False
+    assert service.handleRequest({"op": "checkin", "type": "Car"}) == {"ok": False, "error": "Missing field 'plate'"}
+
+
+def test_unexpected_failure_is_reported_and_releases_slots(service, monkeypatch):
+    def failingJournal(eventType, payload):
+        raise OSError("disk full")
+    monkeypatch.setattr(service.garage, "_journalEvent", failingJournal)
+    
+    response = service.handleRequest({"op": "checkin", "type": "Bus", "plate": "G-3"})
+    assert response == {"ok": False, "error": "Request failed: OSError"}
+    allocator = service.garage.slotCoordinator
+    assert allocator.availableSpaces() == 300
+    assert allocator.largestFreeRun() == 300
+    assert allocator.searchVehicle("G-3") is None
+    assert "G-3" not in service.garage.currentReceipts
+
+
+def test_connection_survives_bad_requests(service):
+    async def exchange():
+        await service.start()
+        try:
+            reader, writer = await asyncio.open_connection(service.host, service.port)
+            responses = []
+            for request in ({"op": "checkin", "type": "Bus", "plate": 123},
+                            {"op": "checkin", "type": 5, "plate": "G-4"},
+                            {"op": "checkin", "type": "Car", "plate": "G-4"}):
+                writer.write(json.dumps(request).encode() + b"\n")
+                await writer.drain()
+                responses.append(json.loads(await reader.readline()))
+            writer.close()
+            await writer.wait_closed()
+            return responses
+        finally:
+            await service.stop()
+    
+    responses = asyncio.run(exchange())
+    assert [response["ok"] for response in responses] == [False, False, True]
+    assert responses[2]["slots"] == [1]
+
+
+def test_garage_releases_claimed_run_when_indexing_fails():
+    garage = GarageManager(outputSink=NullSink())
+    garage.handleCheckIn("car", "G-5")
+    for plate in (123, None):
+        with pytest.raises(TypeError):
+            garage.handleCheckIn("bus", plate)
+    allocator = garage.slotCoordinator
+    assert allocator.availableSpaces() == 299
+    assert allocator.largestFreeRun() == 299
+    assert allocator.sortedPlates == ["G-5"]
@@ -0,0 +1,66 @@
+import pytest
+from outputSink import NullSink
+from parkingSystem import GarageManager
+
+
+@pytest.fixture
+def garage():
+    return GarageManager(outputSink=NullSink())
+
+
+def writeCSV(tmp_path, text):
+    csvPath = tmp_path / "permits.csv"
+    csvPath.write_text(text)
+    return str(csvPath)
+
+
+def test_import_with_header(garage, tmp_path):
+    csvPath = writeCSV(tmp_path, "Kind,Plate,Type\nmonthly,F-1,Car\nday pass,F-2,Bus\n")
+    assert garage.importPermitsFromCSV(csvPath) == 2
+    assert garage.verifyMonthlySubscription("F-1")
+    assert garage.checkDayPass("F-2")
+
+
+def test_import_without_header(garage, tmp_path):
+    csvPath = writeCSV(tmp_path, "F-3,Car,mp\n")
+    assert garage.importPermitsFromCSV(csvPath) == 1
+    assert garage.verifyMonthlySubscription("F-3")
+
+
+@pytest.mark.parametrize("header, missingColumn", [
+    ("plate,kind\n", "vehicletype"),
+    ("plate,type\n", "passtype"),
+])
+def test_missing_header_column_is_reported(garage, tmp_path, header, missingColumn):
+    csvPath = writeCSV(tmp_path, header + "F-4,Car\n")
+    with pytest.raises(ValueError, match=f"no {missingColumn} column"):
+        garage.importPermitsFromCSV(csvPath)
+    assert len(garage.monthlyPermits) == 0
+
+
+def test_unknown_pass_kind_is_rejected(garage):
+    with pytest.raises(ValueError, match="Unrecognized pass kind"):
+        garage.importPermits([("F-5", "Car", "lifetime")])
+
+
+def test_vehicle_type_is_normalised(garage):
+    garage.importPermits([("F-6", "bus", "monthly"), ("F-7", " MOTORCYCLE ", "day pass")])
+    assert garage.monthlyPermits["F-6"].vehicleType == "Bus"
+    assert garage.monthlyPermits["F-6"].purchaseAmount() == 300.00
+    assert garage.singlePermits["F-7"].vehicleType == "Motorcycle"
+
+
+@pytest.mark.parametrize("rows, message", [
+    ([("F-8", "Car", "monthly"), ("F-9", "Hovercraft", "monthly")], "row 2: Unrecognized vehicle category"),
+    ([("F-10", "Car")], "row 1: expected plate, vehicle type and pass kind"),
+])
+def test_bad_rows_are_rejected(garage, rows, message):
+    with pytest.raises(ValueError, match=message):
+        garage.importPermits(rows)
+    assert len(garage.monthlyPermits) == 0
+
+
+def test_short_csv_row_is_reported(garage, tmp_path):
+    csvPath = writeCSV(tmp_path, "plate,type,kind\nF-11,Car,monthly\nF-12,Car\n")
+    with pytest.raises(ValueError, match="row 2: expected"):
+        garage.importPermitsFromCSV(csvPath)
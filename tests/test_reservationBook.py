@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta
+import pytest
+from garageClock import VirtualClock
+from outputSink import NullSink
+from parkingSystem import GarageManager
+from reservationBook import Reservation, ZoneSchedule
+
+
+START = datetime(2026, 3, 2, 8, 0)
+
+
+def reservationGarage(maximumSlots=10, zones=None):
+    clock = VirtualClock(START)
+    garage = GarageManager(outputSink=NullSink(), clock=clock, reservations=True, maximumSlots=maximumSlots,
+                           zones=zones)
+    return garage, clock
+
+
+def test_overlapping_bookings_get_disjoint_slots_and_later_ones_reuse_them():
+    garage, _ = reservationGarage()
+    first = garage.reserveSpace("R-1", "Bus", START + timedelta(hours=3), START + timedelta(hours=5))
+    second = garage.reserveSpace("R-2", "Bus", START + timedelta(hours=4), START + timedelta(hours=6))
+    later = garage.reserveSpace("R-3", "Bus", START + timedelta(hours=5), START + timedelta(hours=7))
+    assert first.slotIDs == [1, 2, 3]
+    assert second.slotIDs == [4, 5, 6]
+    assert later.slotIDs == [1, 2, 3]
+    assert garage.reserveSpace("R-4", "Bus", START + timedelta(hours=4), START + timedelta(hours=5)).slotIDs == \
+        [7, 8, 9]
+    assert garage.reserveSpace("R-5", "Car", START + timedelta(hours=4), START + timedelta(hours=5)).slotIDs == [10]
+    assert garage.reserveSpace("R-6", "Car", START + timedelta(hours=4), START + timedelta(hours=5)) is None
+
+
+def test_booking_fills_a_gap_between_reserved_spans():
+    garage, _ = reservationGarage()
+    window = (START + timedelta(hours=3), START + timedelta(hours=4))
+    for plate in ("G-1", "G-2", "G-3"):
+        garage.reserveSpace(plate, "Car", *window)
+    garage.cancelReservation("G-2")
+    assert garage.reserveSpace("G-4", "Car", *window).slotIDs == [2]
+    assert garage.reserveSpace("G-5", "Truck", *window).slotIDs == [4, 5]
+
+
+def test_invalid_and_duplicate_bookings():
+    garage, _ = reservationGarage()
+    with pytest.raises(ValueError):
+        garage.reserveSpace("I-1", "Car", START + timedelta(hours=2), START + timedelta(hours=1))
+    assert garage.reserveSpace("I-1", "Hovercraft", START + timedelta(hours=1), START + timedelta(hours=2)) is None
+    assert garage.reserveSpace("I-1", "Car", START - timedelta(hours=2), START - timedelta(hours=1)) is None
+    assert garage.reserveSpace("I-1", "Car", START + timedelta(hours=1), START + timedelta(hours=2))
+    assert garage.reserveSpace("I-1", "Car", START + timedelta(hours=3), START + timedelta(hours=4)) is None
+
+
+def test_imminent_booking_is_held_around_parked_vehicles():
+    garage, _ = reservationGarage()
+    garage.handleCheckIn("car", "P-1")
+    reservation = garage.reserveSpace("H-1", "Truck", START + timedelta(minutes=10), START + timedelta(hours=1))
+    assert reservation.status == "held"
+    assert reservation.slotIDs == [2, 3]
+    assert garage.slotCoordinator.heldSpaces() == 2
+    assert garage.handleCheckIn("truck", "H-1").assignedSlots == [2, 3]
+    assert garage.slotCoordinator.heldSpaces() == 0
+
+
+def test_pending_hold_is_retried_only_when_a_release_can_satisfy_it():
+    garage, clock = reservationGarage(maximumSlots=6, zones=[("Cars", 3, ["Car"]), ("Buses", 3, ["Bus"])])
+    book = garage.reservationBook
+    garage.handleCheckIn("bus", "B-1")
+    garage.handleCheckIn("car", "C-1")
+    reservation = garage.reserveSpace("W-1", "Bus", START + timedelta(hours=2), START + timedelta(hours=3))
+    clock.advance(timedelta(hours=1, minutes=40))
+    book.processDue(clock.now())
+    assert reservation.reservationID in book.pendingHolds
+    
+    activations = []
+    activate = book._activate
+    book._activate = lambda pending: activations.append(pending.reservationID) or activate(pending)
+    garage.handleCheckOut("C-1")
+    garage.paymentProcess("C-1")
+    assert activations == []
+    assert reservation.status == "booked"
+    
+    garage.handleCheckOut("B-1")
+    garage.paymentProcess("B-1")
+    assert activations == [reservation.reservationID]
+    assert reservation.status == "held"
+    assert not book.pendingHolds
+
+
+def test_unheld_booking_is_displaced_after_grace_period():
+    garage, clock = reservationGarage(maximumSlots=3)
+    garage.handleCheckIn("car", "D-2")
+    reservation = garage.reserveSpace("D-1", "Bus", START + timedelta(hours=2), START + timedelta(hours=3))
+    clock.advance(timedelta(hours=2, minutes=20))
+    garage.reservationBook.processDue(clock.now())
+    assert reservation.status == "displaced"
+    assert garage.reservationBook.reservationMetrics()["open"] == 0
+
+
+def test_walk_ins_leave_booked_slots_free_for_their_stay():
+    garage, clock = reservationGarage(maximumSlots=5)
+    bookingStart = START + timedelta(days=1, hours=1)
+    reservation = garage.reserveSpace("B-1", "Bus", bookingStart, bookingStart + timedelta(hours=3))
+    assert reservation.slotIDs == [1, 2, 3]
+    assert garage.handleCheckIn("car", "E-1").assignedSlots == [1]
+    garage.handleCheckOut("E-1")
+    garage.paymentProcess("E-1")
+    
+    clock.advance(timedelta(days=1))
+    assert [garage.handleCheckIn("car", f"W-{index}") for index in range(3)][2] is None
+    assert sorted(slotID for plate in ("W-0", "W-1") for slotID in garage.currentReceipts[plate].assignedSlots) == \
+        [4, 5]
+    
+    clock.advance(timedelta(hours=1, minutes=20))
+    assert garage.handleCheckIn("bus", "B-1").assignedSlots == [1, 2, 3]
+    assert garage.reservationBook.reservationMetrics()["displaced"] == 0
+
+
+def test_schedule_window_shrinks_when_long_booking_is_removed():
+    schedule = ZoneSchedule()
+    longBooking = Reservation(1, "L-1", "Car", [1], START, START + timedelta(days=7))
+    shortBookings = [Reservation(2 + index, f"S-{index}", "Car", [2 + index], START + timedelta(hours=index),
+                                 START + timedelta(hours=index + 2)) for index in range(3)]
+    for reservation in [longBooking] + shortBookings:
+        schedule.add(reservation)
+    assert schedule.longestDuration == timedelta(days=7)
+    
+    schedule.remove(longBooking)
+    assert schedule.longestDuration == timedelta(hours=2)
+    assert schedule.reservedSpans(START + timedelta(hours=2, minutes=30), START + timedelta(hours=3)) == [(3, 3), (4, 4)]
+    for reservation in shortBookings:
+        schedule.remove(reservation)
+    assert schedule.longestDuration == timedelta(0)
+
+
+def test_failed_reserved_check_in_keeps_the_booking(monkeypatch):
+    garage, _ = reservationGarage(maximumSlots=4)
+    reservation = garage.reserveSpace("R-1", "Truck", START + timedelta(minutes=10), START + timedelta(hours=2))
+    assert reservation.status == "held"
+    
+    def failingJournal(eventType, payload):
+        raise OSError("journal unavailable")
+    monkeypatch.setattr(garage, "_journalEvent", failingJournal)
+    with pytest.raises(OSError):
+        garage.handleCheckIn("truck", "R-1")
+    monkeypatch.undo()
+    
+    assert reservation.status == "held"
+    assert "R-1" not in garage.currentReceipts
+    assert garage.slotCoordinator.heldSpaces() == 2
+    assert garage.slotCoordinator.availableSpaces() == 2
+    assert garage.slotCoordinator.searchVehicle("R-1") is None
+    assert garage.reservationBook.reservationMetrics()["fulfilled"] == 0
+    assert garage._dailyTotals(START.date())["entries"] == 0
+    
+    assert garage.handleCheckIn("car", "W-1").assignedSlots[0] not in reservation.slotIDs
+    assert garage.handleCheckIn("truck", "R-1").assignedSlots == reservation.slotIDs
+    assert garage.slotCoordinator.heldSpaces() == 0
+    assert garage.reservationBook.reservationMetrics()["fulfilled"] == 1
+    assert garage._dailyTotals(START.date())["entries"] == 2
@@ -0,0 +1,33 @@
+import pytest
+from siteCoordinator import SiteCoordinator
+
+
+@pytest.fixture
+def coordinator():
+    with SiteCoordinator([("North", (0, 0), 4), ("South", (10, 0), 4)]) as siteCoordinator:
+        yield siteCoordinator
+
+
+def test_checkin_routes_to_nearest_site_with_room(coordinator):
+    first = coordinator.checkIn("Bus", "C-1", origin=(1, 0))
+    assert first["ok"] and first["site"] == "North"
+    second = coordinator.checkIn("Bus", "C-2", origin=(1, 0))
+    assert second["ok"] and second["site"] == "South"
+    assert coordinator.checkIn("Bus", "C-3", origin=(1, 0))["ok"] is False
+    assert coordinator.routeVehicle("Bus", 3, (1, 0)) is None
+
+
+def test_tokens_are_unique_across_sites(coordinator):
+    north = coordinator.checkIn("Car", "C-4", origin=(0, 0))
+    south = coordinator.checkIn("Car", "C-5", origin=(10, 0))
+    assert (north["site"], south["site"]) == ("North", "South")
+    assert north["token"] != south["token"]
+
+
+def test_checkout_and_payment_follow_the_plate(coordinator):
+    checkIn = coordinator.checkIn("Car", "C-6", origin=(10, 0))
+    checkOut = coordinator.checkOut("C-6")
+    assert checkOut["ok"] and checkOut["site"] == checkIn["site"] and checkOut["token"] == checkIn["token"]
+    assert coordinator.payment("C-6")["ok"]
+    assert coordinator.locateVehicle("C-6") == {}
+    assert coordinator.fleetOccupancy()["available"] == 8
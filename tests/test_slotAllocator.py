@@ -0,0 +1,95 @@
+import random
+import pytest
+from placementPolicy import PLACEMENT_POLICIES
+from slotAllocator import FreeRunIndex, SpaceAllocator
+from vehicle import Bike, Bus, Car, Track
+
+
+ZONES = [("Compact", 20, ["Car", "Motorcycle"]), ("Coach", 30, ["Bus", "Truck"]), ("General", 50, None)]
+
+
+def freeRuns(allocator, zone):
+    runs = []
+    runStart = None
+    for slotID in range(zone.firstSlot, zone.firstSlot + zone.slotCount + 1):
+        free = slotID < zone.firstSlot + zone.slotCount and not allocator.spaceCollection[slotID].slotTaken \
+            and slotID not in allocator.heldSlots
+        if free and runStart is None:
+            runStart = slotID
+        elif not free and runStart is not None:
+            runs.append((runStart, slotID - runStart))
+            runStart = None
+    return runs
+
+
+@pytest.mark.parametrize("placementPolicy", sorted(PLACEMENT_POLICIES))
+def test_random_churn_keeps_zone_indexes_consistent(placementPolicy):
+    allocator = SpaceAllocator(100, zones=ZONES, placementPolicy=placementPolicy)
+    generator = random.Random(5)
+    parked = []
+    for step in range(2000):
+        if parked and generator.random() < 0.45:
+            allocator.freeAllocatedSlots(parked.pop(generator.randrange(len(parked))))
+            continue
+        vehicle = generator.choice([Car, Bike, Track, Bus])(f"Z-{step}")
+        slotIDs = allocator.allocateSpace(vehicle)
+        if slotIDs is None:
+            assert all(zone.largestRun() < vehicle.SpaceRequired()
+                       for zone in allocator.zonesForType(vehicle.VehicleType()))
+            continue
+        zone = allocator.zoneForSlot(slotIDs[0])
+        assert zone.accepts(vehicle.VehicleType())
+        assert slotIDs == list(range(slotIDs[0], slotIDs[0] + vehicle.SpaceRequired()))
+        assert allocator.zoneForSlot(slotIDs[-1]) is zone
+        parked.append(slotIDs)
+        
+        for zone in allocator.zones:
+            runs = freeRuns(allocator, zone)
+            assert zone.largestRun() == max((length for _, length in runs), default=0)
+            assert zone.runRegistry.freeCount == sum(length for _, length in runs)
+    assert allocator.OccupiedSpaces() == sum(len(slotIDs) for slotIDs in parked)
+
+
+def test_first_fit_matches_a_linear_scan():
+    allocator = SpaceAllocator(100, zones=ZONES)
+    generator = random.Random(8)
+    parked = []
+    for step in range(1000):
+        if parked and generator.random() < 0.4:
+            allocator.freeAllocatedSlots(parked.pop(generator.randrange(len(parked))))
+            continue
+        vehicle = generator.choice([Car, Track, Bus])(f"F-{step}")
+        expected = None
+        for zone in allocator.zonesForType(vehicle.VehicleType()):
+            candidates = [start for start, length in freeRuns(allocator, zone) if length >= vehicle.SpaceRequired()]
+            if candidates:
+                expected = candidates[0]
+                break
+        slotIDs = allocator.allocateSpace(vehicle)
+        assert (slotIDs[0] if slotIDs else None) == expected
+        if slotIDs:
+            parked.append(slotIDs)
+
+
+def test_bulk_occupancy_matches_single_updates():
+    generator = random.Random(2)
+    for capacity in (1, 7, 100, 1000):
+        single, bulk = FreeRunIndex(capacity), FreeRunIndex(capacity)
+        positions = generator.sample(range(capacity), capacity // 3)
+        for position in positions:
+            single.occupy(position)
+        bulk.occupyMany(positions)
+        assert (single.prefixRun, single.suffixRun, single.longestRun) == \
+            (bulk.prefixRun, bulk.suffixRun, bulk.longestRun)
+        released = positions[::2]
+        for position in released:
+            single.release(position)
+        bulk.releaseMany(released)
+        assert single.longestRun == bulk.longestRun
+
+
+def test_zone_definitions_must_cover_the_garage():
+    with pytest.raises(ValueError):
+        SpaceAllocator(100, zones=[("Only", 60, None)])
+    assert SpaceAllocator(100, zones=ZONES).zoneForSlot(21).zoneName == "Coach"
+    assert [zone.zoneName for zone in SpaceAllocator(100, zones=ZONES).zonesForType("Bus")] == ["Coach", "General"]
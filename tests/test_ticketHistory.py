@@ -0,0 +1,98 @@
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from garageClock import VirtualClock
+from outputSink import NullSink
+from parkingSystem import GarageManager
+from ticketHistory import TicketHistoryStore
+
+
+START = datetime(2026, 3, 2, 8, 0)
+
+
+def settledTicket(token, checkOutMinutes, fee=10.0, vehicleType="Car"):
+    return SimpleNamespace(
+        tokenNumber=token,
+        registrationNumber=f"H-{token}",
+        vehicleType=vehicleType,
+        checkInTime=START,
+        checkOutTime=START + timedelta(minutes=checkOutMinutes),
+        parkingCharge=fee,
+        pricingPlan="Standard Rate"
+    )
+
+
+def expectedTokens(tickets, startTime, endTime):
+    return sorted(ticket.tokenNumber for ticket in tickets if startTime <= ticket.checkOutTime < endTime)
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_out_of_order_settles_keep_segments_indexed(tmp_path, spill):
+    history = TicketHistoryStore(segmentSize=50, spillDirectory=str(tmp_path) if spill else None)
+    randomizer = random.Random(7)
+    tickets = [settledTicket(token, minute + randomizer.randint(-30, 0)) for token, minute in
+               enumerate(range(60, 260))]
+    for ticket in tickets:
+        history.appendTicket(ticket)
+    
+    assert len(history) == len(tickets)
+    for segment in history.segments():
+        checkOutColumn = list(segment.columns["checkOut"])
+        assert checkOutColumn == sorted(checkOutColumn)
+    
+    startTime, endTime = START + timedelta(minutes=90), START + timedelta(minutes=150)
+    assert sorted(row[0] for row in history.ticketsBetween(startTime, endTime)) == \
+        expectedTokens(tickets, startTime, endTime)
+    hourly = history.aggregate(startTime, endTime, "hour")
+    assert sum(totals["tickets"] for totals in hourly.values()) == len(expectedTokens(tickets, startTime, endTime))
+    history.close()
+
+
+def test_garage_history_survives_out_of_order_payment():
+    clock = VirtualClock(START)
+    garage = GarageManager(outputSink=NullSink(), clock=clock)
+    garage.handleCheckIn("car", "A-1")
+    garage.handleCheckIn("bus", "B-1")
+    clock.advance(timedelta(hours=2))
+    garage.handleCheckOut("A-1")
+    clock.advance(timedelta(minutes=10))
+    garage.handleCheckOut("B-1")
+    garage.paymentProcess("B-1")
+    garage.paymentProcess("A-1")
+    
+    history = garage.ticketHistory
+    plates = [row[1] for row in history.ticketsBetween(START, START + timedelta(hours=3))]
+    assert plates == ["A-1", "B-1"]
+    byType = history.revenueByVehicleType(START, START + timedelta(hours=3))
+    assert set(byType) == {"Car", "Bus"}
+
+
+def test_snapshot_round_trip_keeps_rows(tmp_path):
+    history = TicketHistoryStore(segmentSize=4, spillDirectory=str(tmp_path))
+    tickets = [settledTicket(token, minutes) for token, minutes in enumerate((30, 10, 20, 50, 40, 5, 60))]
+    for ticket in tickets:
+        history.appendTicket(ticket)
+    
+    restored = TicketHistoryStore(segmentSize=4, spillDirectory=str(tmp_path))
+    restored.restoreState(history.snapshotState())
+    assert list(restored.ticketsBetween()) == list(history.ticketsBetween())
+    assert sorted(row[0] for row in restored.ticketsBetween()) == list(range(len(tickets)))
+    history.close()
+    restored.close()
+
+
+def test_garage_close_unmaps_history_segments(tmp_path):
+    clock = VirtualClock(START)
+    garage = GarageManager(outputSink=NullSink(), clock=clock, historyDirectory=str(tmp_path))
+    garage.ticketHistory.segmentSize = 2
+    for index in range(5):
+        garage.handleCheckIn("car", f"C-{index}")
+        clock.advance(timedelta(minutes=30))
+        garage.handleCheckOut(f"C-{index}")
+        garage.paymentProcess(f"C-{index}")
+    
+    sealedSegments = list(garage.ticketHistory.sealedSegments)
+    assert len(sealedSegments) == 2 and all(segment.mappedFile is not None for segment in sealedSegments)
+    garage.close()
+    assert all(segment.mappedFile is None for segment in sealedSegments)
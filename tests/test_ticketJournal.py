@@ -0,0 +1,81 @@
+import os
+import signal
+import subprocess
+import sys
+import pytest
+from outputSink import NullSink
+from parkingSystem import GarageManager
+from ticketJournal import TicketJournal
+
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CRASHING_GARAGE = """
+import os
+import signal
+import sys
+from outputSink import NullSink
+from parkingSystem import GarageManager
+from ticketJournal import TicketJournal
+
+garage = GarageManager(journal=TicketJournal(sys.argv[1]), outputSink=NullSink())
+for index in range(int(sys.argv[2])):
+    garage.handleCheckIn("car", f"KILL-{index}")
+    print(index, flush=True)
+os.kill(os.getpid(), signal.SIGKILL)
+"""
+
+
+def recoveredGarage(journalDirectory):
+    return GarageManager(journal=TicketJournal(journalDirectory), outputSink=NullSink())
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="needs SIGKILL")
+def test_killed_process_keeps_every_acknowledged_checkin(tmp_path):
+    checkInCount = 40
+    result = subprocess.run([sys.executable, "-c", CRASHING_GARAGE, str(tmp_path), str(checkInCount)],
+                            cwd=REPOSITORY_ROOT, capture_output=True, text=True)
+    assert result.returncode == -signal.SIGKILL
+    acknowledged = len(result.stdout.split())
+    assert acknowledged == checkInCount
+    
+    garage = recoveredGarage(str(tmp_path))
+    assert len(garage.currentReceipts) == acknowledged
+    assert set(garage.currentReceipts) == {f"KILL-{index}" for index in range(acknowledged)}
+
+
+def test_replay_restores_checkouts_and_payments(tmp_path):
+    garage = recoveredGarage(str(tmp_path))
+    for plate in ("J-1", "J-2", "J-3"):
+        garage.handleCheckIn("car", plate)
+    garage.handleCheckOut("J-2")
+    garage.paymentProcess("J-2")
+    garage.journal.close()
+    
+    restored = recoveredGarage(str(tmp_path))
+    assert set(restored.currentReceipts) == {"J-1", "J-3"}
+    assert restored.slotCoordinator.OccupiedSpaces() == 2
+    assert restored.currentReceipts["J-1"].tokenNumber == garage.currentReceipts["J-1"].tokenNumber
+
+
+def test_replay_after_snapshot_skips_compacted_events(tmp_path):
+    garage = recoveredGarage(str(tmp_path))
+    garage.handleCheckIn("car", "S-1")
+    garage.saveSnapshot()
+    garage.handleCheckIn("bus", "S-2")
+    garage.journal.close()
+    
+    restored = recoveredGarage(str(tmp_path))
+    assert set(restored.currentReceipts) == {"S-1", "S-2"}
+    assert restored.slotCoordinator.OccupiedSpaces() == 4
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    garage = recoveredGarage(str(tmp_path))
+    garage.handleCheckIn("car", "T-1")
+    garage.journal.close()
+    with open(os.path.join(str(tmp_path), "garage.journal"), "ab") as journalFile:
+        journalFile.write(b'{"plate":"T-2","ty')
+    
+    restored = recoveredGarage(str(tmp_path))
+    assert set(restored.currentReceipts) == {"T-1"}
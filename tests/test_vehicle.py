@@ -0,0 +1,54 @@
+import pytest
+from outputSink import NullSink
+from parkingSystem import GarageManager
+from receiptToken import ParkingPass
+from slotAllocator import ParkingSlot
+from ticketHistory import TicketHistoryStore
+from vehicle import Bike, Bus, Car, Track, VEHICLE_TYPE_NAMES
+
+
+@pytest.mark.parametrize("vehicleClass, vehicleType, typeCode, slotsRequired", [
+    (Car, "Car", 0, 1),
+    (Bike, "Motorcycle", 1, 1),
+    (Track, "Truck", 2, 2),
+    (Bus, "Bus", 3, 3),
+])
+def test_vehicle_type_metadata(vehicleClass, vehicleType, typeCode, slotsRequired):
+    vehicle = vehicleClass("V-1")
+    assert (vehicle.VehicleType(), vehicle.typeCode, vehicle.SpaceRequired()) == (vehicleType, typeCode, slotsRequired)
+    assert VEHICLE_TYPE_NAMES[typeCode] == vehicleType
+    assert str(vehicle) == f"{vehicleType} - V-1"
+
+
+@pytest.mark.parametrize("instance", [Car("V-2"), ParkingSlot(1), ParkingPass(Bus("V-3"), [1, 2, 3])])
+def test_hot_objects_have_no_instance_dict(instance):
+    assert not hasattr(instance, "__dict__")
+    with pytest.raises(AttributeError):
+        instance.unexpectedAttribute = 1
+
+
+def test_ticket_delegates_vehicle_fields():
+    ticket = ParkingPass(Track("V-4"), [4, 5])
+    assert (ticket.registrationNumber, ticket.vehicleType, ticket.typeCode) == ("V-4", "Truck", 2)
+
+
+def test_plates_are_interned_through_the_history_table():
+    history = TicketHistoryStore()
+    plate = "".join(["V", "-", "5"])
+    assert history.internPlate(plate) is history.internPlate("V-5")
+    
+    garage = GarageManager(outputSink=NullSink())
+    first = garage.handleCheckIn("car", "".join(["V", "-", "6"]))
+    garage.handleCheckOut("V-6")
+    garage.paymentProcess("V-6")
+    second = garage.handleCheckIn("car", "".join(["V", "-", "6"]))
+    assert second.registrationNumber is first.registrationNumber
+
+
+def test_rejected_check_ins_do_not_grow_the_plate_table():
+    garage = GarageManager(outputSink=NullSink(), maximumSlots=3)
+    garage.handleCheckIn("bus", "V-7")
+    assert garage.handleCheckIn("car", "V-8") is None
+    assert garage.handleCheckIn("hovercraft", "V-9") is None
+    assert garage.handleCheckIn("car", "V-7") is None
+    assert garage.ticketHistory.plates == ["V-7"]
@@ -0,0 +1,298 @@
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import nullcontext
+from compactSlotStore import toEpochMicros, fromEpochMicros
+from vehicle import VEHICLE_TYPE_NAMES
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+HISTORY_COLUMNS = (
+    ("token", "q"),
+    ("plateID", "q"),
+    ("checkIn", "q"),
+    ("checkOut", "q"),
+    ("fee", "d"),
+    ("planCode", "H"),
+    ("typeCode", "B")
+)
+COLUMN_CODES = dict(HISTORY_COLUMNS)
+SEGMENT_HEADER = struct.Struct("<4sq")
+SEGMENT_MAGIC = b"TKH2"
+MICROS_PER_HOUR = 3600 * 1000000
+MICROS_PER_DAY = 24 * MICROS_PER_HOUR
+
+
+class HistorySegment:
+    
+    def __init__(self, columns=None):
+        self.columns = columns if columns is not None else {name: array(code) for name, code in HISTORY_COLUMNS}
+        self.path = None
+        self.mappedFile = None
+    
+    def __len__(self):
+        return len(self.columns["token"])
+    
+    def append(self, token, plateID, checkIn, checkOut, fee, planCode, typeCode):
+        checkOutColumn = self.columns["checkOut"]
+        if checkOutColumn and checkOut < checkOutColumn[-1]:
+            position = bisect_right(checkOutColumn, checkOut)
+            for (name, _), value in zip(HISTORY_COLUMNS, (token, plateID, checkIn, checkOut, fee, planCode, typeCode)):
+                self.columns[name].insert(position, value)
+            return
+        self.columns["token"].append(token)
+        self.columns["plateID"].append(plateID)
+        self.columns["checkIn"].append(checkIn)
+        checkOutColumn.append(checkOut)
+        self.columns["fee"].append(fee)
+        self.columns["planCode"].append(planCode)
+        self.columns["typeCode"].append(typeCode)
+    
+    def copy(self):
+        return HistorySegment({name: array(code, self.columns[name]) for name, code in HISTORY_COLUMNS})
+    
+    def rowRange(self, startMicros, endMicros):
+        checkOutColumn = self.columns["checkOut"]
+        if not len(checkOutColumn):
+            return 0, 0
+        if checkOutColumn[0] >= endMicros or checkOutColumn[-1] < startMicros:
+            return 0, 0
+        return bisect_left(checkOutColumn, startMicros), bisect_left(checkOutColumn, endMicros)
+    
+    def spill(self, path):
+        with open(path, "wb") as segmentFile:
+            segmentFile.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, len(self)))
+            for name, _ in HISTORY_COLUMNS:
+                self.columns[name].tofile(segmentFile)
+            segmentFile.flush()
+            os.fsync(segmentFile.fileno())
+        return HistorySegment.load(path)
+    
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as segmentFile:
+            mappedFile = mmap.mmap(segmentFile.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, rowCount = SEGMENT_HEADER.unpack_from(mappedFile)
+        if magic != SEGMENT_MAGIC:
+            mappedFile.close()
+            raise ValueError(f"Not a ticket history segment: {path}")
+        
+        columns = {}
+        offset = SEGMENT_HEADER.size
+        view = memoryview(mappedFile)
+        for name, code in HISTORY_COLUMNS:
+            width = array(code).itemsize * rowCount
+            columns[name] = view[offset:offset + width].cast(code)
+            offset += width
+        
+        segment = HistorySegment(columns)
+        segment.path = path
+        segment.mappedFile = mappedFile
+        return segment
+    
+    def close(self):
+        if self.mappedFile is not None:
+            for column in self.columns.values():
+                column.release()
+            self.mappedFile.close()
+            self.mappedFile = None
+
+
+class TicketHistoryStore:
+    
+    def __init__(self, segmentSize=65536, spillDirectory=None, threadSafe=False):
+        self.segmentSize = segmentSize
+        self.spillDirectory = spillDirectory
+        self.historyLock = threading.Lock() if threadSafe else nullcontext()
+        self.plates = []
+        self.plateIDs = {}
+        self.typeNames = list(VEHICLE_TYPE_NAMES)
+        self.typeCodes = {name: code for code, name in enumerate(self.typeNames)}
+        self.planNames = []
+        self.planCodes = {}
+        self.sealedSegments = []
+        self.activeSegment = HistorySegment()
+        self.nextSegmentNumber = 0
+        if spillDirectory is not None:
+            os.makedirs(spillDirectory, exist_ok=True)
+    
+    def __len__(self):
+        return sum(len(segment) for segment in self.sealedSegments) + len(self.activeSegment)
+    
+    def _code(self, value, codes, names):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+        return code
+    
+    def internPlate(self, registrationNumber):
+        with self.historyLock:
+            return self.plates[self._code(registrationNumber, self.plateIDs, self.plates)]
+    
+    def appendTicket(self, ticket):
+        checkIn = toEpochMicros(ticket.checkInTime)
+        checkOut = toEpochMicros(ticket.checkOutTime) if ticket.checkOutTime else checkIn
+        with self.historyLock:
+            self.activeSegment.append(
+                ticket.tokenNumber,
+                self._code(ticket.registrationNumber, self.plateIDs, self.plates),
+                checkIn,
+                checkOut,
+                ticket.parkingCharge,
+                self._code(ticket.pricingPlan or "", self.planCodes, self.planNames),
+                self._code(ticket.vehicleType, self.typeCodes, self.typeNames)
+            )
+            if len(self.activeSegment) >= self.segmentSize:
+                self._sealActiveSegment()
+    
+    def _sealActiveSegment(self):
+        segment = self.activeSegment
+        if self.spillDirectory is not None:
+            path = os.path.join(self.spillDirectory, f"history-{self.nextSegmentNumber:06d}.seg")
+            self.nextSegmentNumber += 1
+            segment = segment.spill(path)
+        self.sealedSegments.append(segment)
+        self.activeSegment = HistorySegment()
+    
+    def segments(self):
+        return self.sealedSegments + [self.activeSegment]
+    
+    def _rowSlices(self, startTime, endTime):
+        startMicros = toEpochMicros(startTime) if startTime is not None else -2 ** 63
+        endMicros = toEpochMicros(endTime) if endTime is not None else 2 ** 63 - 1
+        with self.historyLock:
+            segments = self.sealedSegments + [self.activeSegment.copy()]
+        for segment in segments:
+            firstRow, lastRow = segment.rowRange(startMicros, endMicros)
+            if lastRow > firstRow:
+                yield segment, range(firstRow, lastRow)
+    
+    def ticketsBetween(self, startTime=None, endTime=None):
+        for segment, rows in self._rowSlices(startTime, endTime):
+            columns = segment.columns
+            for row in rows:
+                yield (
+                    columns["token"][row],
+                    self.plates[columns["plateID"][row]],
+                    self.typeNames[columns["typeCode"][row]],
+                    fromEpochMicros(columns["checkIn"][row]),
+                    fromEpochMicros(columns["checkOut"][row]),
+                    columns["fee"][row],
+                    self.planNames[columns["planCode"][row]]
+                )
+    
+    def _groupKeys(self, columns, rows, groupBy):
+        if groupBy == "hour":
+            return [columns["checkOut"][row] // MICROS_PER_HOUR for row in rows]
+        if groupBy == "day":
+            return [columns["checkOut"][row] // MICROS_PER_DAY for row in rows]
+        if groupBy == "type":
+            return [columns["typeCode"][row] for row in rows]
+        if groupBy == "plan":
+            return [columns["planCode"][row] for row in rows]
+        raise ValueError(f"Unknown grouping: {groupBy}")
+    
+    def _groupLabel(self, key, groupBy):
+        if groupBy == "hour":
+            return fromEpochMicros(key * MICROS_PER_HOUR)
+        if groupBy == "day":
+            return fromEpochMicros(key * MICROS_PER_DAY).date()
+        if groupBy == "type":
+            return self.typeNames[key]
+        return self.planNames[key]
+    
+    def _columnArray(self, columns, name):
+        return numpy.frombuffer(columns[name], dtype=COLUMN_CODES[name])
+    
+    def _aggregateSlice(self, columns, rows, groupBy, totals):
+        if numpy is not None and isinstance(rows, range):
+            sliceRange = slice(rows.start, rows.stop)
+            if groupBy in ("hour", "day"):
+                divisor = MICROS_PER_HOUR if groupBy == "hour" else MICROS_PER_DAY
+                keys = self._columnArray(columns, "checkOut")[sliceRange] // divisor
+            elif groupBy in ("type", "plan"):
+                keys = self._columnArray(columns, "typeCode" if groupBy == "type" else "planCode")[sliceRange]
+            else:
+                raise ValueError(f"Unknown grouping: {groupBy}")
+            fees = self._columnArray(columns, "fee")[sliceRange]
+            uniqueKeys, inverse = numpy.unique(keys, return_inverse=True)
+            counts = numpy.bincount(inverse)
+            revenue = numpy.bincount(inverse, weights=fees)
+            for key, count, amount in zip(uniqueKeys.tolist(), counts.tolist(), revenue.tolist()):
+                entry = totals.setdefault(key, [0, 0.0])
+                entry[0] += count
+                entry[1] += amount
+            return
+        
+        feeColumn = columns["fee"]
+        for key, row in zip(self._groupKeys(columns, rows, groupBy), rows):
+            entry = totals.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += feeColumn[row]
+    
+    def aggregate(self, startTime=None, endTime=None, groupBy="hour"):
+        totals = {}
+        for segment, rows in self._rowSlices(startTime, endTime):
+            self._aggregateSlice(segment.columns, rows, groupBy, totals)
+        return {
+            self._groupLabel(key, groupBy): {"tickets": count, "revenue": revenue}
+            for key, (count, revenue) in sorted(totals.items())
+        }
+    
+    def revenueByHour(self, startTime=None, endTime=None):
+        return {hour: totals["revenue"] for hour, totals in self.aggregate(startTime, endTime, "hour").items()}
+    
+    def revenueByVehicleType(self, startTime=None, endTime=None):
+        return {vehicleType: totals["revenue"]
+                for vehicleType, totals in self.aggregate(startTime, endTime, "type").items()}
+    
+    def snapshotState(self):
+        with self.historyLock:
+            segments = []
+            for segment in self.segments():
+                if segment.path is not None:
+                    segments.append({"path": segment.path})
+                else:
+                    segments.append({
+                        "columns": {name: segment.columns[name].tolist() for name, _ in HISTORY_COLUMNS}
+                    })
+            return {
+                "plates": self.plates,
+                "types": self.typeNames,
+                "plans": self.planNames,
+                "nextSegment": self.nextSegmentNumber,
+                "segments": segments
+            }
+    
+    def restoreState(self, state):
+        with self.historyLock:
+            self.plates = list(state["plates"])
+            self.plateIDs = {plate: plateID for plateID, plate in enumerate(self.plates)}
+            self.typeNames = list(state["types"])
+            self.typeCodes = {name: code for code, name in enumerate(self.typeNames)}
+            self.planNames = list(state["plans"])
+            self.planCodes = {name: code for code, name in enumerate(self.planNames)}
+            self.nextSegmentNumber = state["nextSegment"]
+            
+            segments = []
+            for record in state["segments"]:
+                if "path" in record:
+                    segments.append(HistorySegment.load(record["path"]))
+                else:
+                    columns = {name: array(code, record["columns"][name]) for name, code in HISTORY_COLUMNS}
+                    segments.append(HistorySegment(columns))
+            self.sealedSegments = segments[:-1]
+            self.activeSegment = segments[-1] if segments else HistorySegment()
+    
+    def close(self):
+        with self.historyLock:
+            for segment in self.sealedSegments:
+                segment.close()
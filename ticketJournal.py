@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+
+
+class TicketJournal:
+    
+    def __init__(self, journalDirectory, syncBatchSize=64, snapshotInterval=10000):
+        self.journalDirectory = journalDirectory
+        self.journalPath = os.path.join(journalDirectory, "garage.journal")
+        self.snapshotPath = os.path.join(journalDirectory, "garage.snapshot")
+        self.syncBatchSize = syncBatchSize
+        self.snapshotInterval = snapshotInterval
+        self.lastSequence = 0
+        self.snapshotSequence = 0
+        self.eventsSinceSnapshot = 0
+        self.pendingSync = 0
+        self.journalFile = None
+        self.journalLock = threading.RLock()
+        os.makedirs(journalDirectory, exist_ok=True)
+    
+    def loadSnapshot(self):
+        if not os.path.exists(self.snapshotPath):
+            return None
+        with open(self.snapshotPath, "rb") as snapshotFile:
+            state = json.load(snapshotFile)
+        self.snapshotSequence = state["sequence"]
+        self.lastSequence = max(self.lastSequence, self.snapshotSequence)
+        return state
+    
+    def replayEvents(self):
+        if not os.path.exists(self.journalPath):
+            return
+        validLength = 0
+        with open(self.journalPath, "rb") as journalFile:
+            for line in journalFile:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    break
+                validLength += len(line)
+                if event["seq"] <= self.snapshotSequence:
+                    continue
+                self.lastSequence = event["seq"]
+                self.eventsSinceSnapshot += 1
+                yield event
+        if validLength < os.path.getsize(self.journalPath):
+            os.truncate(self.journalPath, validLength)
+    
+    def _openForAppend(self):
+        if self.journalFile is None:
+            self.journalFile = open(self.journalPath, "ab")
+        return self.journalFile
+    
+    def appendEvent(self, eventType, payload):
+        with self.journalLock:
+            self.lastSequence += 1
+            payload["seq"] = self.lastSequence
+            payload["event"] = eventType
+            journalFile = self._openForAppend()
+            journalFile.write(json.dumps(payload, separators=(",", ":")).encode() + b"\n")
+            journalFile.flush()
+            self.pendingSync += 1
+            self.eventsSinceSnapshot += 1
+            if self.pendingSync >= self.syncBatchSize:
+                self.sync()
+            return self.eventsSinceSnapshot >= self.snapshotInterval
+    
+    def sync(self):
+        with self.journalLock:
+            if self.journalFile is None or self.pendingSync == 0:
+                return
+            os.fsync(self.journalFile.fileno())
+            self.pendingSync = 0
+    
+    def writeSnapshot(self, state):
+        with self.journalLock:
+            self.sync()
+            state["sequence"] = self.lastSequence
+            temporaryPath = self.snapshotPath + ".tmp"
+            with open(temporaryPath, "w") as snapshotFile:
+                json.dump(state, snapshotFile, separators=(",", ":"))
+                snapshotFile.flush()
+                os.fsync(snapshotFile.fileno())
+            os.replace(temporaryPath, self.snapshotPath)
+            self.snapshotSequence = self.lastSequence
+            self.eventsSinceSnapshot = 0
+            
+            if self.journalFile is not None:
+                self.journalFile.close()
+            self.journalFile = open(self.journalPath, "wb")
+    
+    def close(self):
+        with self.journalLock:
+            if self.journalFile is not None:
+                self.sync()
+                self.journalFile.close()
+                self.journalFile = None
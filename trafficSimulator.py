@@ -0,0 +1,186 @@
+import heapq
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from itertools import count
+from garageClock import VirtualClock
+from outputSink import NullSink
+from parkingSystem import GarageManager
+
+
+ARRIVALS_PER_HOUR = {"Car": 24.0, "Motorcycle": 5.0, "Truck": 3.0, "Bus": 1.2}
+MEAN_STAY_HOURS = {"Car": 2.5, "Motorcycle": 1.5, "Truck": 4.0, "Bus": 5.0}
+PEAK_HOURS = range(8, 18)
+PEAK_MULTIPLIER = 2.0
+WEEKEND_MULTIPLIER = 0.8
+
+
+def percentile(sortedValues, fraction):
+    if not sortedValues:
+        return 0.0
+    return sortedValues[min(len(sortedValues) - 1, int(fraction * len(sortedValues)))]
+
+
+class TrafficSimulator:
+    
+    def __init__(self, days=30, seed=1, startTime=None, monthlyHolders=60, dayPassRate=0.05,
+                 trackMemory=True, **garageOptions):
+        self.days = days
+        self.generator = random.Random(seed)
+        self.clock = VirtualClock(startTime if startTime is not None else datetime(2026, 1, 5))
+        self.startTime = self.clock.now()
+        self.endTime = self.startTime + timedelta(days=days)
+        self.monthlyHolders = monthlyHolders
+        self.dayPassRate = dayPassRate
+        self.trackMemory = trackMemory
+        garageOptions.setdefault("outputSink", NullSink())
+        self.garage = GarageManager(clock=self.clock, **garageOptions)
+        
+        self.eventQueue = []
+        self.eventOrder = count()
+        self.plateCounter = count(1)
+        self.latencies = {}
+        self.arrivals = {vehicleType: 0 for vehicleType in ARRIVALS_PER_HOUR}
+        self.rejections = {vehicleType: 0 for vehicleType in ARRIVALS_PER_HOUR}
+        self.memorySamples = []
+    
+    def schedule(self, moment, eventType, *details):
+        heapq.heappush(self.eventQueue, (moment, next(self.eventOrder), eventType, details))
+    
+    def timed(self, operationName, operation, *arguments):
+        started = time.perf_counter()
+        result = operation(*arguments)
+        self.latencies.setdefault(operationName, []).append(time.perf_counter() - started)
+        return result
+    
+    def hourlyRate(self, vehicleType, moment):
+        rate = ARRIVALS_PER_HOUR[vehicleType]
+        if moment.weekday() >= 5:
+            return rate * WEEKEND_MULTIPLIER
+        if moment.hour in PEAK_HOURS:
+            return rate * PEAK_MULTIPLIER
+        return rate
+    
+    def scheduleHourOfArrivals(self, hourStart):
+        for vehicleType in ARRIVALS_PER_HOUR:
+            rate = self.hourlyRate(vehicleType, hourStart)
+            offset = self.generator.expovariate(rate)
+            while offset < 1:
+                plate = f"SIM-{next(self.plateCounter)}"
+                self.schedule(hourStart + timedelta(hours=offset), "arrival", vehicleType, plate)
+                offset += self.generator.expovariate(rate)
+        self.schedule(hourStart + timedelta(hours=1), "hour")
+    
+    def scheduleCommuters(self, day):
+        if day.weekday() >= 5:
+            return
+        for holder in range(self.monthlyHolders):
+            arrival = day + timedelta(hours=self.generator.gauss(8.5, 0.75))
+            stayHours = max(1.0, self.generator.gauss(8.5, 1.0))
+            self.schedule(arrival, "arrival", "Car", f"FLEET-{holder}", stayHours)
+    
+    def stayHours(self, vehicleType):
+        return self.generator.expovariate(1 / MEAN_STAY_HOURS[vehicleType]) + 1 / 6
+    
+    def handleArrival(self, vehicleType, plate, stayHours=None):
+        self.arrivals[vehicleType] += 1
+        if self.generator.random() < self.dayPassRate:
+            self.timed("dayPass", self.garage.buyOneTimeTicket, plate, vehicleType)
+        ticket = self.timed("checkIn", self.garage.handleCheckIn, vehicleType, plate)
+        if ticket is None:
+            self.rejections[vehicleType] += 1
+            return
+        if stayHours is None:
+            stayHours = self.stayHours(vehicleType)
+        self.schedule(self.clock.now() + timedelta(hours=stayHours), "departure", plate)
+    
+    def handleDeparture(self, plate):
+        self.timed("checkOut", self.garage.handleCheckOut, plate)
+        self.timed("payment", self.garage.paymentProcess, plate)
+    
+    def handleDayStart(self):
+        day = self.clock.now()
+        if (day - self.startTime).days % 30 == 0:
+            for holder in range(self.monthlyHolders):
+                self.timed("monthlyPass", self.garage.buyMonthlySubscription, f"FLEET-{holder}", "Car")
+        self.scheduleCommuters(day)
+        self.timed("dailySummary", self.garage.generateDailySummary)
+        if self.trackMemory:
+            self.memorySamples.append(tracemalloc.get_traced_memory()[0])
+        self.schedule(day + timedelta(days=1), "day")
+    
+    def run(self):
+        if self.trackMemory:
+            tracemalloc.start()
+        self.schedule(self.startTime, "day")
+        self.scheduleHourOfArrivals(self.startTime)
+        
+        started = time.perf_counter()
+        while self.eventQueue:
+            moment, _, eventType, details = heapq.heappop(self.eventQueue)
+            if moment >= self.endTime:
+                break
+            self.clock.advanceTo(moment)
+            if eventType == "arrival":
+                self.handleArrival(*details)
+            elif eventType == "departure":
+                self.handleDeparture(*details)
+            elif eventType == "hour":
+                self.scheduleHourOfArrivals(moment)
+            elif eventType == "day":
+                self.handleDayStart()
+        elapsed = time.perf_counter() - started
+        
+        if self.trackMemory:
+            self.memorySamples.append(tracemalloc.get_traced_memory()[0])
+            tracemalloc.stop()
+        return self.report(elapsed)
+    
+    def report(self, elapsed):
+        operations = {}
+        totalOperations = 0
+        for operationName, samples in self.latencies.items():
+            samples.sort()
+            totalOperations += len(samples)
+            operations[operationName] = {
+                "count": len(samples),
+                "p50": percentile(samples, 0.50),
+                "p95": percentile(samples, 0.95),
+                "p99": percentile(samples, 0.99)
+            }
+        return {
+            "simulatedDays": self.days,
+            "wallSeconds": elapsed,
+            "operations": totalOperations,
+            "operationsPerSecond": totalOperations / elapsed if elapsed else 0.0,
+            "latency": operations,
+            "arrivals": dict(self.arrivals),
+            "rejections": dict(self.rejections),
+            "rejectionRate": {
+                vehicleType: self.rejections[vehicleType] / self.arrivals[vehicleType] if self.arrivals[vehicleType] else 0.0
+                for vehicleType in self.arrivals
+            },
+            "memoryStart": self.memorySamples[0] if self.memorySamples else 0,
+            "memoryEnd": self.memorySamples[-1] if self.memorySamples else 0
+        }
+
+
+def printSimulationReport(results):
+    print("\n====== SIMULATED TRAFFIC ======")
+    print(f"Simulated days: {results['simulatedDays']} | Wall time: {results['wallSeconds']:.2f} s")
+    print(f"Operations: {results['operations']} | Throughput: {results['operationsPerSecond']:.0f} ops/s")
+    print(f"{'Operation':>14} {'Count':>8} {'p50':>10} {'p95':>10} {'p99':>10}")
+    for operationName, stats in results["latency"].items():
+        print(f"{operationName:>14} {stats['count']:>8} {stats['p50'] * 1e6:>7.1f} us "
+              f"{stats['p95'] * 1e6:>7.1f} us {stats['p99'] * 1e6:>7.1f} us")
+    for vehicleType, arrivals in results["arrivals"].items():
+        print(f"{vehicleType:>14}: {arrivals} arrivals, {results['rejections'][vehicleType]} rejected "
+              f"({results['rejectionRate'][vehicleType] * 100:.1f}%)")
+    growth = results["memoryEnd"] - results["memoryStart"]
+    print(f"Memory: {results['memoryStart'] / 1048576:.2f} MB -> {results['memoryEnd'] / 1048576:.2f} MB "
+          f"(+{growth / 1048576:.2f} MB)")
+
+
+if __name__ == "__main__":
+    printSimulationReport(TrafficSimulator().run())
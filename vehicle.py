@@ -3,9 +3,14 @@ from abc import ABC, abstractmethod
 
 class Vehicle(ABC):
     
+    __slots__ = ("registrationNumber",)
+    
+    vehicleType = None
+    typeCode = None
+    slotsRequired = None
+    
     def __init__(self, registrationNumber):
         self.registrationNumber = registrationNumber
-        self.vehicleType = None
     
     @abstractmethod
     def VehicleType(self):
@@ -24,51 +29,62 @@ class Vehicle(ABC):
 
 class Car(Vehicle):
     
-    def __init__(self, registrationNumber):
-        super().__init__(registrationNumber)
-        self.vehicleType = "Car"
+    __slots__ = ()
+    
+    vehicleType = "Car"
+    typeCode = 0
+    slotsRequired = 1
     
     def VehicleType(self):
-        return "Car"
+        return self.vehicleType
     
     def SpaceRequired(self):
-        return 1
+        return self.slotsRequired
 
 
 class Bike(Vehicle):
     
-    def __init__(self, registrationNumber):
-        super().__init__(registrationNumber)
-        self.vehicleType = "Motorcycle"
+    __slots__ = ()
+    
+    vehicleType = "Motorcycle"
+    typeCode = 1
+    slotsRequired = 1
     
     def VehicleType(self):
-        return "Motorcycle"
+        return self.vehicleType
     
     def SpaceRequired(self):
-        return 1
+        return self.slotsRequired
 
 
 class Track(Vehicle):
     
-    def __init__(self, registrationNumber):
-        super().__init__(registrationNumber)
-        self.vehicleType = "Truck"
+    __slots__ = ()
+    
+    vehicleType = "Truck"
+    typeCode = 2
+    slotsRequired = 2
     
     def VehicleType(self):
-        return "Truck"
+        return self.vehicleType
     
     def SpaceRequired(self):
-        return 2
+        return self.slotsRequired
 
 
 class Bus(Vehicle):
     
-    def __init__(self, registrationNumber):
-        super().__init__(registrationNumber)
-        self.vehicleType = "Bus"
+    __slots__ = ()
+    
+    vehicleType = "Bus"
+    typeCode = 3
+    slotsRequired = 3
     
     def VehicleType(self):
-        return "Bus"
+        return self.vehicleType
     
     def SpaceRequired(self):
-        return 3
+        return self.slotsRequired
+
+
+VEHICLE_TYPE_NAMES = tuple(vehicleClass.vehicleType for vehicleClass in (Car, Bike, Track, Bus))